@@ -0,0 +1,153 @@
+"""
+Runs the offline benchmark suite and persists the timings as JSON.
+
+Usage:
+    python -m benchmarks                          # default sizes
+    python -m benchmarks --sizes 1x1m,100x12m     # pick sizes (see synthetic.SIZES)
+    python -m benchmarks --filter generate_signals
+    python -m benchmarks --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from benchmarks.suite import BENCHMARKS
+from benchmarks.synthetic import SIZES, BenchSize
+
+DEFAULT_SIZES = "1x1m,10x1m"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _git_commit() -> str:
+    """
+    Returns the short hash of the current commit ("unknown" outside a git checkout).
+    """
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _time_callable(func: Any, repeat: int, warmup: int) -> list[float]:
+    """
+    Calls func() `warmup` times untimed (Numba JIT, file system caches), then
+    `repeat` times and returns the wall-clock duration of each timed call.
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_suite(
+    sizes: list[BenchSize], repeat: int, warmup: int, name_filter: str | None
+) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Runs every registered benchmark for every requested size.
+    "symbol"-scoped benchmarks only depend on the number of months, so they are
+    executed once per distinct month count.
+
+    :return: { benchmark_name: { size_label: {min, median, mean, repeat} } }
+    """
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench.name:
+            continue
+
+        done_labels: set[str] = set()
+        for size in sizes:
+            if bench.scope == "symbol":
+                size = BenchSize(1, size.months)
+            if size.label in done_labels:
+                continue
+            done_labels.add(size.label)
+
+            func = bench.factory(size)
+            timings = _time_callable(func, repeat, warmup)
+            entry = {
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "mean": statistics.mean(timings),
+                "repeat": repeat,
+            }
+            results.setdefault(bench.name, {})[size.label] = entry
+            print(f"{bench.name:<45} {size.label:>8}  min={entry['min']:.4f}s")
+    return results
+
+
+def compare(current: dict[str, Any], baseline_file: str) -> None:
+    """
+    Prints the ratio current/baseline of the minimum timings of two runs.
+    """
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)
+
+    print(f"\nComparison against {baseline.get('commit')} ({baseline_file}):")
+    for name, by_size in current["results"].items():
+        for label, entry in by_size.items():
+            old = baseline["results"].get(name, {}).get(label)
+            if old is None:
+                continue
+            ratio = entry["min"] / old["min"] if old["min"] else float("inf")
+            marker = "  <-- slower" if ratio > 1.1 else ""
+            print(f"{name:<45} {label:>8}  x{ratio:.2f}{marker}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="btc_backtest benchmark suite")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma-separated sizes, available: {', '.join(SIZES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--filter", default=None, help="substring of benchmark names")
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare to")
+    args = parser.parse_args()
+
+    unknown = [s for s in args.sizes.split(",") if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+    sizes = [SIZES[s] for s in args.sizes.split(",")]
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": run_suite(sizes, args.repeat, args.warmup, args.filter),
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    out_file = os.path.join(args.output_dir, f"{stamp}-{commit}.json")
+    with open(out_file, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {out_file}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
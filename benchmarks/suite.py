@@ -0,0 +1,125 @@
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Callable, Literal, NamedTuple
+
+from benchmarks.synthetic import (
+    BenchSize,
+    generate_ohlcv,
+    generate_universe,
+    make_kline_zip,
+)
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.binance.cache_manager import CacheManager
+from btc_backtest.core.binance.parser import parse_kline_zip
+from btc_backtest.core.metrics import compute_custom_metrics
+from btc_backtest.strategies.base import compute_time_in_position
+from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
+
+Scope = Literal["symbol", "universe"]
+# A benchmark factory performs the (untimed) setup and returns the timed callable.
+Factory = Callable[[BenchSize], Callable[[], object]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    scope: Scope
+    factory: Factory
+
+
+BENCHMARKS: list[Benchmark] = []
+
+STRATEGIES = [SmaCrossoverStrategy, RsiBollingerStrategy, VolumeSpikeBreakoutStrategy]
+
+
+def _make_tmp_dir() -> str:
+    """
+    Creates a temporary directory that is removed when the process exits.
+    """
+    path = tempfile.mkdtemp(prefix="btc_backtest_bench_")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def benchmark(name: str, scope: Scope = "symbol") -> Callable[[Factory], Factory]:
+    """
+    Registers a benchmark factory.
+
+    "symbol" benchmarks run on a single symbol with size.months of data,
+    "universe" benchmarks run on size.symbols symbols.
+    """
+    def decorator(factory: Factory) -> Factory:
+        BENCHMARKS.append(Benchmark(name, scope, factory))
+        return factory
+
+    return decorator
+
+
+@benchmark("parse_kline_zip")
+def bench_parse_kline_zip(size: BenchSize) -> Callable[[], object]:
+    content = make_kline_zip(generate_ohlcv(size.bars_per_symbol))
+    return lambda: parse_kline_zip(content)
+
+
+@benchmark("CacheManager.get_cached_file")
+def bench_get_cached_file(size: BenchSize) -> Callable[[], object]:
+    content = make_kline_zip(generate_ohlcv(size.bars_per_symbol))
+    tmp_dir = _make_tmp_dir()
+    cache = CacheManager(
+        checksums={},
+        cache_dir=tmp_dir,
+        checksums_file=os.path.join(tmp_dir, "checksums.txt"),
+    )
+    cache.save_file("SYM000BTC", "1m", 2024, 1, content)
+    return lambda: cache.get_cached_file("SYM000BTC", "1m", 2024, 1)
+
+
+def _make_generate_signals_bench(strategy_cls: type) -> Factory:
+    def factory(size: BenchSize) -> Callable[[], object]:
+        strategy = strategy_cls(data=generate_ohlcv(size.bars_per_symbol))
+        return strategy.generate_signals
+
+    return factory
+
+
+for _strategy_cls in STRATEGIES:
+    benchmark(f"{_strategy_cls.__name__}.generate_signals")(
+        _make_generate_signals_bench(_strategy_cls)
+    )
+
+
+@benchmark("run_backtest")
+def bench_run_backtest(size: BenchSize) -> Callable[[], object]:
+    strategy = SmaCrossoverStrategy(data=generate_ohlcv(size.bars_per_symbol))
+    # Warm up Numba compilation outside the timed region
+    SmaCrossoverStrategy(data=generate_ohlcv(100)).run_backtest()
+    return strategy.run_backtest
+
+
+@benchmark("compute_time_in_position")
+def bench_compute_time_in_position(size: BenchSize) -> Callable[[], object]:
+    pf = SmaCrossoverStrategy(data=generate_ohlcv(size.bars_per_symbol)).run_backtest()
+    return lambda: compute_time_in_position(pf)
+
+
+@benchmark("compute_custom_metrics")
+def bench_compute_custom_metrics(size: BenchSize) -> Callable[[], object]:
+    pf = SmaCrossoverStrategy(data=generate_ohlcv(size.bars_per_symbol)).run_backtest()
+    return lambda: compute_custom_metrics(pf)
+
+
+@benchmark("Backtester.run_all", scope="universe")
+def bench_run_all(size: BenchSize) -> Callable[[], object]:
+    data_dict = generate_universe(size)
+    results_dir = _make_tmp_dir()
+    strategies = [(cls, {}) for cls in STRATEGIES]
+
+    def run() -> Backtester:
+        backtester = Backtester(data_dict, strategies, results_dir=results_dir)
+        backtester.run_all()
+        return backtester
+
+    return run
@@ -0,0 +1,129 @@
+import io
+import zipfile
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_MONTH = 30 * 24 * 60
+
+
+class BenchSize(NamedTuple):
+    symbols: int
+    months: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.symbols}x{self.months}m"
+
+    @property
+    def bars_per_symbol(self) -> int:
+        return self.months * MINUTES_PER_MONTH
+
+
+# From "1 symbol x 1 month" up to "500 symbols x 1 year".
+SIZES: dict[str, BenchSize] = {
+    size.label: size
+    for size in (
+        BenchSize(1, 1),
+        BenchSize(10, 1),
+        BenchSize(100, 1),
+        BenchSize(1, 12),
+        BenchSize(100, 12),
+        BenchSize(500, 12),
+    )
+}
+
+KLINE_COLUMNS = [
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_asset_volume",
+    "number_of_trades",
+    "taker_buy_base_volume",
+    "taker_buy_quote_volume",
+    "ignore",
+]
+
+
+def generate_ohlcv(
+    n_bars: int, seed: int = 0, start: str = "2024-01-01"
+) -> pd.DataFrame:
+    """
+    Generates a synthetic 1-minute kline DataFrame shaped like parse_kline_zip() output:
+    a geometric random walk for prices, log-normal volumes, open_time as index.
+
+    :param n_bars: number of 1-minute bars
+    :param seed: random seed (different seeds give different symbols)
+    :param start: timestamp of the first bar
+    :return: DataFrame with the Binance kline columns
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0, 0.001, n_bars)
+    close = 0.05 * np.exp(np.cumsum(returns))
+    open_ = np.empty_like(close)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, 0.0005, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(mean=3.0, sigma=1.0, size=n_bars)
+    # Occasional volume spikes so breakout strategies produce signals
+    volume[rng.random(n_bars) < 0.01] *= 10
+    taker_share = rng.uniform(0.3, 0.7, n_bars)
+
+    open_time = pd.date_range(start, periods=n_bars, freq="1min", name="open_time")
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "close_time": open_time + pd.Timedelta(seconds=59.999),
+            "quote_asset_volume": volume * close,
+            "number_of_trades": rng.integers(1, 500, n_bars),
+            "taker_buy_base_volume": volume * taker_share,
+            "taker_buy_quote_volume": volume * taker_share * close,
+            "ignore": 0,
+        },
+        index=open_time,
+    )
+
+
+def generate_universe(size: BenchSize, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    Generates one synthetic DataFrame per symbol for the given benchmark size.
+
+    :param size: number of symbols and months
+    :param seed: base random seed
+    :return: dictionary { 'SYMnnnBTC': DataFrame }
+    """
+    return {
+        f"SYM{i:03d}BTC": generate_ohlcv(size.bars_per_symbol, seed=seed + i)
+        for i in range(size.symbols)
+    }
+
+
+def make_kline_zip(df: pd.DataFrame) -> bytes:
+    """
+    Serializes a kline DataFrame into the Binance monthly ZIP format
+    (a single header-less CSV with millisecond timestamps).
+
+    :param df: DataFrame produced by generate_ohlcv()
+    :return: ZIP file bytes
+    """
+    frame = df.reset_index()
+    for col in ("open_time", "close_time"):
+        frame[col] = frame[col].astype("datetime64[ms]").astype("int64")
+    csv_bytes = frame[["open_time", *KLINE_COLUMNS]].to_csv(
+        header=False, index=False
+    ).encode()
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("klines.csv", csv_bytes)
+    return buf.getvalue()
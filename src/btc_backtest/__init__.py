@@ -1,2 +1,7 @@
-def main() -> None:
-    print("Hello from btc-backtest!")
+def main() -> int:
+    """
+    Entry point of the btc-backtest command (see btc_backtest.cli).
+    """
+    from btc_backtest.cli import main as cli_main
+
+    return cli_main()
@@ -0,0 +1,462 @@
+"""
+Command line interface:
+btc-backtest {fetch,backtest,sweep,worker,merge,pairs,report,serve}.
+
+Only the standard library is imported at module level; every subcommand
+imports what it needs when it runs, so that e.g. "btc-backtest fetch" never
+loads vectorbt, plotly or Numba.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+from typing import Any, Sequence
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Same locations as main.py, so the CLI and main.py share their caches
+DEFAULT_CACHE_DIR = os.path.join(PACKAGE_DIR, "data", "cache")
+DEFAULT_RESULTS_DIR = os.path.join(PACKAGE_DIR, "results")
+
+
+def year_month(value: str) -> tuple[int, int]:
+    """
+    Parses "YYYY-MM" into (year, month).
+    """
+    try:
+        year, month = (int(part) for part in value.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}") from None
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"invalid month in {value!r}")
+    return year, month
+
+
+def parse_grid(items: Sequence[str]) -> dict[str, list[Any]]:
+    """
+    Parses ["fast_window=5,10", "fees=0.001"] into
+    {"fast_window": [5, 10], "fees": [0.001]}; values are JSON when possible
+    and strings otherwise.
+    """
+    grid: dict[str, list[Any]] = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep or not name:
+            raise argparse.ArgumentTypeError(f"expected name=v1,v2,..., got {item!r}")
+        grid[name] = [_parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def _parse_value(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def expand_grid(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """
+    All parameter combinations of a grid (one empty combination if empty).
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _add_data_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("symbols", nargs="*", help="e.g. ETHBTC SOLBTC")
+    parser.add_argument("--start", type=year_month, default=(2025, 2))
+    parser.add_argument("--end", type=year_month, help="default: --start")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+
+
+def _load(args: argparse.Namespace) -> dict:
+    """
+    Loads the requested symbols through the file cache (non-empty frames only).
+    """
+    from btc_backtest.core.data_loader import load_symbols
+
+    data = asyncio.run(
+        load_symbols(
+            args.symbols,
+            args.cache_dir,
+            args.start,
+            args.end or args.start,
+            args.interval,
+        )
+    )
+    return {symbol: df for symbol, df in data.items() if not df.empty}
+
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    """
+    Downloads (or validates the cached) monthly klines of the symbols.
+    """
+    from btc_backtest.core.data_loader import save_aggregated_parquet
+    from btc_backtest.core.progress import logger
+
+    data = _load(args)
+    missing = sorted(set(args.symbols) - set(data))
+    logger.info(
+        "fetch completed",
+        extra={
+            "symbols": len(data),
+            "rows": sum(len(df) for df in data.values()),
+            "missing": missing,
+        },
+    )
+    if args.out:
+        save_aggregated_parquet(data, os.path.abspath(args.out))
+    return 0
+
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    """
+    Runs the full main.py pipeline (universe, download, backtests, plots).
+    """
+    if args.no_plots:
+        os.environ["BTC_BACKTEST_NO_PLOTS"] = "1"
+    if args.trace:
+        os.environ["BTC_BACKTEST_TRACE"] = args.trace
+
+    from btc_backtest.main import main as run_pipeline
+
+    asyncio.run(run_pipeline())
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    """
+    Backtests every combination of a parameter grid for one strategy and
+    appends all of them to the metrics dataset; with --manifest, writes the
+    sweep as sharded jobs for "btc-backtest worker" instead, and with
+    --halving, runs a successive-halving search over the grid.
+    """
+    import pandas as pd
+
+    from btc_backtest.core.backtester import Backtester
+    from btc_backtest.core.metrics_store import new_run_id
+    from btc_backtest.core.progress import logger
+    from btc_backtest.core.rendering import FigureRenderer
+    from btc_backtest.strategies.registry import decode_params, get_strategy
+
+    strategy_cls = get_strategy(args.strategy)
+    combinations = expand_grid(parse_grid(args.grid))
+    data = _load(args)
+    if not data:
+        logger.warning("no data for the sweep", extra={"symbols": args.symbols})
+        return 1
+
+    if args.halving:
+        from btc_backtest.core.search import successive_halving
+
+        result = successive_halving(
+            strategy_cls,
+            [decode_params(params) for params in combinations],
+            data,
+            eta=args.eta,
+            min_bars=args.min_bars,
+            metric=args.metric,
+        )
+        out_file = os.path.join(
+            args.results_dir, f"halving_{strategy_cls.__name__}.csv"
+        )
+        result.ranking.to_csv(out_file, index=False)
+        logger.info(
+            "parameter search completed",
+            extra={
+                "best_params": result.best_params,
+                "cost_vs_grid": round(result.bars_simulated / result.bars_full_grid, 3),
+                "path": out_file,
+            },
+        )
+        return 0
+
+    if args.manifest:
+        Backtester(
+            data,
+            [(strategy_cls, {})],
+            results_dir=args.results_dir,
+            renderer=FigureRenderer(enabled=False),
+        ).write_sweep_manifest(
+            args.manifest, {strategy_cls.__name__: combinations}, args.chunk_size
+        )
+        return 0
+
+    # The whole sweep is one run of the dataset: one run id, one part per
+    # combination
+    run_id = new_run_id()
+    frames = []
+    for part, params in enumerate(combinations):
+        backtester = Backtester(
+            data,
+            [(strategy_cls, decode_params(params))],
+            results_dir=args.results_dir,
+            renderer=FigureRenderer(enabled=False),
+        )
+        backtester.run_id = run_id
+        backtester.run_all()
+        backtester.save_metrics_to_parquet(part=part)
+        frames.append(backtester.metrics_export_frame())
+
+    summary = pd.concat(frames, ignore_index=True)
+    summary = summary.sort_values("sharpe_ratio", ascending=False)
+    out_file = os.path.join(args.results_dir, f"sweep_{strategy_cls.__name__}.csv")
+    summary.drop(columns=[c for c in summary if c.startswith("stats_")]).to_csv(
+        out_file, index=False
+    )
+    logger.info(
+        "sweep completed",
+        extra={
+            "combinations": len(combinations),
+            "rows": len(summary),
+            "path": out_file,
+        },
+    )
+    return 0
+
+
+def cmd_worker(args: argparse.Namespace) -> int:
+    """
+    Runs shards of a sweep manifest until none is left to claim.
+    """
+    from btc_backtest.core.shards import run_worker
+
+    run_worker(
+        args.sweep_dir,
+        worker_id=args.worker_id,
+        data_file=args.data,
+        stale_after=args.stale_after,
+        max_shards=args.max_shards,
+    )
+    return 0
+
+
+def cmd_merge(args: argparse.Namespace) -> int:
+    """
+    Merges the shard results of a sweep into <sweep_dir>/merged.parquet.
+    """
+    from btc_backtest.core.progress import logger
+    from btc_backtest.core.shards import merge_sweep, sweep_status
+
+    status = sweep_status(args.sweep_dir)
+    if status["done"] < status["total"] and not args.partial:
+        logger.warning(
+            "sweep not finished",
+            extra={
+                "done": status["done"],
+                "total": status["total"],
+                "running": len(status["running"]),
+                "stale": len(status["stale"]),
+            },
+        )
+        return 1
+    merge_sweep(args.sweep_dir, allow_partial=args.partial)
+    return 0
+
+
+def cmd_pairs(args: argparse.Namespace) -> int:
+    """
+    Screens all pairs of the symbols for spread trading (correlation and
+    Engle-Granger cointegration) and writes the ranking to pairs_scan.csv;
+    with --backtest N, also backtests the N best cointegrated pairs with
+    PairsSpreadStrategy (pairs_backtest.csv).
+    """
+    import pandas as pd
+
+    from btc_backtest.core.pairs import scan_pairs, top_pairs
+    from btc_backtest.core.panel import build_panel
+    from btc_backtest.core.progress import logger
+
+    data = _load(args)
+    if len(data) < 2:
+        logger.warning("a pairs scan needs two symbols", extra={"symbols": list(data)})
+        return 1
+    panel = build_panel(data)
+    scan = scan_pairs(
+        panel["close"],
+        window=args.window,
+        min_correlation=args.min_correlation,
+        workers=args.workers,
+    )
+    os.makedirs(args.results_dir, exist_ok=True)
+    scan_file = os.path.join(args.results_dir, "pairs_scan.csv")
+    scan.to_csv(scan_file, index=False)
+    logger.info("pairs scan written", extra={"pairs": len(scan), "path": scan_file})
+
+    pairs = top_pairs(scan, args.backtest)
+    if pairs:
+        from btc_backtest.strategies.pairs_spread import PairsSpreadStrategy
+
+        pf = PairsSpreadStrategy(
+            panel,
+            pairs,
+            window=args.spread_window,
+            entry_z=args.entry_z,
+            exit_z=args.exit_z,
+        ).run_backtest()
+        summary = pd.DataFrame(
+            {
+                "total_return": pf.total_return(),
+                "sharpe_ratio": pf.sharpe_ratio(),
+                "max_drawdown": pf.max_drawdown(),
+                "orders": pf.orders.count(),
+            }
+        )
+        out_file = os.path.join(args.results_dir, "pairs_backtest.csv")
+        summary.to_csv(out_file)
+        logger.info("pairs backtested", extra={"pairs": len(pairs), "path": out_file})
+    return 0
+
+
+def cmd_report(args: argparse.Namespace) -> int:
+    """
+    Builds a self-contained HTML report (heatmaps and metrics table) for one
+    run of the metrics dataset, by default the latest one.
+    """
+    import pyarrow.dataset as ds
+
+    from btc_backtest.core.metrics_store import (
+        latest_run_id,
+        metrics_from_export,
+        read_metrics_dataset,
+    )
+    from btc_backtest.core.progress import logger
+    from btc_backtest.core.report import render_report
+
+    run_id = args.run_id
+    if run_id is None:
+        runs = read_metrics_dataset(args.dataset, columns=["run_id", "run_started_at"])
+        run_id = latest_run_id(runs)
+    if run_id is None:
+        logger.warning("metrics dataset is empty", extra={"path": args.dataset})
+        return 1
+
+    runs = read_metrics_dataset(args.dataset, filter=ds.field("run_id") == run_id)
+    html = render_report(
+        f"Backtest run {run_id}", equity={}, metrics=metrics_from_export(runs)
+    )
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(html)
+    logger.info("HTML report saved", extra={"path": args.out, "run_id": run_id})
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """
+    Starts the persistent backtest server (see core/server.py).
+    """
+    from btc_backtest.core.server import serve
+
+    serve(_load(args), args.host, args.port)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="btc-backtest", description="Binance BTC-pairs backtesting"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="download klines into the cache")
+    _add_data_arguments(fetch)
+    fetch.add_argument("--out", help="also save all frames to this Parquet file")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    backtest = commands.add_parser("backtest", help="run the full main.py pipeline")
+    backtest.add_argument("--no-plots", action="store_true")
+    backtest.add_argument("--trace", metavar="DIR", help="write instrumentation")
+    backtest.set_defaults(handler=cmd_backtest)
+
+    sweep = commands.add_parser("sweep", help="backtest a parameter grid")
+    sweep.add_argument("strategy", help="registered strategy name")
+    _add_data_arguments(sweep)
+    sweep.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="parameter values (repeatable)",
+    )
+    sweep.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    sweep.add_argument(
+        "--manifest", metavar="DIR", help="write sharded jobs to DIR, do not run"
+    )
+    sweep.add_argument("--chunk-size", type=int, default=50)
+    sweep.add_argument(
+        "--halving",
+        action="store_true",
+        help="successive halving instead of the full grid",
+    )
+    sweep.add_argument("--eta", type=int, default=3, help="halving reduction factor")
+    sweep.add_argument("--min-bars", type=int, default=1000)
+    sweep.add_argument("--metric", default="sharpe_ratio", help="metric to maximize")
+    sweep.set_defaults(handler=cmd_sweep)
+
+    worker = commands.add_parser("worker", help="run shards of a sweep manifest")
+    worker.add_argument("sweep_dir")
+    worker.add_argument("--data", help="local copy of the sweep data file")
+    worker.add_argument("--worker-id")
+    worker.add_argument("--stale-after", type=float, default=600.0)
+    worker.add_argument("--max-shards", type=int)
+    worker.set_defaults(handler=cmd_worker)
+
+    merge = commands.add_parser("merge", help="merge the shard results of a sweep")
+    merge.add_argument("sweep_dir")
+    merge.add_argument("--partial", action="store_true", help="allow missing shards")
+    merge.set_defaults(handler=cmd_merge)
+
+    pairs = commands.add_parser("pairs", help="scan symbol pairs for cointegration")
+    _add_data_arguments(pairs)
+    pairs.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    pairs.add_argument("--window", type=int, default=43_200, help="bars to test")
+    pairs.add_argument("--min-correlation", type=float, default=0.5)
+    pairs.add_argument("--workers", type=int, default=1)
+    pairs.add_argument(
+        "--backtest", type=int, default=0, metavar="N", help="backtest the N best"
+    )
+    pairs.add_argument("--spread-window", type=int, default=1440)
+    pairs.add_argument("--entry-z", type=float, default=2.0)
+    pairs.add_argument("--exit-z", type=float, default=0.5)
+    pairs.set_defaults(handler=cmd_pairs)
+
+    report = commands.add_parser("report", help="HTML report of a stored run")
+    report.add_argument(
+        "--dataset", default=os.path.join(DEFAULT_RESULTS_DIR, "metrics_dataset")
+    )
+    report.add_argument("--run-id", help="default: the latest run")
+    report.add_argument("--out", default="report.html")
+    report.set_defaults(handler=cmd_report)
+
+    serve = commands.add_parser("serve", help="start the backtest server")
+    _add_data_arguments(serve)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Entry point of the btc-backtest command.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command in ("fetch", "sweep", "pairs", "serve") and not args.symbols:
+        build_parser().error(f"{args.command}: at least one symbol is required")
+
+    from btc_backtest.core.progress import configure_logging, shutdown_logging
+
+    # main.py configures (and shuts down) logging itself
+    if args.command == "backtest":
+        return args.handler(args)
+    configure_logging()
+    try:
+        return args.handler(args)
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,157 @@
+import asyncio
+import logging
+import multiprocessing
 import os
-from typing import Any, Type
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, NamedTuple, Type
 
 import pandas as pd
 import plotly.express as px
-import plotly.io as pio
+import plotly.graph_objects as go
 from vectorbt import Portfolio
 
+from btc_backtest.core.downsample import downsample_series
+from btc_backtest.core.instrumentation import span, traced
 from btc_backtest.core.metrics import compute_custom_metrics
+from btc_backtest.core.metrics_frame import (
+    CORE_METRICS,
+    MetricRow,
+    build_metrics_frame,
+    concat_metrics,
+    metric_rows,
+    pivot_metric,
+    wide_metrics,
+)
+from btc_backtest.core.metrics_store import (
+    append_metrics_dataset,
+    new_run_id,
+    param_columns,
+    stats_columns,
+)
+from btc_backtest.core.panel import build_panel, freeze_frame
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.report import render_report
+from btc_backtest.core.result_cache import (
+    ResultCache,
+    fingerprint_frame,
+    make_cache_key,
+    module_source,
+)
 from btc_backtest.strategies.base import StrategyBase
 
+logger = logging.getLogger(__name__)
+
+
+class UnitTiming(NamedTuple):
+    """
+    Wall time of one (strategy, symbol) backtest and whether it came from the
+    result cache.
+    """
+
+    elapsed_s: float
+    cached: bool
+
+
+class UnitResult(NamedTuple):
+    """
+    Outcome of one (strategy, symbol) backtest.
+    """
+
+    strategy_name: str
+    symbol: str
+    metrics: dict[str, Any]
+    equity: pd.Series
+    elapsed_s: float
+    # None when the backtest ran in a worker process (not sent back)
+    portfolio: Portfolio | None
+
+
+def run_unit(
+    strategy_cls: Type[StrategyBase],
+    params: dict[str, Any],
+    symbol: str,
+    df: pd.DataFrame,
+    keep_portfolio: bool = True,
+) -> UnitResult:
+    """
+    Runs one strategy on one symbol and computes its metrics. Shared by
+    Backtester.run_all() and the worker processes of run_streaming().
+
+    The strategy gets a read-only view of df (see core.panel.freeze_frame())
+    instead of a copy, so all strategies of a symbol share one copy of its
+    data and none of them can change what the next one sees.
+    """
+    strategy_name = strategy_cls.__name__
+    started = time.perf_counter()
+    with span("backtester.unit", strategy=strategy_name, symbol=symbol):
+        strat_instance = strategy_cls(data=freeze_frame(df), **params)
+        pf = strat_instance.run_backtest()
+
+        base_metrics = strat_instance.get_metrics()
+        with span("metrics.custom", strategy=strategy_name):
+            extra_metrics = compute_custom_metrics(pf)
+        equity = pf.value()
+
+    merged_metrics = {
+        "symbol": symbol,
+        **base_metrics,
+        **extra_metrics,
+    }
+    return UnitResult(
+        strategy_name,
+        symbol,
+        merged_metrics,
+        equity,
+        time.perf_counter() - started,
+        pf if keep_portfolio else None,
+    )
+
+
+def _run_symbol(
+    units: list[tuple[Type[StrategyBase], dict[str, Any]]],
+    symbol: str,
+    df: pd.DataFrame,
+) -> list[UnitResult]:
+    """
+    Runs several strategies on one symbol (in a worker process: the frame is
+    sent once per symbol, the portfolios are not sent back).
+    """
+    return [
+        run_unit(strategy_cls, params, symbol, df, keep_portfolio=False)
+        for strategy_cls, params in units
+    ]
+
+
+# Modules outside the strategies whose code shapes a result
+RESULT_MODULES = (
+    "btc_backtest.core.metrics",
+    "btc_backtest.core.execution",
+    "btc_backtest.core.sizing",
+)
+
+
+def _results_version() -> str:
+    """
+    Source of the code outside the strategies that shapes a result; cached
+    results are invalidated when the metrics, fill or sizing logic change.
+    """
+    return "".join(module_source(name) for name in RESULT_MODULES)
+
 
 class Backtester:
     """
     The Backtester class is responsible for:
     - Accepting a dictionary of OHLCV DataFrames (multiple symbols).
     - Accepting one or more strategies (as class + parameter dict).
-    - Running the backtest for each strategy and symbol, saving results and plots.
+    - Running the backtest for each strategy and symbol, saving results and plots
+      (figures are written by a FigureRenderer: in parallel, skipping unchanged
+      ones, or not at all if it is disabled).
+    - Optionally serving unchanged (data, strategy, params) combinations
+      from a ResultCache instead of recomputing them (completed combinations
+      are stored as the run goes, so an interrupted run resumes from it).
+    - Optionally running each strategy as one portfolio over all symbols that
+      share a single pot of capital (run_grouped()).
     """
 
     def __init__(
@@ -23,84 +159,585 @@ class Backtester:
         data_dict: dict[str, pd.DataFrame],
         strategies: list[tuple[Type[StrategyBase], dict[str, Any]]],
         results_dir: str = "results",
+        result_cache: ResultCache | None = None,
+        renderer: FigureRenderer | None = None,
     ) -> None:
         self.data_dict = data_dict
         self.strategies = strategies
         self.results_dir = results_dir
+        self.result_cache = result_cache
 
         # all_metrics[strategy_name][symbol] -> dict with various metrics
+        # (the numeric ones are also stored in the tidy frame self.metrics)
         self.all_metrics: dict[str, dict[str, Any]] = {}
+        self._metrics = build_metrics_frame([])
+        self._pending_metric_rows: list[MetricRow] = []
         # all_portfolios[strategy_name][symbol] -> vectorbt.Portfolio object
+        # (only for combinations actually simulated in this run)
         self.all_portfolios: dict[str, dict[str, Portfolio]] = {}
+        # all_equity[strategy_name][symbol] -> portfolio value series
+        self.all_equity: dict[str, dict[str, pd.Series]] = {}
+        # unit_timings[(strategy_name, symbol)] -> wall time of the backtest
+        self.unit_timings: dict[tuple[str, str], UnitTiming] = {}
+        # Identifies this run in the metrics dataset (save_metrics_to_parquet)
+        self.run_id = new_run_id()
+        self.run_started_at: pd.Timestamp | None = None
+
+        # grouped_*[strategy_name] -> results of the shared-capital portfolio
+        self.grouped_metrics: dict[str, dict[str, Any]] = {}
+        self.grouped_portfolios: dict[str, Portfolio] = {}
+        self.grouped_equity: dict[str, pd.Series] = {}
 
         os.makedirs(self.results_dir, exist_ok=True)
         os.makedirs(os.path.join(self.results_dir, "screenshots"), exist_ok=True)
 
+        self.renderer = renderer or FigureRenderer(
+            manifest_file=os.path.join(
+                self.results_dir, "screenshots", ".render_manifest.json"
+            )
+        )
+
+    @property
+    def metrics(self) -> pd.DataFrame:
+        """
+        All numeric metrics as one tidy DataFrame with the columns
+        strategy, symbol, metric (categoricals) and value (float64).
+        Heatmaps, tables and exports are pivots of this frame.
+        """
+        if self._pending_metric_rows:
+            self._metrics = concat_metrics(
+                [self._metrics, build_metrics_frame(self._pending_metric_rows)]
+            )
+            self._pending_metric_rows = []
+        return self._metrics
+
+    def record_metrics(
+        self, strategy_name: str, symbol: str, metrics: dict[str, Any]
+    ) -> None:
+        """
+        Stores the metrics of one (strategy, symbol) backtest. Rows are
+        buffered and appended to the tidy frame in one step when it is read.
+        """
+        self.all_metrics.setdefault(strategy_name, {})[symbol] = metrics
+        self._pending_metric_rows.extend(metric_rows(strategy_name, symbol, metrics))
+
+    def _drop_metrics(self, strategy_name: str) -> None:
+        """
+        Removes the stored metrics of a strategy (before it is run again).
+        """
+        self.all_metrics[strategy_name] = {}
+        metrics = self.metrics
+        if strategy_name in metrics["strategy"].cat.categories:
+            kept = metrics[metrics["strategy"] != strategy_name]
+            self._metrics = concat_metrics([kept.reset_index(drop=True)])
+
     def run_all(self) -> None:
         """
         Run the backtest for each strategy on each symbol in self.data_dict,
-        and store results (portfolios and metrics).
+        and store results (portfolios, equity curves and metrics).
+
+        If a result cache is configured, combinations whose data, strategy source
+        and parameters are unchanged are loaded from it instead of being simulated.
+        Results are written to the cache as the run goes (flushed even if the
+        run fails), so a rerun of an interrupted run only simulates the rest.
+        """
+        self.run_started_at = pd.Timestamp.now(tz="UTC")
+        with span("backtester.run_all") as run_span:
+            try:
+                self._run_all()
+            finally:
+                if self.result_cache is not None:
+                    self.result_cache.flush()
+            run_span.add_items(
+                sum(len(syms) for syms in self.all_metrics.values())
+            )
+
+    def _run_all(self) -> None:
         """
+        Implementation of run_all() (without the outer instrumentation span).
+        """
+        fingerprints: dict[str, str] = {}
+        results_version = _results_version()
+        cache_hits = 0
+        total = 0
+
         for strategy_cls, params in self.strategies:
-            strategy_name = strategy_cls.__name__
-            self.all_portfolios[strategy_name] = {}
-            self.all_metrics[strategy_name] = {}
+            self._reset_strategy(strategy_cls.__name__)
 
             for symbol, df in self.data_dict.items():
-                strat_instance = strategy_cls(data=df.copy(), **params)
-                pf = strat_instance.run_backtest()
+                total += 1
+                cache_key, hit = self._load_cached(
+                    strategy_cls, params, symbol, df, fingerprints, results_version
+                )
+                if hit:
+                    cache_hits += 1
+                    continue
+                result = run_unit(strategy_cls, params, symbol, df)
+                self._store_result(result, cache_key)
+
+        if self.result_cache is not None:
+            logger.info(
+                "result cache",
+                extra={"cache_hits": cache_hits, "backtests": total},
+            )
+
+    def _reset_strategy(self, strategy_name: str) -> None:
+        """
+        Clears the stored results of a strategy before it is run again.
+        """
+        self.all_portfolios[strategy_name] = {}
+        self._drop_metrics(strategy_name)
+        self.all_equity[strategy_name] = {}
+
+    def _load_cached(
+        self,
+        strategy_cls: Type[StrategyBase],
+        params: dict[str, Any],
+        symbol: str,
+        df: pd.DataFrame,
+        fingerprints: dict[str, str],
+        results_version: str,
+    ) -> tuple[str | None, bool]:
+        """
+        Serves a (strategy, symbol) backtest from the result cache, if possible.
+
+        :param fingerprints: data fingerprints by symbol (filled on demand)
+        :return: the cache key (None without a cache) and whether it was a hit
+        """
+        if self.result_cache is None:
+            return None, False
+        started = time.perf_counter()
+        if symbol not in fingerprints:
+            fingerprints[symbol] = fingerprint_frame(df)
+        cache_key = make_cache_key(
+            fingerprints[symbol], strategy_cls, params, results_version
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return cache_key, False
+
+        strategy_name = strategy_cls.__name__
+        self.record_metrics(strategy_name, symbol, cached.metrics)
+        self.all_equity[strategy_name][symbol] = cached.equity
+        self.unit_timings[strategy_name, symbol] = UnitTiming(
+            time.perf_counter() - started, cached=True
+        )
+        return cache_key, True
+
+    def _store_result(self, result: UnitResult, cache_key: str | None) -> None:
+        """
+        Stores the outcome of a simulated backtest (and caches it).
+        """
+        strategy_name, symbol = result.strategy_name, result.symbol
+        if result.portfolio is not None:
+            self.all_portfolios[strategy_name][symbol] = result.portfolio
+        self.record_metrics(strategy_name, symbol, result.metrics)
+        self.all_equity[strategy_name][symbol] = result.equity
+        self.unit_timings[strategy_name, symbol] = UnitTiming(
+            result.elapsed_s, cached=False
+        )
+        if self.result_cache is not None and cache_key is not None:
+            self.result_cache.put(
+                cache_key, strategy_name, symbol, result.metrics, result.equity
+            )
+
+    async def run_streaming(
+        self,
+        frames: AsyncIterator[tuple[str, pd.DataFrame]],
+        max_workers: int | None = None,
+        metrics_dataset: str | None = None,
+        flush_every: int = 50,
+    ) -> None:
+        """
+        Pipelined alternative to run_all(): every symbol is backtested as soon
+        as its data arrives (e.g. from BinanceDataLoader.iter_symbols()), while
+        the remaining symbols are still downloading. Each symbol is sent once
+        to a pool of worker processes, which run all strategies on it; results
+        are collected on the event loop as they complete and optionally
+        appended to the metrics dataset in batches. The wall time approaches
+        max(download, compute) instead of their sum.
+
+        Loaded frames are added to self.data_dict (empty ones are skipped).
+        Portfolios stay in the workers, so all_portfolios is not filled.
+
+        Args:
+            frames: Async iterator of (symbol, OHLCV DataFrame) pairs.
+            max_workers (int | None): Number of worker processes
+                (default: number of CPUs).
+            metrics_dataset (str | None): Dataset directory (relative to
+                results_dir) the metrics are streamed to, as
+                save_metrics_to_parquet() does; None disables streaming.
+            flush_every (int): Number of finished backtests per dataset write.
+        """
+        self.run_started_at = pd.Timestamp.now(tz="UTC")
+        with span("backtester.run_streaming") as run_span:
+            try:
+                await self._run_streaming(
+                    frames, max_workers, metrics_dataset, flush_every
+                )
+            finally:
+                if self.result_cache is not None:
+                    self.result_cache.flush()
+            run_span.add_items(
+                sum(len(syms) for syms in self.all_metrics.values())
+            )
+
+    async def _run_streaming(
+        self,
+        frames: AsyncIterator[tuple[str, pd.DataFrame]],
+        max_workers: int | None,
+        metrics_dataset: str | None,
+        flush_every: int,
+    ) -> None:
+        """
+        Implementation of run_streaming() (without the outer span).
+        """
+        for strategy_cls, _ in self.strategies:
+            self._reset_strategy(strategy_cls.__name__)
+        fingerprints: dict[str, str] = {}
+        results_version = _results_version()
+        finished: list[tuple[str, str]] = []
+        parts = 0
+
+        async def flush() -> None:
+            nonlocal parts
+            units = list(finished)
+            finished.clear()
+            if metrics_dataset is None or not units:
+                return
+            # The rows are collected on the event loop; the Parquet write runs
+            # in a thread, so collecting other results goes on meanwhile
+            frame = self.metrics_export_frame(units)
+            part = parts
+            parts += 1
+            await asyncio.to_thread(
+                self._append_metrics_frame, frame, metrics_dataset, part
+            )
 
-                self.all_portfolios[strategy_name][symbol] = pf
+        async def collect(
+            future: asyncio.Future[list[UnitResult]], cache_keys: list[str | None]
+        ) -> None:
+            # Results come back in the order of the units (and their keys)
+            for cache_key, result in zip(cache_keys, await future):
+                self._store_result(result, cache_key)
+                finished.append((result.strategy_name, result.symbol))
+            if len(finished) >= flush_every:
+                await flush()
+
+        loop = asyncio.get_running_loop()
+        # "spawn": forking a process that runs logging/asyncio threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers, mp_context=context) as pool:
+            async with asyncio.TaskGroup() as tg:
+                async for symbol, df in frames:
+                    if df.empty:
+                        continue
+                    self.data_dict[symbol] = df
+                    units = []
+                    cache_keys = []
+                    for strategy_cls, params in self.strategies:
+                        cache_key, hit = self._load_cached(
+                            strategy_cls,
+                            params,
+                            symbol,
+                            df,
+                            fingerprints,
+                            results_version,
+                        )
+                        if hit:
+                            finished.append((strategy_cls.__name__, symbol))
+                        else:
+                            units.append((strategy_cls, params))
+                            cache_keys.append(cache_key)
+                    if units:
+                        future = loop.run_in_executor(
+                            pool, _run_symbol, units, symbol, df
+                        )
+                        tg.create_task(collect(future, cache_keys))
+        await flush()
+
+    def run_grouped(self, allocation: float | None = None) -> None:
+        """
+        Run every strategy once over all symbols as a single portfolio with
+        shared capital: the symbols are aligned into a wide panel, signals are
+        generated for all columns at once and simulated in one batched
+        vectorbt call with group_by=True and cash_sharing=True. Orders of the
+        same bar are executed in "auto" call sequence (sells before buys), so
+        exits free the cash that competing entries use.
+
+        Args:
+            allocation (float | None): Fraction of the strategy's init_cash
+                committed per entry (default: 1 / number of symbols). Entries
+                that find no free cash are skipped. Ignored for strategies
+                configured with their own sizer and for cross-sectional
+                strategies (e.g. CrossSectionalMomentumStrategy), which set
+                their own target weights.
+        """
+        with span("backtester.run_grouped") as run_span:
+            panel = freeze_frame(build_panel(self.data_dict))
+            if panel.empty:
+                logger.warning("no data for the grouped backtest")
+                return
+            n_symbols = panel["close"].shape[1]
+            if allocation is None:
+                allocation = 1.0 / n_symbols
+
+            for strategy_cls, params in self.strategies:
+                strategy_name = strategy_cls.__name__
+                with span(
+                    "backtester.grouped_unit",
+                    strategy=strategy_name,
+                    symbols=n_symbols,
+                ):
+                    strat_instance = strategy_cls(data=panel, **params)
+                    sizing = {}
+                    own_sizes = strat_instance.cross_sectional
+                    if strat_instance.sizer is None and not own_sizes:
+                        sizing = {
+                            "size": strat_instance.init_cash * allocation,
+                            "size_type": "value",
+                        }
+                    pf = strat_instance.run_backtest(
+                        group_by=True, cash_sharing=True, call_seq="auto", **sizing
+                    )
+                    base_metrics = strat_instance.get_metrics()
+                    with span("metrics.custom", strategy=strategy_name):
+                        extra_metrics = compute_custom_metrics(pf)
 
-                base_metrics = strat_instance.get_metrics()
-                extra_metrics = compute_custom_metrics(pf)
-                merged_metrics = {
-                    "symbol": symbol,
+                self.grouped_portfolios[strategy_name] = pf
+                self.grouped_metrics[strategy_name] = {
+                    "symbols": n_symbols,
                     **base_metrics,
                     **extra_metrics,
                 }
-                self.all_metrics[strategy_name][symbol] = merged_metrics
+                self.grouped_equity[strategy_name] = pf.value()
+                logger.info(
+                    "grouped backtest finished",
+                    extra={
+                        "strategy": strategy_name,
+                        "symbols": n_symbols,
+                        "total_return": extra_metrics["total_return"],
+                    },
+                )
+            run_span.add_items(n_symbols * len(self.strategies))
+
+    def save_grouped_metrics_to_csv(
+        self, filename: str = "grouped_metrics.csv"
+    ) -> None:
+        """
+        Save the metrics of the shared-capital portfolios (one row per strategy).
+        """
+        rows = [
+            {
+                "strategy": strategy_name,
+                "symbols": metric_dict.get("symbols"),
+                "sharpe_ratio": metric_dict.get("sharpe_ratio"),
+                "drawdown": metric_dict.get("drawdown"),
+                "exposure": metric_dict.get("exposure"),
+                "total_return": metric_dict.get("total_return"),
+                "winrate": metric_dict.get("winrate"),
+                "expectancy": metric_dict.get("expectancy"),
+            }
+            for strategy_name, metric_dict in self.grouped_metrics.items()
+        ]
+        csv_path = os.path.join(self.results_dir, filename)
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+        logger.info("grouped metrics saved", extra={"path": csv_path})
 
     def save_metrics_to_csv(self, filename: str = "metrics.csv") -> None:
         """
-        Save the collected metrics to a CSV file.
-        """
-        rows = []
-        for strategy_name, syms_dict in self.all_metrics.items():
-            for symbol, metric_dict in syms_dict.items():
-                row = {
-                    "strategy": strategy_name,
-                    "symbol": symbol,
-                    "sharpe_ratio": metric_dict.get("sharpe_ratio"),
-                    "drawdown": metric_dict.get("drawdown"),
-                    "exposure": metric_dict.get("exposure"),
-                    "total_return": metric_dict.get("total_return"),
-                    "winrate": metric_dict.get("winrate"),
-                    "expectancy": metric_dict.get("expectancy"),
+        Save the collected metrics to a CSV file
+        (one row per strategy and symbol, one column per core metric).
+        """
+        csv_path = os.path.join(self.results_dir, filename)
+        wide_metrics(self.metrics, CORE_METRICS).to_csv(csv_path, index=False)
+        logger.info("metrics saved", extra={"path": csv_path})
+
+    def metrics_export_frame(
+        self, units: list[tuple[str, str]] | None = None
+    ) -> pd.DataFrame:
+        """
+        The full metrics table of this run, one row per (strategy, symbol):
+        run id and date, every numeric metric, the strategy parameters
+        (param_* columns), the flattened vectorbt stats (stats_* columns),
+        the data range and the wall time of the backtest.
+
+        :param units: (strategy, symbol) pairs to export (default: all)
+        """
+        metrics = self.metrics
+        if units is not None:
+            keys = pd.MultiIndex.from_arrays([metrics["strategy"], metrics["symbol"]])
+            metrics = metrics[keys.isin(units)]
+        table = wide_metrics(metrics)
+        if table.empty:
+            return table
+        params = {cls.__name__: param_columns(p) for cls, p in self.strategies}
+        started = self.run_started_at or pd.Timestamp.now(tz="UTC")
+
+        extra = []
+        for strategy_name, symbol in zip(table["strategy"], table["symbol"]):
+            df = self.data_dict.get(symbol)
+            has_range = (
+                df is not None
+                and not df.empty
+                and isinstance(df.index, pd.DatetimeIndex)
+            )
+            timing = self.unit_timings.get((strategy_name, symbol))
+            extra.append(
+                {
+                    "data_start": df.index[0] if has_range else pd.NaT,
+                    "data_end": df.index[-1] if has_range else pd.NaT,
+                    "n_bars": len(df) if df is not None else 0,
+                    "elapsed_s": timing.elapsed_s if timing else float("nan"),
+                    "cached": timing.cached if timing else False,
+                    **params.get(strategy_name, {}),
+                    **stats_columns(
+                        self.all_metrics[strategy_name][symbol].get("stats")
+                    ),
                 }
-                rows.append(row)
+            )
+        table.insert(0, "run_id", self.run_id)
+        table.insert(1, "run_date", started.strftime("%Y-%m-%d"))
+        table.insert(2, "run_started_at", started)
+        return pd.concat([table, pd.DataFrame(extra)], axis=1)
 
-        df_metrics = pd.DataFrame(rows)
-        csv_path = os.path.join(self.results_dir, filename)
-        df_metrics.to_csv(csv_path, index=False)
-        print(f"Metrics saved to {csv_path}")
+    def save_metrics_to_parquet(
+        self,
+        dataset_dir: str = "metrics_dataset",
+        units: list[tuple[str, str]] | None = None,
+        part: int = 0,
+    ) -> None:
+        """
+        Append the full metrics table of this run (metrics_export_frame()) to
+        a Parquet dataset partitioned by strategy and run date. Earlier runs
+        are kept, so the dataset can be scanned across runs with
+        read_metrics_dataset(), pyarrow or duckdb.
+
+        Args:
+            dataset_dir (str): Dataset directory, relative to results_dir
+                (or absolute).
+            units (list | None): (strategy, symbol) pairs to write
+                (default: all).
+            part (int): Index of the write within this run, when a run
+                writes its metrics in several parts.
+        """
+        self._append_metrics_frame(
+            self.metrics_export_frame(units), dataset_dir, part
+        )
+
+    def _append_metrics_frame(
+        self, frame: pd.DataFrame, dataset_dir: str, part: int
+    ) -> None:
+        """
+        Writes rows of metrics_export_frame() to the metrics dataset (safe to
+        run in a worker thread: it only reads the given frame).
+        """
+        root = os.path.join(self.results_dir, dataset_dir)
+        with span("metrics.parquet") as sp:
+            written = append_metrics_dataset(frame, root, self.run_id, part)
+            sp.add_items(len(frame))
+        logger.info(
+            "metrics dataset updated",
+            extra={"path": root, "run_id": self.run_id, "files": len(written)},
+        )
+
+    def write_sweep_manifest(
+        self,
+        sweep_dir: str,
+        param_grid: dict[str, list[dict[str, Any]]] | None = None,
+        chunk_size: int = 50,
+        data_file: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Instead of running the sweep here, write it as a sharded job manifest
+        for workers on other processes or machines (see core/shards.py and
+        "btc-backtest worker"). Shards are (strategy, symbol, chunk of
+        parameter sets); merge the results with shards.merge_sweep().
+
+        Args:
+            sweep_dir (str): Sweep directory on a filesystem shared by the
+                workers.
+            param_grid (dict | None): {strategy class name: [parameter
+                overrides]}; every override is merged into the strategy's
+                parameters from self.strategies. Strategies without an entry
+                run once with their own parameters.
+            chunk_size (int): Parameter sets per shard.
+            data_file (str | None): Parquet file with the data, as written by
+                save_aggregated_parquet() (workers may pass their local copy).
+                By default self.data_dict is written to <sweep_dir>/data.parquet.
+
+        Returns:
+            dict[str, Any]: The manifest.
+        """
+        from btc_backtest.core.data_loader import save_aggregated_parquet
+        from btc_backtest.core.shards import write_manifest
+        from btc_backtest.strategies.registry import encode_params
+
+        param_grid = param_grid or {}
+        param_sets = {
+            cls.__name__: [
+                encode_params({**params, **overrides})
+                for overrides in param_grid.get(cls.__name__, [{}])
+            ]
+            for cls, params in self.strategies
+        }
+        symbols = [sym for sym, df in self.data_dict.items() if not df.empty]
+        if data_file is None:
+            os.makedirs(sweep_dir, exist_ok=True)
+            data_file = "data.parquet"
+            save_aggregated_parquet(
+                {sym: self.data_dict[sym] for sym in symbols},
+                os.path.abspath(os.path.join(sweep_dir, data_file)),
+            )
+        return write_manifest(sweep_dir, data_file, param_sets, symbols, chunk_size)
 
+    @traced("plot.equity_curves")
     def plot_equity_curves(
         self,
         use_log_scale: bool = True,
         template: str = "plotly_white",
         sort_by_final: bool = True,
         top_bottom_n: int = 0,   # 0 = show all
-        save_html: bool = False
+        save_html: bool = False,
+        max_points: int | None = 2000,
+        downsample_method: str = "lttb",
     ) -> None:
         """
         Plot and save equity curves.
         You can limit lines to top_bottom_n and sort by final value for clarity.
+        Every curve is downsampled to at most max_points points ("lttb" or
+        "minmax", None keeps all points), so the figure size and render time do
+        not grow with the length of the history. HTML output uses WebGL traces.
         """
-        for strategy_name, syms_dict in self.all_portfolios.items():
+        if not self.renderer.enabled:
+            return
+        with self.renderer.batch():
+            self._plot_equity_curves(
+                use_log_scale,
+                template,
+                sort_by_final,
+                top_bottom_n,
+                save_html,
+                max_points,
+                downsample_method,
+            )
+
+    def _plot_equity_curves(
+        self,
+        use_log_scale: bool,
+        template: str,
+        sort_by_final: bool,
+        top_bottom_n: int,
+        save_html: bool,
+        max_points: int | None,
+        downsample_method: str,
+    ) -> None:
+        """
+        Builds one equity figure per strategy and queues it on the renderer.
+        """
+        for strategy_name, syms_dict in self.all_equity.items():
             equity_data = []
-            for symbol, pf in syms_dict.items():
-                series = pf.value()
+            for symbol, series in syms_dict.items():
                 final_val = series.iloc[-1] if not series.empty else 0
                 equity_data.append((symbol, series, final_val))
 
@@ -111,23 +748,28 @@ class Backtester:
                 equity_data = equity_data[:top_bottom_n] + equity_data[-top_bottom_n:]
 
             fig = None
+            # WebGL traces keep large interactive plots responsive; Kaleido
+            # renders the SVG-based Scatter more reliably
+            trace_cls = go.Scattergl if save_html else go.Scatter
             for idx, (symbol, series, final_val) in enumerate(equity_data):
                 if idx == 0:
-                    fig = px.line(
-                        series,
-                        title=f"{strategy_name} - Equity Curves",
-                        labels={"value": "Portfolio Value", "index": "Datetime"},
-                        template=template
+                    fig = go.Figure(
+                        layout=dict(
+                            title=f"{strategy_name} - Equity Curves",
+                            xaxis_title="Datetime",
+                            yaxis_title="Portfolio Value",
+                            template=template,
+                        )
                     )
-                    if len(fig.data) > 0:
-                        fig.data[0].name = symbol
-                else:
-                    fig.add_scatter(
-                        x=series.index,
-                        y=series.values,
+                points = downsample_series(series, max_points, downsample_method)
+                fig.add_trace(
+                    trace_cls(
+                        x=points.index,
+                        y=points.to_numpy(),
                         mode="lines",
                         name=symbol,
                     )
+                )
 
             if fig is not None:
                 fig.update_layout(
@@ -140,19 +782,15 @@ class Backtester:
                     fig.update_yaxes(type="log")
                     fig.update_layout(yaxis_title="Portfolio Value (log scale)")
 
-                if save_html:
-                    html_file = os.path.join(
-                        self.results_dir, "screenshots", f"{strategy_name}_equity.html"
-                    )
-                    fig.write_html(html_file)
-                    print(f"Equity curves (HTML) saved: {html_file}")
-                else:
-                    png_file = os.path.join(
-                        self.results_dir, "screenshots", f"{strategy_name}_equity.png"
-                    )
-                    pio.write_image(fig, png_file, format="png", scale=2)
-                    print(f"Equity curves (PNG) saved: {png_file}")
+                extension = "html" if save_html else "png"
+                out_file = os.path.join(
+                    self.results_dir,
+                    "screenshots",
+                    f"{strategy_name}_equity.{extension}",
+                )
+                self.renderer.add(fig, out_file, scale=2)
 
+    @traced("plot.performance_heatmap")
     def plot_performance_heatmap(
         self,
         range_color: tuple[float, float] = (None, None),
@@ -165,34 +803,17 @@ class Backtester:
         You can clamp the color range and/or sort columns by average metric across strategies.
         Set range_color=(None,None) for automatic color scaling.
         """
-        strategies_list = list(self.all_metrics.keys())
-        symbols_list = sorted(
-            set().union(*[self.all_metrics[s].keys() for s in strategies_list])
-        )
-
-        if sort_symbols_by_mean and symbols_list:
-            symbol_mean = {}
-            for sym in symbols_list:
-                values = []
-                for strat in strategies_list:
-                    val = self.all_metrics[strat].get(sym, {}).get(metric, None)
-                    if val is not None:
-                        values.append(val)
-                symbol_mean[sym] = sum(values) / len(values) if values else 0
-            # sort descending
-            symbols_list.sort(key=lambda s: symbol_mean[s], reverse=True)
-
-        data_for_heatmap = []
-        for strategy_name in strategies_list:
-            row = []
-            for symbol in symbols_list:
-                val = None
-                if symbol in self.all_metrics[strategy_name]:
-                    val = self.all_metrics[strategy_name][symbol].get(metric, None)
-                row.append(val)
-            data_for_heatmap.append(row)
-
-        df_heatmap = pd.DataFrame(data_for_heatmap, index=strategies_list, columns=symbols_list)
+        if not self.renderer.enabled:
+            return
+        # strategies x symbols, symbols in alphabetical order
+        df_heatmap = pivot_metric(self.metrics, metric).sort_index(axis=1)
+        if sort_symbols_by_mean:
+            # sort descending by the mean across strategies (stable for ties)
+            symbol_mean = df_heatmap.mean(axis=0).fillna(0)
+            order = symbol_mean.sort_values(ascending=False, kind="stable").index
+            df_heatmap = df_heatmap[order]
+        strategies_list = list(df_heatmap.index)
+        symbols_list = list(df_heatmap.columns)
 
         fig = px.imshow(
             df_heatmap,
@@ -217,45 +838,41 @@ class Backtester:
         fig.update_yaxes(tickfont=dict(size=8))
 
         out_file = os.path.join(self.results_dir, "screenshots", f"heatmap_{metric}.png")
-        pio.write_image(fig, out_file, format="png", scale=2)
-        print(f"Heatmap saved: {out_file}")
+        self.renderer.add(fig, out_file, scale=2)
 
-    def generate_html_report(self, filename: str = "report.html") -> None:
-        """
-        Generate an HTML report listing all PNG or HTML files (e.g. equity curves, heatmaps).
+    @traced("report.html")
+    def generate_html_report(
+        self, filename: str = "report.html", max_points: int | None = 1000
+    ) -> None:
         """
-        html_content = "<html><head><title>Backtest Report</title></head><body>"
-        html_content += "<h1>Backtest Summary</h1>"
-
-        screenshot_dir = os.path.join(self.results_dir, "screenshots")
-        file_list = sorted(os.listdir(screenshot_dir))
-
-        for fname in file_list:
-            # If it's a PNG file
-            if fname.endswith(".png"):
-                full_path = os.path.join("results/screenshots", fname)
-                html_content += (
-                    f'<div style="margin-bottom:15px;">'
-                    f'<img src="{full_path}" alt="{fname}" style="max-width:900px;">'
-                    f'</div>'
-                )
-            # If it's an HTML file (interactive)
-            elif fname.endswith(".html"):
-                full_path = os.path.join("results/screenshots", fname)
-                # Here we embed as an iframe
-                html_content += (
-                    f'<div style="margin-bottom:15px; border:1px solid #ccc;">'
-                    f'<iframe src="{full_path}" width="900" height="600"></iframe>'
-                    f'</div>'
-                )
+        Generate a single self-contained HTML report: one inlined copy of
+        plotly.js, the (downsampled) equity curves of every strategy and of the
+        shared-capital portfolios embedded as compact typed arrays, heatmaps and
+        a sortable metrics table. It does not depend on any other file, so it
+        can be moved or shared as is.
 
-        html_content += "</body></html>"
+        Args:
+            filename (str): Output file, relative to results_dir (or absolute).
+            max_points (int | None): Point budget per equity curve.
+        """
+        equity = dict(self.all_equity)
+        if self.grouped_equity:
+            equity["Shared capital"] = dict(self.grouped_equity)
+
+        with span("report.render"):
+            html_content = render_report(
+                "Backtest Summary",
+                equity=equity,
+                metrics=self.metrics,
+                max_points=max_points,
+            )
 
         report_path = os.path.join(self.results_dir, filename)
         with open(report_path, "w", encoding="utf-8") as f:
             f.write(html_content)
-        print(f"HTML report saved: {report_path}")
+        logger.info("HTML report saved", extra={"path": report_path})
 
+    @traced("plot.png_plots")
     def generate_png_plots(
         self,
         use_log_scale: bool = True,
@@ -263,12 +880,14 @@ class Backtester:
         sort_by_final: bool = True,
         top_bottom_n: int = 0,
         heatmap_metrics: list[str] = None,
-        heatmap_range: tuple[float, float] = (None, None)
+        heatmap_range: tuple[float, float] = (None, None),
+        max_points: int | None = 2000,
     ) -> None:
         """
         Generate PNG plots for:
           1) Equity curves of all strategies (optionally limited/sorted).
           2) Heatmaps for a list of specified metrics.
+        All figures are rendered in one parallel batch by self.renderer.
 
         Args:
             use_log_scale (bool): Whether to use log scale for equity curves.
@@ -277,22 +896,26 @@ class Backtester:
             top_bottom_n (int): If >0, show top and bottom N lines only (for clarity).
             heatmap_metrics (List[str]): Which metrics to build heatmaps for.
             heatmap_range (tuple[float, float]): Color range for heatmaps (None=None=auto).
+            max_points (int | None): Point budget per equity curve (None = all points).
         """
-        self.plot_equity_curves(
-            use_log_scale=use_log_scale,
-            template=template,
-            sort_by_final=sort_by_final,
-            top_bottom_n=top_bottom_n,
-            save_html=False
-        )
-
         if heatmap_metrics is None:
             heatmap_metrics = ["sharpe_ratio"]
 
-        for m in heatmap_metrics:
-            self.plot_performance_heatmap(
-                range_color=heatmap_range,
-                metric=m,
+        # All figures are rendered together once the batch ends
+        with self.renderer.batch():
+            self.plot_equity_curves(
+                use_log_scale=use_log_scale,
                 template=template,
-                sort_symbols_by_mean=True
+                sort_by_final=sort_by_final,
+                top_bottom_n=top_bottom_n,
+                save_html=False,
+                max_points=max_points,
             )
+
+            for m in heatmap_metrics:
+                self.plot_performance_heatmap(
+                    range_color=heatmap_range,
+                    metric=m,
+                    template=template,
+                    sort_symbols_by_mean=True
+                )
@@ -1,4 +1,8 @@
 import asyncio
+import hashlib
+import json
+import os
+import time
 from typing import NamedTuple, Any, TypeAlias
 
 import httpx
@@ -10,6 +14,8 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from btc_backtest.core.binance.rate_limiter import WeightRateLimiter
+
 
 class SymbolVolume(NamedTuple):
     symbol: str
@@ -17,31 +23,70 @@ class SymbolVolume(NamedTuple):
 
 TickerData: TypeAlias = list[dict[str, Any]]
 
+# Request weights of the endpoints we use (https://binance-docs.github.io/apidocs/spot)
+EXCHANGE_INFO_WEIGHT = 20
+TICKER_24HR_ALL_WEIGHT = 80
+
+
+def ticker_24hr_weight(n_symbols: int | None) -> int:
+    """
+    Weight of GET /api/v3/ticker/24hr for the given number of requested symbols
+    (None = all symbols).
+    """
+    if n_symbols is None or n_symbols > 100:
+        return TICKER_24HR_ALL_WEIGHT
+    if n_symbols > 20:
+        return 40
+    return 2
+
+
 class PairsFetcher:
     def __init__(
-        self, client: AsyncClient, base_url: str = "https://api.binance.com/"
+        self,
+        client: AsyncClient,
+        base_url: str = "https://api.binance.com/",
+        cache_dir: str | None = None,
+        cache_ttl: float = 6 * 3600,
+        rate_limiter: WeightRateLimiter | None = None,
     ) -> None:
         """
         :param client: asynchronous HTTP client (httpx.AsyncClient)
         :param base_url: base URL for the Binance API
+        :param cache_dir: directory for on-disk snapshots of API responses
+            (None disables the cache)
+        :param cache_ttl: how long (seconds) a cached snapshot stays valid
+        :param rate_limiter: weight-aware limiter shared with other Binance API calls
         """
         self._client = client
         self._base_url = base_url
-
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((RequestError, HTTPStatusError)),
-    )
-    async def get_top_pairs(self, quote: str = "BTC", limit: int = 100) -> list[str]:
+        self._cache_dir = cache_dir
+        self._cache_ttl = cache_ttl
+        self._rate_limiter = rate_limiter
+        if self._cache_dir is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+    async def get_top_pairs(
+        self,
+        quote: str = "BTC",
+        limit: int = 100,
+        use_exchange_info: bool = False,
+    ) -> list[str]:
         """
         Asynchronously retrieves data from https://api.binance.com/api/v3/ticker/24hr,
         filters pairs that end with 'quote' (default "BTC"), sorts by 'quoteVolume'
         in descending order, discards pairs containing 'TEST', 'STUB', or 'EVENT',
         and returns the list of the top 'limit' symbols in a format like "ETH/BTC", "SOL/BTC", etc.
+
+        With use_exchange_info=True the candidate symbols are first taken from
+        /api/v3/exchangeInfo (quote asset == quote, status TRADING) and only those
+        tickers are requested via the `symbols=` filter.
         """
         # 1) Load 24-hour statistics
-        data = await self._fetch_24hr_ticker_data()
+        if use_exchange_info:
+            symbols = await self.get_trading_symbols(quote)
+            data = await self._fetch_24hr_ticker_data(symbols)
+        else:
+            data = await self._fetch_24hr_ticker_data()
 
         # 2) Filter by quote, remove TEST/STUB/EVENT, keep (symbol, quoteVolume)
         filtered = self._filter_symbols(data, quote)
@@ -51,20 +96,105 @@ class PairsFetcher:
 
         return [sym for (sym, vol) in top_pairs]
 
-    async def _fetch_24hr_ticker_data(self) -> TickerData:
+    async def get_trading_symbols(
+        self, quote: str = "BTC", statuses: tuple[str, ...] = ("TRADING",)
+    ) -> list[str]:
+        """
+        Returns symbols from GET /api/v3/exchangeInfo whose quote asset is 'quote'
+        and whose status is one of 'statuses' (pass ("TRADING", "BREAK") to also
+        include delisted pairs that Binance still lists).
+
+        :param quote: quote asset, e.g. "BTC"
+        :param statuses: accepted symbol statuses
+        :return: list of symbols such as "ETHBTC"
+        """
+        info = await self._get_json("api/v3/exchangeInfo", {}, EXCHANGE_INFO_WEIGHT)
+        return [
+            item["symbol"]
+            for item in info.get("symbols", [])
+            if item.get("quoteAsset") == quote and item.get("status") in statuses
+        ]
+
+    async def _fetch_24hr_ticker_data(
+        self, symbols: list[str] | None = None
+    ) -> TickerData:
         """
         Sends a request to Binance and retrieves the list returned by the endpoint:
           GET /api/v3/ticker/24hr
 
+        The MINI ticker type is requested since only 'quoteVolume' is needed.
+
+        :param symbols: optional list of symbols for the `symbols=` filtered query
+            (the weight drops from 80 to 2/40 for up to 20/100 symbols)
         :return: a list of objects, each containing fields like 'symbol', 'quoteVolume', etc.
         """
-        url = self._base_url + "api/v3/ticker/24hr"
-        response = await self._client.get(url, timeout=15.0)
+        params = {"type": "MINI"}
+        if symbols is not None:
+            if not symbols:
+                return []
+            params["symbols"] = json.dumps(sorted(symbols), separators=(",", ":"))
+        weight = ticker_24hr_weight(len(symbols) if symbols is not None else None)
+        return await self._get_json("api/v3/ticker/24hr", params, weight)
+
+    async def _get_json(self, path: str, params: dict[str, str], weight: int) -> Any:
+        """
+        Returns the JSON response of an API endpoint, served from the on-disk
+        snapshot if it is younger than the TTL.
+
+        :param path: endpoint path relative to base_url
+        :param params: query parameters
+        :param weight: request weight of the call
+        """
+        cache_path = self._snapshot_path(path, params)
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path, "r") as f:
+                snapshot = json.load(f)
+            if time.time() - snapshot["fetched_at"] < self._cache_ttl:
+                return snapshot["data"]
+
+        data = await self._request_json(path, params, weight)
+
+        if cache_path is not None:
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"fetched_at": time.time(), "data": data}, f)
+            os.replace(tmp_path, cache_path)
+        return data
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((RequestError, HTTPStatusError)),
+    )
+    async def _request_json(
+        self, path: str, params: dict[str, str], weight: int
+    ) -> Any:
+        """
+        Performs the HTTP request, respecting the shared weight budget.
+        """
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(weight)
+
+        url = self._base_url + path
+        response = await self._client.get(url, params=params, timeout=15.0)
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_from_headers(response.headers)
         # If status is 4xx or 5xx (except 404), a retry will be triggered (via tenacity).
         # 404 will also raise an exception if not handled before raise_for_status().
         response.raise_for_status()
         return response.json()
 
+    def _snapshot_path(self, path: str, params: dict[str, str]) -> str | None:
+        """
+        Path of the on-disk snapshot for a request (None if caching is disabled).
+        """
+        if self._cache_dir is None:
+            return None
+        key = json.dumps([self._base_url, path, params], sort_keys=True)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        name = path.rstrip("/").replace("/", "_")
+        return os.path.join(self._cache_dir, f"{name}-{digest}.json")
+
     def _filter_symbols(self, data: TickerData, quote: str) -> list[SymbolVolume]:
         """
         From all 'symbol' values, select those that end with 'quote' (e.g., 'BTC'),
@@ -1,7 +1,12 @@
 import hashlib
+import json
 import os
+import time
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
+from btc_backtest.core.instrumentation import span
+
 
 def load_checksums(checksums_file: str) -> dict[str, str]:
     """
@@ -30,6 +35,7 @@ class CacheManager:
     - Stores downloaded ZIP files
     - Verifies MD5 checksums
     - Returns/updates content from local files
+    - Remembers files known to be missing (404) or failing (negative cache)
     """
 
     def __init__(
@@ -37,6 +43,9 @@ class CacheManager:
         checksums: Dict[str, str],
         cache_dir: str,
         checksums_file: str,
+        negative_cache_file: str | None = None,
+        not_found_ttl: float = 30 * 24 * 3600,
+        failure_ttl: float = 3600,
     ) -> None:
         """
         Initializes the cache manager.
@@ -44,11 +53,64 @@ class CacheManager:
         :param checksums: dictionary of filenames and their MD5 hashes
         :param cache_dir: path to the cache directory
         :param checksums_file: path to the file for storing checksums
+        :param negative_cache_file: path to the JSON Lines log of known-missing
+            files (defaults to <cache_dir>/negative_cache.jsonl)
+        :param not_found_ttl: how long (seconds) a 404 for a finished month
+            is remembered
+        :param failure_ttl: how long other failures (and 404s for the running month,
+            whose file is not published yet) are remembered
         """
         self._cache_dir = cache_dir
         os.makedirs(self._cache_dir, exist_ok=True)
         self._checksums_file = checksums_file
         self._checksums = checksums
+        self._negative_cache_file = negative_cache_file or os.path.join(
+            cache_dir, "negative_cache.jsonl"
+        )
+        self._not_found_ttl = not_found_ttl
+        self._failure_ttl = failure_ttl
+        self._negative: dict[str, dict[str, str | float]] = self._load_negative()
+
+    def _load_negative(self) -> dict[str, dict[str, str | float]]:
+        """
+        Replays the negative cache log (a later line for a file replaces the
+        earlier ones), dropping expired entries. The log is compacted to the
+        live entries if it holds anything else.
+        """
+        if not os.path.exists(self._negative_cache_file):
+            return {}
+        entries: dict[str, dict[str, str | float]] = {}
+        lines = 0
+        with open(self._negative_cache_file, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                entries[record.pop("file")] = record
+                lines += 1
+        now = time.time()
+        live = {k: v for k, v in entries.items() if float(v["expires_at"]) > now}
+        if len(live) < lines:
+            self._compact_negative(live)
+        return live
+
+    def _append_negative(self, filename: str, entry: dict[str, str | float]) -> None:
+        """
+        Appends one entry to the negative cache log (a single short write, so
+        nothing else is rewritten and concurrent writers do not clash).
+        """
+        with open(self._negative_cache_file, "a") as f:
+            f.write(json.dumps({"file": filename, **entry}) + "\n")
+
+    def _compact_negative(self, entries: dict[str, dict[str, str | float]]) -> None:
+        """
+        Atomically rewrites the negative cache log with the given entries only.
+        """
+        tmp_path = self._negative_cache_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            for filename, entry in sorted(entries.items()):
+                f.write(json.dumps({"file": filename, **entry}) + "\n")
+        os.replace(tmp_path, self._negative_cache_file)
 
     def _save_checksums(self) -> None:
         """
@@ -81,6 +143,60 @@ class CacheManager:
         filename = f"{symbol}-{interval}-{year}-{month:02d}.zip"
         return os.path.join(self._cache_dir, filename)
 
+    def missing_reason(
+        self, symbol: str, interval: str, year: int, month: int
+    ) -> str | None:
+        """
+        The reason the file was recorded as missing or failing ("404" or a
+        short description of the failure), if that entry has not expired.
+
+        :return: the recorded reason, or None if the file is not known missing
+        """
+        filename = os.path.basename(
+            self._get_local_zip_path(symbol, interval, year, month)
+        )
+        entry = self._negative.get(filename)
+        if entry is None:
+            return None
+        if float(entry["expires_at"]) <= time.time():
+            del self._negative[filename]
+            return None
+        return str(entry["reason"])
+
+    def is_known_missing(
+        self, symbol: str, interval: str, year: int, month: int
+    ) -> bool:
+        """
+        Checks whether the file was recently recorded as missing or failing.
+
+        :return: True if a request for it should be skipped
+        """
+        return self.missing_reason(symbol, interval, year, month) is not None
+
+    def record_missing(
+        self, symbol: str, interval: str, year: int, month: int, reason: str
+    ) -> None:
+        """
+        Remembers that the file could not be obtained, with a TTL depending on
+        the reason: a 404 for a month that has already ended is (nearly)
+        permanent, anything else is retried after failure_ttl.
+
+        :param reason: "404" or a short description of the failure
+        """
+        now = datetime.now(timezone.utc)
+        month_finished = (year, month) < (now.year, now.month)
+        ttl = (
+            self._not_found_ttl
+            if reason == "404" and month_finished
+            else self._failure_ttl
+        )
+        filename = os.path.basename(
+            self._get_local_zip_path(symbol, interval, year, month)
+        )
+        entry = {"reason": reason, "expires_at": time.time() + ttl}
+        self._negative[filename] = entry
+        self._append_negative(filename, entry)
+
     def get_cached_file(
         self,
         symbol: str,
@@ -99,20 +215,27 @@ class CacheManager:
         :return: file bytes or None if missing or invalid
         """
         local_path = self._get_local_zip_path(symbol, interval, year, month)
-        if not os.path.exists(local_path):
-            return None
+        with span(
+            "cache.get_cached_file", symbol=symbol, year=year, month=month
+        ) as sp:
+            if not os.path.exists(local_path):
+                sp.set(result="missing")
+                return None
 
-        with open(local_path, "rb") as f:
-            content = f.read()
+            with open(local_path, "rb") as f:
+                content = f.read()
+            sp.add_items(len(content))
 
-        local_md5 = self._compute_md5(content)
-        filename_only = os.path.basename(local_path)
-        stored_md5 = self._checksums.get(filename_only)
+            local_md5 = self._compute_md5(content)
+            filename_only = os.path.basename(local_path)
+            stored_md5 = self._checksums.get(filename_only)
 
-        if stored_md5 and stored_md5 == local_md5:
-            return content
-        else:
-            return None
+            if stored_md5 and stored_md5 == local_md5:
+                sp.set(result="hit")
+                return content
+            else:
+                sp.set(result="invalid")
+                return None
 
     def save_file(
         self,
@@ -132,9 +255,16 @@ class CacheManager:
         :param content: file bytes (ZIP) to save
         """
         local_path = self._get_local_zip_path(symbol, interval, year, month)
-        with open(local_path, "wb") as f:
-            f.write(content)
+        with span("cache.save_file", symbol=symbol, year=year, month=month) as sp:
+            with open(local_path, "wb") as f:
+                f.write(content)
+            sp.add_items(len(content))
+
+            md5hash = self._compute_md5(content)
+            self._checksums[os.path.basename(local_path)] = md5hash
+            self._save_checksums()
 
-        md5hash = self._compute_md5(content)
-        self._checksums[os.path.basename(local_path)] = md5hash
-        self._save_checksums()
+            filename = os.path.basename(local_path)
+            if self._negative.pop(filename, None) is not None:
+                # An already expired entry removes the file from the cache
+                self._append_negative(filename, {"reason": "saved", "expires_at": 0})
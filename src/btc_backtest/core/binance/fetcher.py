@@ -1,11 +1,34 @@
 from httpx import AsyncClient, RequestError, HTTPStatusError
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
 )
 
+from btc_backtest.core.progress import LoaderStats
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """
+    Network errors, 429 and 5xx responses are worth retrying; other 4xx
+    statuses (e.g. 403) will not change on retry.
+    """
+    if isinstance(exc, HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, RequestError)
+
+
+def _count_retry(retry_state: RetryCallState) -> None:
+    """
+    Tenacity before_sleep hook: counts retries on the fetcher's LoaderStats.
+    """
+    fetcher = retry_state.args[0]
+    if fetcher.stats is not None:
+        fetcher.stats.retries += 1
+
 
 class BinanceFetcher:
     """
@@ -13,28 +36,34 @@ class BinanceFetcher:
     Utilizes an AsyncClient for HTTP requests and Tenacity for retries.
     """
 
-    def __init__(self, client: AsyncClient) -> None:
+    def __init__(self, client: AsyncClient, stats: LoaderStats | None = None) -> None:
         """
         Initializes the BinanceFetcher with an asynchronous HTTP client.
 
         :param client: An httpx.AsyncClient instance for making HTTP requests.
+        :param stats: Optional LoaderStats on which retries are counted.
         """
         self._client = client
         self._base_url = "https://data.binance.vision"
+        self.stats = stats
 
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((RequestError, HTTPStatusError)),
+        retry=retry_if_exception(_is_transient),
+        before_sleep=_count_retry,
+        # Raise the last HTTPError, not tenacity's RetryError, once retries run out
+        reraise=True,
     )
     async def _fetch_url_with_retry(self, url: str) -> bytes:
         """
-        Fetches the content of a given URL, retrying on RequestError or HTTPStatusError.
+        Fetches the content of a given URL, retrying on RequestError, 429 and 5xx.
         Tenacity is used to manage the retry mechanism.
 
         :param url: The URL to fetch.
         :return: The raw bytes of the requested resource, or b"404_NOT_FOUND" if the server returns a 404 status.
         :raises HTTPStatusError: If the response status is an error (4xx/5xx) other than 404.
+        :raises RequestError: If the request still fails after the last retry.
         """
         response = await self._client.get(url, timeout=30.0)
         if response.status_code == 404:
@@ -3,6 +3,8 @@ import zipfile
 from typing import Optional
 import pandas as pd
 
+from btc_backtest.core.instrumentation import span
+
 
 def parse_kline_zip(zip_content: bytes) -> pd.DataFrame:
     """
@@ -37,6 +39,16 @@ def parse_kline_zip(zip_content: bytes) -> pd.DataFrame:
     if zip_content == b"404_NOT_FOUND":
         return pd.DataFrame()
 
+    with span("parse_kline_zip", bytes=len(zip_content)) as sp:
+        df = _parse_zip(zip_content)
+        sp.add_items(len(df))
+    return df
+
+
+def _parse_zip(zip_content: bytes) -> pd.DataFrame:
+    """
+    Does the actual work of parse_kline_zip() for non-404 content.
+    """
     in_memory_data = io.BytesIO(zip_content)
 
     with zipfile.ZipFile(in_memory_data) as zip_file:
@@ -0,0 +1,88 @@
+import asyncio
+import collections
+import time
+from typing import Callable, Mapping
+
+
+class WeightRateLimiter:
+    """
+    Client-side limiter for the Binance REST "request weight" budget.
+
+    Every request declares its weight; acquire() waits until the sum of
+    weights used within the sliding window leaves room for it. One instance
+    should be shared by all clients talking to the same API host, so that
+    together they stay below the limit (6000 weight / minute for /api/v3).
+    """
+
+    def __init__(
+        self,
+        max_weight: int = 6000,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param max_weight: weight allowed per window
+        :param window: window length in seconds
+        :param clock: monotonic clock (injectable for tests)
+        """
+        self._max_weight = max_weight
+        self._window = window
+        self._clock = clock
+        self._used: collections.deque[tuple[float, int]] = collections.deque()
+        self._lock = asyncio.Lock()
+
+    @property
+    def used_weight(self) -> int:
+        """
+        Weight consumed within the current window.
+        """
+        self._purge(self._clock())
+        return sum(w for _, w in self._used)
+
+    def _purge(self, now: float) -> None:
+        while self._used and now - self._used[0][0] >= self._window:
+            self._used.popleft()
+
+    async def acquire(self, weight: int) -> None:
+        """
+        Waits until `weight` fits into the budget and reserves it.
+
+        :param weight: request weight as documented by Binance
+        :raises ValueError: if the weight can never fit into the budget
+        """
+        if weight > self._max_weight:
+            raise ValueError(
+                f"Request weight {weight} exceeds the limit {self._max_weight}."
+            )
+
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._purge(now)
+                used = sum(w for _, w in self._used)
+                if used + weight <= self._max_weight:
+                    self._used.append((now, weight))
+                    return
+                # Sleep until the oldest reservation leaves the window
+                await asyncio.sleep(self._window - (now - self._used[0][0]))
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Reconciles the local budget with the weight reported by the server
+        (X-MBX-USED-WEIGHT-1M), e.g. when other processes share the same IP.
+
+        :param headers: HTTP response headers
+        """
+        reported = headers.get("x-mbx-used-weight-1m")
+        if reported is None:
+            return
+        try:
+            server_used = int(reported)
+        except ValueError:
+            return
+
+        now = self._clock()
+        self._purge(now)
+        missing = server_used - sum(w for _, w in self._used)
+        if missing > 0:
+            self._used.append((now, missing))
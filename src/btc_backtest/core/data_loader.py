@@ -1,13 +1,49 @@
 import asyncio
+import logging
 import os
+import time
 from datetime import datetime
+from typing import AsyncIterator
 
 import httpx
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from btc_backtest.core.binance.cache_manager import CacheManager, load_checksums
 from btc_backtest.core.binance.fetcher import BinanceFetcher
 from btc_backtest.core.binance.parser import parse_kline_zip
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.progress import (
+    LoaderStats,
+    ProgressReporter,
+    configure_logging,
+    shutdown_logging,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def iter_months(
+    start_year: int, start_month: int, end_year: int, end_month: int
+) -> list[tuple[int, int]]:
+    """
+    Lists (year, month) pairs from [start_year, start_month] to [end_year, end_month]
+    inclusive.
+    """
+    months = []
+    current_date = datetime(start_year, start_month, 1)
+    end_date = datetime(end_year, end_month, 1)
+    while current_date <= end_date:
+        y = current_date.year
+        m = current_date.month
+        months.append((y, m))
+
+        if m == 12:
+            current_date = datetime(y + 1, 1, 1)
+        else:
+            current_date = datetime(y, m + 1, 1)
+    return months
 
 
 class BinanceDataLoader:
@@ -17,6 +53,8 @@ class BinanceDataLoader:
      - download_monthly_klines(...) : downloads a CSV file for a specific month/year
      - load_data_for_period(...)    : downloads data for a range (start_year..end_year)
      - load_all_symbols(...)        : handles a list of symbols
+     - iter_symbols(...)            : streams symbols as soon as they are loaded
+     - is_not_found(...)            : tells a missing file (404) from a failure
     """
 
     def __init__(
@@ -28,86 +66,162 @@ class BinanceDataLoader:
         end_year: int,
         end_month: int,
         interval: str = "1m",
+        stats: LoaderStats | None = None,
     ):
+        """
+        :param stats: counters shared with a ProgressReporter (and the fetcher,
+            to count retries); a new LoaderStats is created if omitted
+        """
         self.fetcher = fetcher
         self.cache = cache
+        self.stats = stats if stats is not None else LoaderStats()
         self._start_year = start_year
         self._start_month = start_month
         self._end_year = end_year
         self._end_month = end_month
         self._interval = interval
 
+    @property
+    def interval(self) -> str:
+        return self._interval
+
+    def is_not_found(self, symbol: str, year: int, month: int) -> bool:
+        """
+        Whether the month's file is known not to exist (404), as opposed to
+        a download that failed or was skipped after a recent failure.
+        """
+        reason = self.cache.missing_reason(symbol, self._interval, year, month)
+        return reason == "404"
+
     async def download_monthly_klines(
         self, symbol: str, year: int, month: int
     ) -> pd.DataFrame:
         """
         1) Checks the cache (CacheManager) to see if the file already exists.
-        2) If it doesn't exist or is corrupted, downloads it from BinanceFetcher.
-        3) If a 404 status is received, returns an empty DataFrame.
-        4) Unpacks (BinanceDataParser) and returns the resulting DataFrame.
+        2) Skips files the cache recently recorded as missing/failing.
+        3) If it doesn't exist or is corrupted, downloads it from BinanceFetcher.
+        4) If a 404 status (or a failure after retries) is received, records it
+           in the negative cache and returns an empty DataFrame.
+        5) Unpacks (BinanceDataParser) and returns the resulting DataFrame.
+        """
+        with span(
+            "loader.download_monthly_klines", symbol=symbol, year=year, month=month
+        ) as sp:
+            df = await self._download_monthly_klines(symbol, year, month)
+            sp.add_items(len(df))
+        return df
+
+    async def _download_monthly_klines(
+        self, symbol: str, year: int, month: int
+    ) -> pd.DataFrame:
+        """
+        Implementation of download_monthly_klines() (without instrumentation).
         """
         # 1) Attempt to retrieve from the cache
         cached_bytes = self.cache.get_cached_file(symbol, self._interval, year, month)
         if cached_bytes is not None:
-            print(
-                f"[CACHE HIT] Using the local file for {symbol}, {year}-{month:02d}"
+            self.stats.cache_hits += 1
+            self.stats.files_done += 1
+            logger.debug(
+                "cache hit",
+                extra={"symbol": symbol, "year": year, "month": month},
             )
             # Unpack and parse
-            return parse_kline_zip(cached_bytes)
-        else:
-            # 2) If the file is missing or invalid, download it
-            try:
+            return self._parse(cached_bytes)
+
+        # 2) Skip files recently recorded as missing (404) or failing
+        if self.cache.is_known_missing(symbol, self._interval, year, month):
+            self.stats.skipped_missing += 1
+            self.stats.files_done += 1
+            logger.debug(
+                "known missing, skipped",
+                extra={"symbol": symbol, "year": year, "month": month},
+            )
+            return pd.DataFrame()
+
+        # 3) If the file is missing or invalid, download it
+        self.stats.cache_misses += 1
+        started = time.perf_counter()
+        try:
+            with span("loader.fetch", symbol=symbol, year=year, month=month) as sp:
                 content = await self.fetcher.fetch_kline_zip(
                     symbol, self._interval, year, month
                 )
-            except httpx.HTTPError as e:
-                print(
-                    f"Error downloading (with retries) {symbol} {year}-{month:02d}: {e}"
-                )
-                return pd.DataFrame()
+                sp.add_items(len(content))
+        except httpx.HTTPError as e:
+            self.stats.errors += 1
+            self.stats.files_done += 1
+            self.cache.record_missing(
+                symbol, self._interval, year, month, type(e).__name__
+            )
+            logger.warning(
+                "download failed after retries",
+                extra={"symbol": symbol, "year": year, "month": month, "error": e},
+            )
+            return pd.DataFrame()
 
-            if content == b"404_NOT_FOUND":
-                print(
-                    f"Failed to download (404) {symbol}-{self._interval}-{year}-{month:02d}.zip"
-                )
-                return pd.DataFrame()
+        self.stats.files_done += 1
+        if content == b"404_NOT_FOUND":
+            self.stats.not_found += 1
+            self.cache.record_missing(symbol, self._interval, year, month, "404")
+            logger.debug(
+                "not found (404)",
+                extra={"symbol": symbol, "year": year, "month": month},
+            )
+            return pd.DataFrame()
 
-            # 3) Save the file to the cache
-            self.cache.save_file(symbol, self._interval, year, month, content)
-            # 4) Parse the file
-            return parse_kline_zip(content)
+        self.stats.record_download(len(content), time.perf_counter() - started)
+        logger.debug(
+            "downloaded",
+            extra={
+                "symbol": symbol,
+                "year": year,
+                "month": month,
+                "bytes": len(content),
+            },
+        )
+
+        # 4) Save the file to the cache
+        self.cache.save_file(symbol, self._interval, year, month, content)
+        # 5) Parse the file
+        return self._parse(content)
+
+    def _parse(self, content: bytes) -> pd.DataFrame:
+        """
+        Parses a kline ZIP and records the parse throughput.
+        """
+        started = time.perf_counter()
+        df = parse_kline_zip(content)
+        self.stats.record_parse(len(df), time.perf_counter() - started)
+        return df
 
     async def load_data_for_period(self, symbol: str) -> pd.DataFrame:
         """
         Downloads and concatenates monthly data for the specified symbol
         for the period from [start_year, start_month] to [end_year, end_month].
         """
-        start_date = datetime(self._start_year, self._start_month, 1)
-        end_date = datetime(self._end_year, self._end_month, 1)
-
         tasks = []
-        current_date = start_date
+        months = iter_months(
+            self._start_year, self._start_month, self._end_year, self._end_month
+        )
 
         # Using an asyncio TaskGroup (Python 3.11+)
         async with asyncio.TaskGroup() as tg:
-            while current_date <= end_date:
-                y = current_date.year
-                m = current_date.month
+            for y, m in months:
                 task = tg.create_task(self.download_monthly_klines(symbol, y, m))
                 tasks.append(task)
-
-                if m == 12:
-                    current_date = datetime(y + 1, 1, 1)
-                else:
-                    current_date = datetime(y, m + 1, 1)
+                self.stats.files_expected += 1
 
         dataframes = [t.result() for t in tasks if not t.result().empty]
 
         if not dataframes:
-            print(f"No data collected for symbol {symbol}.")
+            logger.info("no data collected", extra={"symbol": symbol})
             return pd.DataFrame()
 
-        full_data = pd.concat(dataframes, ignore_index=True)
+        with span("loader.concat", symbol=symbol) as sp:
+            # Keep the open_time index so symbols can be aligned on time
+            full_data = pd.concat(dataframes)
+            sp.add_items(len(full_data))
         return full_data
 
     async def load_all_symbols(self, symbols: list[str]) -> dict[str, pd.DataFrame]:
@@ -115,18 +229,92 @@ class BinanceDataLoader:
         Downloads data for a list of symbols.
         Returns a dictionary of the form { 'SYMBOL': DataFrame }.
         """
-        async with asyncio.TaskGroup() as tg:
-            tasks = {s: tg.create_task(self.load_data_for_period(s)) for s in symbols}
+        with span("loader.load_all_symbols") as sp:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    s: tg.create_task(self.load_data_for_period(s)) for s in symbols
+                }
+            sp.add_items(len(symbols))
         results = {}
         for s, t in tasks.items():
             results[s] = t.result()
         return results
 
+    async def iter_symbols(
+        self, symbols: list[str]
+    ) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+        """
+        Downloads data for a list of symbols concurrently and yields
+        (symbol, DataFrame) pairs in completion order, so a consumer can start
+        working on a symbol while the others are still downloading.
+        Downloads still running when the consumer stops are cancelled.
+        """
+        queue: asyncio.Queue[tuple[str, pd.DataFrame] | Exception] = asyncio.Queue()
+
+        async def load(symbol: str) -> None:
+            try:
+                item = (symbol, await self.load_data_for_period(symbol))
+            except Exception as e:
+                # Re-raised in the consumer, like TaskGroup in load_all_symbols
+                item = e
+            await queue.put(item)
+
+        tasks = [asyncio.create_task(load(s)) for s in symbols]
+        try:
+            for _ in symbols:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def load_symbols(
+    symbols: list[str],
+    cache_dir: str,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    interval: str = "1m",
+    stats: LoaderStats | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Loads OHLCV data for a list of symbols through the file cache in cache_dir
+    (only missing files are downloaded).
+
+    :param start: first (year, month)
+    :param end: last (year, month), inclusive
+    :return: { symbol: DataFrame } (empty DataFrames for symbols without data)
+    """
+    checksums_file = os.path.join(cache_dir, "checksums.txt")
+    cache = CacheManager(
+        checksums=load_checksums(checksums_file),
+        cache_dir=cache_dir,
+        checksums_file=checksums_file,
+    )
+    async with httpx.AsyncClient() as client:
+        loader = BinanceDataLoader(
+            fetcher=BinanceFetcher(client=client, stats=stats),
+            cache=cache,
+            start_year=start[0],
+            start_month=start[1],
+            end_year=end[0],
+            end_month=end[1],
+            interval=interval,
+            stats=stats,
+        )
+        return await loader.load_all_symbols(symbols)
+
 
 def save_aggregated_parquet(results: dict[str, pd.DataFrame], outfile: str) -> None:
     """
-    Merges all DataFrames from the `results` dictionary into a single DataFrame
-    and saves it in Parquet format using Snappy compression.
+    Merges all DataFrames from the `results` dictionary into a single Parquet
+    file (Snappy compression) with a `symbol` and an `open_time` column.
+    Every symbol is written as its own row group(s), so that
+    load_aggregated_parquet() can read single symbols without decoding the
+    others.
 
     :param results: A dict where the key is a symbol and the value is a pd.DataFrame.
     :param outfile: Path to the output .parquet file (relative or absolute).
@@ -138,19 +326,49 @@ def save_aggregated_parquet(results: dict[str, pd.DataFrame], outfile: str) -> N
     # Keep only non-empty DataFrames
     results = {sym: df for sym, df in results.items() if not df.empty}
     if not results:
-        print("All DataFrames are empty – nothing to save.")
+        logger.warning("all DataFrames are empty, nothing to save")
         return
 
-    # Merge all DataFrames
-    all_data = pd.concat(results.values(), ignore_index=True)
-
-    if all_data.empty:
-        print("No data to save.")
-        return
+    os.makedirs(os.path.dirname(outfile_path) or ".", exist_ok=True)
+    rows = 0
+    writer: pq.ParquetWriter | None = None
+    try:
+        for symbol, df in results.items():
+            frame = df.rename_axis("open_time").reset_index()
+            frame.insert(0, "symbol", symbol)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    outfile_path, table.schema, compression="snappy"
+                )
+            writer.write_table(table.cast(writer.schema))
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    logger.info(
+        "aggregated data saved",
+        extra={"path": outfile_path, "rows": rows, "compression": "snappy"},
+    )
+
+
+def load_aggregated_parquet(
+    path: str, symbols: list[str] | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Reads a file written by save_aggregated_parquet() back into per-symbol
+    frames indexed by open_time; with `symbols`, only their row groups are read.
 
-    # Save to Parquet with Snappy compression
-    all_data.to_parquet(outfile_path, compression="snappy", index=False)
-    print(f"Data saved to {outfile_path} (Snappy compression).")
+    :param path: the .parquet file
+    :param symbols: symbols to load (default: all)
+    :return: { symbol: DataFrame }
+    """
+    filters = [("symbol", "in", symbols)] if symbols is not None else None
+    data = pd.read_parquet(path, filters=filters)
+    return {
+        str(symbol): frame.drop(columns="symbol").set_index("open_time")
+        for symbol, frame in data.groupby("symbol", sort=False)
+    }
 
 
 async def main() -> None:
@@ -164,8 +382,11 @@ async def main() -> None:
         "REDBTC",
     ]
 
+    configure_logging()
+    stats = LoaderStats()
+
     async with httpx.AsyncClient() as client:
-        fetcher = BinanceFetcher(client=client)
+        fetcher = BinanceFetcher(client=client, stats=stats)
 
         checksums_file = "checksums.txt"
         checksums = load_checksums(checksums_file)
@@ -182,12 +403,16 @@ async def main() -> None:
             end_year=2025,
             end_month=2,
             interval="1m",
+            stats=stats,
         )
 
-        results = await loader.load_all_symbols(top_100_btc)
+        async with ProgressReporter(stats, interval=5.0):
+            results = await loader.load_all_symbols(top_100_btc)
 
         save_aggregated_parquet(results, "data/binance_1m_data.parquet")
 
+    shutdown_logging()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
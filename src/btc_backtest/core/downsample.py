@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: picks n_out points that preserve the visual
+    shape of the line (first and last points are always kept).
+
+    The loop runs once per output bucket (not per input point) and every
+    iteration is a NumPy operation over the bucket, so the cost is bounded by
+    the point budget rather than by the length of the history.
+
+    :param x: x coordinates (e.g. int64 timestamps), increasing
+    :param y: y values
+    :param n_out: number of points to keep
+    :return: sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets over the points between the first and the last one
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        # Twice the area of the triangle (selected point, candidate, next average)
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max bucketing: splits the series into (n_out - 2) / 2 equal buckets and
+    keeps the minimum and the maximum of each plus the first and last points
+    (fully vectorized), so spikes and drawdowns are never smoothed away.
+
+    :param y: y values
+    :param n_out: maximum number of points to keep
+    :return: sorted unique indices of the selected points
+    """
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    bucket_size = -(-n // n_buckets)  # ceil division
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    # Buckets past the end of a short series are all-NaN: keep their first slot
+    valid = ~np.isnan(buckets).all(axis=1)
+    filled = np.where(np.isnan(buckets), np.inf, buckets)
+    mins = offsets + filled.argmin(axis=1)
+    filled = np.where(np.isnan(buckets), -np.inf, buckets)
+    maxs = offsets + filled.argmax(axis=1)
+    indices = np.concatenate(([0, n - 1], mins[valid], maxs[valid]))
+    return np.unique(indices)
+
+
+def downsample_series(
+    series: pd.Series, max_points: int | None, method: str = "lttb"
+) -> pd.Series:
+    """
+    Reduces a (time-indexed) series to at most max_points points for plotting.
+
+    :param series: e.g. an equity curve
+    :param max_points: point budget (None keeps every point)
+    :param method: "lttb" or "minmax"
+    :return: the selected points of the series (NaNs dropped)
+    :raises ValueError: if the method is unknown
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(
+            f"Unknown downsampling method {method!r}, "
+            f"expected one of {DOWNSAMPLE_METHODS}."
+        )
+    series = series.dropna()
+    if max_points is None or len(series) <= max_points:
+        return series
+
+    values = series.to_numpy(dtype=np.float64)
+    if method == "minmax":
+        indices = minmax_indices(values, max_points)
+    else:
+        if isinstance(series.index, pd.DatetimeIndex):
+            x = series.index.asi8
+        else:
+            x = np.arange(len(series))
+        indices = lttb_indices(x, values, max_points)
+    return series.iloc[indices]
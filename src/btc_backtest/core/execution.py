@@ -0,0 +1,116 @@
+from typing import Any, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.panel import PriceData
+
+FILL_MODES = ("close", "next_open")
+
+
+class ExecutionModel(NamedTuple):
+    """
+    How signals are turned into fills by vectorbt.Portfolio.from_signals().
+
+    The default reproduces the original behaviour (fill at the signal bar's
+    close without slippage). Everything is computed on whole arrays, so the
+    model works unchanged for a single symbol (Series) and for a wide panel
+    (one column per symbol).
+
+    - fill: "close" fills at the close of the signal bar; "next_open" fills at
+      the open of the following bar (a signal computed from a bar's close
+      cannot be traded before that bar has ended)
+    - slippage: base slippage as a fraction of the price (0.0005 = 5 bps)
+    - volume_impact: additional slippage per unit of participation, where
+      participation = order notional / quote volume of the fill bar
+    - max_slippage: upper bound for the total slippage (also used for bars
+      without any volume)
+    - sl_stop / tp_stop: stop-loss / take-profit distance as a fraction of the
+      entry price, evaluated against each bar's high and low
+    """
+
+    fill: str = "close"
+    slippage: float = 0.0
+    volume_impact: float = 0.0
+    max_slippage: float = 0.05
+    sl_stop: float | None = None
+    tp_stop: float | None = None
+
+    def shift_signal(self, signal: PriceData) -> PriceData:
+        """
+        Moves a boolean signal from the signal bars to the execution bars.
+
+        :raises ValueError: if the fill mode is unknown
+        """
+        return self.shift_values(signal, fill_value=False).astype(bool)
+
+    def shift_values(self, values: Any, fill_value: Any) -> Any:
+        """
+        Moves per-bar values (signals, order sizes) computed on the signal bars
+        to the execution bars. Scalars are returned unchanged.
+
+        :param values: scalar, Series or DataFrame
+        :param fill_value: value for the first bar(s) after shifting
+        :raises ValueError: if the fill mode is unknown
+        """
+        if self.fill not in FILL_MODES:
+            raise ValueError(
+                f"Unknown fill mode {self.fill!r}, expected one of {FILL_MODES}."
+            )
+        if self.fill == "close" or not isinstance(values, (pd.Series, pd.DataFrame)):
+            return values
+        return values.shift(1, fill_value=fill_value)
+
+    def slippage_for(self, data: pd.DataFrame, order_notional: float | PriceData) -> Any:
+        """
+        Per-bar slippage: the base slippage plus a part proportional to the
+        share of the bar's quote volume the order would take.
+
+        :param data: OHLCV data (or a (field, symbol) panel)
+        :param order_notional: expected order value in quote currency, a
+            scalar or per bar (aligned with data["close"])
+        :return: a scalar if there is no volume impact, otherwise an array
+            aligned with data["close"]
+        """
+        if self.volume_impact == 0.0:
+            return min(self.slippage, self.max_slippage)
+
+        if "quote_asset_volume" in data:
+            quote_volume = data["quote_asset_volume"]
+        else:
+            quote_volume = data["volume"] * data["close"]
+        quote_volume = quote_volume.where(quote_volume > 0)
+        if isinstance(order_notional, pd.DataFrame) and isinstance(
+            quote_volume, pd.Series
+        ):
+            # Several order streams on one symbol (e.g. batched configurations)
+            participation = order_notional.div(quote_volume, axis=0)
+        else:
+            participation = order_notional / quote_volume
+        slippage = self.slippage + self.volume_impact * participation
+        return slippage.clip(upper=self.max_slippage).fillna(self.max_slippage)
+
+    def simulation_kwargs(
+        self, data: pd.DataFrame, order_notional: float | PriceData
+    ) -> dict[str, Any]:
+        """
+        Keyword arguments for vectorbt.Portfolio.from_signals() implementing
+        this model (fill price, slippage and OHLC-based stops).
+
+        :param data: OHLCV data (or a (field, symbol) panel)
+        :param order_notional: expected order value in quote currency
+        :return: arguments to merge into the from_signals() call
+        """
+        kwargs: dict[str, Any] = {
+            "slippage": self.slippage_for(data, order_notional)
+        }
+        if self.fill == "next_open":
+            kwargs["price"] = data["open"]
+
+        if self.sl_stop is not None or self.tp_stop is not None:
+            kwargs["sl_stop"] = self.sl_stop if self.sl_stop is not None else np.nan
+            kwargs["tp_stop"] = self.tp_stop if self.tp_stop is not None else np.nan
+            for field in ("open", "high", "low"):
+                if field in data:
+                    kwargs[field] = data[field]
+        return kwargs
@@ -0,0 +1,332 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from types import TracebackType
+from typing import Any, Callable, ParamSpec, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+class Span:
+    """
+    A single timed stage of the pipeline.
+
+    Records wall time, process CPU time, the growth of the peak RSS and
+    (if the tracer tracks memory) the tracemalloc peak above the allocation
+    level at span start. Spans nest: the parent is the span active in the
+    current thread/asyncio task when this one is entered.
+    """
+
+    __slots__ = (
+        "name",
+        "attrs",
+        "items",
+        "parent",
+        "start_ns",
+        "wall_ns",
+        "cpu_ns",
+        "rss_peak_delta_kb",
+        "mem_peak_bytes",
+        "tid",
+        "_tracer",
+        "_cpu_start",
+        "_rss_start",
+        "_mem_start",
+        "_child_mem_peak",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.items = 0
+        self.parent: Span | None = None
+        self.start_ns = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.rss_peak_delta_kb = 0
+        self.mem_peak_bytes = 0
+        self.tid = 0
+        self._tracer = tracer
+        self._cpu_start = 0
+        self._rss_start = 0
+        self._mem_start = 0
+        self._child_mem_peak = 0
+        self._token: contextvars.Token[Span | None] | None = None
+
+    def add_items(self, n: int) -> None:
+        """
+        Increments the number of processed items (rows, files, bytes...).
+        """
+        self.items += n
+
+    def set(self, **attrs: Any) -> None:
+        """
+        Attaches additional attributes to the span.
+        """
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.tid = _current_tid()
+
+        if self._tracer.track_memory and tracemalloc.is_tracing():
+            current, peak_so_far = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                # Resetting the peak hides it from the parent, so hand it over
+                self.parent._child_mem_peak = max(
+                    self.parent._child_mem_peak, peak_so_far
+                )
+            tracemalloc.reset_peak()
+            self._mem_start = current
+
+        self._rss_start = _peak_rss_kb()
+        self._cpu_start = time.process_time_ns()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.wall_ns = time.perf_counter_ns() - self.start_ns
+        self.cpu_ns = time.process_time_ns() - self._cpu_start
+        self.rss_peak_delta_kb = _peak_rss_kb() - self._rss_start
+
+        if self._tracer.track_memory and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_mem_peak)
+            self.mem_peak_bytes = max(0, peak - self._mem_start)
+            if self.parent is not None:
+                self.parent._child_mem_peak = max(self.parent._child_mem_peak, peak)
+
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._tracer._record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "start_us": (self.start_ns - self._tracer.origin_ns) / 1_000,
+            "wall_s": self.wall_ns / 1e9,
+            "cpu_s": self.cpu_ns / 1e9,
+            "rss_peak_delta_kb": self.rss_peak_delta_kb,
+            "mem_peak_bytes": self.mem_peak_bytes,
+            "items": self.items,
+            "tid": self.tid,
+            "attrs": self.attrs,
+        }
+
+
+class _NoopSpan:
+    """
+    Shared span returned while tracing is disabled: does nothing at all.
+    """
+
+    __slots__ = ()
+
+    def add_items(self, n: int) -> None:
+        pass
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+class Tracer:
+    """
+    Collects finished spans and exports them as JSON or as a Chrome trace
+    (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, track_memory: bool = False) -> None:
+        """
+        :param track_memory: also measure Python allocations via tracemalloc
+            (noticeably slower, so disabled by default)
+        """
+        self.track_memory = track_memory
+        self.origin_ns = time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        return Span(self, name, attrs)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Aggregates spans by name.
+
+        :return: { name: {count, wall_s, cpu_s, items, max_mem_peak_bytes} }
+        """
+        result: dict[str, dict[str, float]] = {}
+        for s in self.spans:
+            agg = result.setdefault(
+                s.name,
+                {
+                    "count": 0,
+                    "wall_s": 0.0,
+                    "cpu_s": 0.0,
+                    "items": 0,
+                    "max_mem_peak_bytes": 0,
+                },
+            )
+            agg["count"] += 1
+            agg["wall_s"] += s.wall_ns / 1e9
+            agg["cpu_s"] += s.cpu_ns / 1e9
+            agg["items"] += s.items
+            agg["max_mem_peak_bytes"] = max(
+                agg["max_mem_peak_bytes"], s.mem_peak_bytes
+            )
+        return result
+
+    def export_json(self, path: str) -> None:
+        """
+        Writes all spans and the per-name summary to a JSON file.
+        """
+        payload = {
+            "spans": [s.to_dict() for s in self.spans],
+            "summary": self.summary(),
+        }
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2, default=str)
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Writes spans in the Chrome Trace Event format ("X" complete events).
+        """
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            args = {
+                "cpu_s": s.cpu_ns / 1e9,
+                "items": s.items,
+                "rss_peak_delta_kb": s.rss_peak_delta_kb,
+                "mem_peak_bytes": s.mem_peak_bytes,
+                **{k: str(v) for k, v in s.attrs.items()},
+            }
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": "btc_backtest",
+                    "ph": "X",
+                    "ts": (s.start_ns - self.origin_ns) / 1_000,
+                    "dur": s.wall_ns / 1_000,
+                    "pid": pid,
+                    "tid": s.tid,
+                    "args": args,
+                }
+            )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_NOOP_SPAN = _NoopSpan()
+_active_tracer: Tracer | None = None
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "btc_backtest_current_span", default=None
+)
+_tids: dict[int, int] = {}
+
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _current_tid() -> int:
+    """
+    Small integer identifying the current asyncio task (or thread), so that
+    concurrent downloads end up on separate rows of the Chrome trace.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = id(task) if task is not None else threading.get_ident()
+    return _tids.setdefault(key, len(_tids))
+
+
+def span(name: str, **attrs: Any) -> Span | _NoopSpan:
+    """
+    Opens a span on the active tracer. When tracing is disabled this returns a
+    shared no-op object, so instrumented code pays only for this call.
+
+    Usage:
+        with span("parse_kline_zip") as sp:
+            ...
+            sp.add_items(len(df))
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.span(name, **attrs)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator: runs the whole function inside span(name).
+    """
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _active_tracer is None:
+                return func(*args, **kwargs)
+            with _active_tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enable_tracing(track_memory: bool = False) -> Tracer:
+    """
+    Installs a new global tracer and returns it.
+
+    :param track_memory: start tracemalloc and record allocation peaks per span
+    """
+    global _active_tracer
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _active_tracer = Tracer(track_memory=track_memory)
+    return _active_tracer
+
+
+def disable_tracing() -> Tracer | None:
+    """
+    Removes the global tracer (stopping tracemalloc if it was started for it).
+
+    :return: the tracer that was active, with all recorded spans
+    """
+    global _active_tracer
+    tracer = _active_tracer
+    _active_tracer = None
+    if tracer is not None and tracer.track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
@@ -1,7 +1,8 @@
 # project/core/metrics.py
 
+from typing import TypedDict
+
 import vectorbt as vbt
-from ccxt.base.types import TypedDict
 
 
 class Metrics(TypedDict):
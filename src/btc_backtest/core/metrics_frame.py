@@ -0,0 +1,149 @@
+from typing import Any, Iterable, Mapping
+
+import pandas as pd
+
+# Columns of the tidy metrics frame: one row per (strategy, symbol, metric)
+METRICS_COLUMNS = ("strategy", "symbol", "metric", "value")
+
+# Metrics exported to CSV and shown first in tables, in this order
+CORE_METRICS = (
+    "sharpe_ratio",
+    "drawdown",
+    "exposure",
+    "total_return",
+    "winrate",
+    "expectancy",
+)
+
+MetricRow = tuple[str, str, str, float]
+
+
+def _as_float(value: Any) -> float | None:
+    """
+    Scalar metric value as a float (None for non-numeric values such as the
+    vectorbt stats Series).
+    """
+    if isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def metric_rows(
+    strategy: str, symbol: str, metrics: Mapping[str, Any]
+) -> list[MetricRow]:
+    """
+    Converts the metrics dict of one backtest into tidy rows; non-numeric
+    entries are dropped, NaN values are kept.
+
+    :param strategy: strategy name
+    :param symbol: symbol (or any column label of the backtest)
+    :param metrics: {metric: value}
+    :return: [(strategy, symbol, metric, value), ...]
+    """
+    rows = []
+    for name, value in metrics.items():
+        number = _as_float(value)
+        if number is not None:
+            rows.append((strategy, symbol, name, number))
+    return rows
+
+
+def build_metrics_frame(rows: Iterable[MetricRow]) -> pd.DataFrame:
+    """
+    Builds the tidy metrics frame: categorical strategy/symbol/metric columns
+    (in order of first appearance) and a float64 value column.
+    """
+    return _categorize(pd.DataFrame(list(rows), columns=list(METRICS_COLUMNS)))
+
+
+def _categorize(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sets the dtypes of a tidy metrics frame (labels as categoricals whose
+    categories are in order of first appearance).
+    """
+    for column in METRICS_COLUMNS[:-1]:
+        labels = frame[column].astype(object)
+        frame[column] = pd.Categorical(labels, categories=pd.unique(labels))
+    frame["value"] = frame["value"].astype("float64")
+    return frame
+
+
+def concat_metrics(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates tidy metrics frames, merging their categories.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return build_metrics_frame([])
+    if len(frames) == 1:
+        return frames[0]
+    return _categorize(pd.concat(frames, ignore_index=True))
+
+
+def _labels_as_objects(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of a tidy metrics frame with plain (non-categorical) labels, so that
+    pivots only contain the combinations actually present.
+    """
+    return frame.astype({column: object for column in METRICS_COLUMNS[:-1]})
+
+
+def pivot_metric(
+    frame: pd.DataFrame,
+    metric: str,
+    index: str = "strategy",
+    columns: str = "symbol",
+) -> pd.DataFrame:
+    """
+    One metric as a 2-D table, by default strategies x symbols (NaN where a
+    combination has no value). Rows and columns keep the order of first
+    appearance.
+    """
+    selected = _labels_as_objects(frame[frame["metric"] == metric])
+    table = selected.pivot(index=index, columns=columns, values="value")
+    return table.reindex(
+        index=pd.unique(selected[index]), columns=pd.unique(selected[columns])
+    )
+
+
+def wide_metrics(
+    frame: pd.DataFrame, metrics: Iterable[str] | None = None
+) -> pd.DataFrame:
+    """
+    One row per (strategy, symbol) and one column per metric; CORE_METRICS
+    come first, the remaining metrics follow in order of first appearance.
+
+    :param frame: tidy metrics frame
+    :param metrics: columns to return (default: all metrics)
+    :return: DataFrame with strategy and symbol columns followed by metrics
+    """
+    if metrics is None:
+        present = list(pd.unique(frame["metric"]))
+        metrics = [m for m in CORE_METRICS if m in present]
+        metrics += [m for m in present if m not in CORE_METRICS]
+    metrics = list(metrics)
+
+    frame = _labels_as_objects(frame)
+    keys = pd.MultiIndex.from_frame(frame[["strategy", "symbol"]].drop_duplicates())
+    table = frame.pivot(
+        index=["strategy", "symbol"], columns="metric", values="value"
+    ).reindex(index=keys, columns=metrics)
+    table.columns.name = None
+    return table.reset_index()
+
+
+def metrics_from_dicts(
+    all_metrics: Mapping[str, Mapping[str, Mapping[str, Any]]],
+) -> pd.DataFrame:
+    """
+    Tidy metrics frame from a {strategy: {symbol: metrics dict}} mapping.
+    """
+    return build_metrics_frame(
+        row
+        for strategy, syms in all_metrics.items()
+        for symbol, metrics in syms.items()
+        for row in metric_rows(strategy, symbol, metrics)
+    )
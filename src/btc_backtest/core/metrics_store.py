@@ -0,0 +1,200 @@
+import os
+import re
+import time
+import uuid
+from typing import Any, Mapping
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from btc_backtest.core.metrics_frame import build_metrics_frame
+
+# Hive partitions of the metrics dataset: <root>/strategy=.../run_date=.../
+PARTITION_COLUMNS = ("strategy", "run_date")
+
+# Prefixes of the flattened strategy parameters and vectorbt stats columns
+PARAM_PREFIX = "param_"
+STATS_PREFIX = "stats_"
+
+# Columns describing the run and the data rather than the backtest result
+RUN_COLUMNS = (
+    "run_id",
+    "run_date",
+    "run_started_at",
+    "data_start",
+    "data_end",
+    "n_bars",
+    "elapsed_s",
+    "cached",
+)
+
+
+def new_run_id() -> str:
+    """
+    Identifier of one backtest run: UTC start time (sortable) plus a random
+    suffix, e.g. "20250301T120000-1a2b3c4d".
+    """
+    return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+
+def _column_name(label: str) -> str:
+    """
+    "Total Return [%]" -> "total_return_pct"
+    """
+    label = label.replace("%", "pct").replace("#", "n")
+    return re.sub(r"[^0-9a-zA-Z]+", "_", label).strip("_").lower()
+
+
+def _scalar(value: Any) -> Any:
+    """
+    Parquet-friendly scalar: numbers, strings and timestamps are kept,
+    timedeltas become seconds, NaT becomes None and other objects their repr().
+    """
+    if value is pd.NaT:
+        return None
+    if value is None or isinstance(value, (bool, int, float, str, pd.Timestamp)):
+        return value
+    if isinstance(value, pd.Timedelta):
+        return value.total_seconds()
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    return repr(value)
+
+
+def param_columns(params: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Flattens strategy parameters into param_<name> columns. NamedTuple
+    parameters (e.g. an ExecutionModel or a sizer) become one column with
+    their type name plus one param_<name>_<field> column per field.
+
+    :param params: keyword arguments of the strategy
+    :return: {column: scalar value}
+    """
+    columns: dict[str, Any] = {}
+    for name, value in params.items():
+        if isinstance(value, tuple) and hasattr(value, "_asdict"):
+            columns[f"{PARAM_PREFIX}{name}"] = type(value).__name__
+            for field, field_value in value._asdict().items():
+                columns[f"{PARAM_PREFIX}{name}_{field}"] = _scalar(field_value)
+        else:
+            columns[f"{PARAM_PREFIX}{name}"] = _scalar(value)
+    return columns
+
+
+def stats_columns(stats: pd.Series | None) -> dict[str, Any]:
+    """
+    Flattens the vectorbt stats() Series into stats_<name> columns
+    (Start/End are left out, the data range is stored separately).
+    """
+    if stats is None:
+        return {}
+    return {
+        f"{STATS_PREFIX}{_column_name(str(label))}": _scalar(value)
+        for label, value in stats.items()
+        if label not in ("Start", "End")
+    }
+
+
+def append_metrics_dataset(
+    frame: pd.DataFrame, root: str, run_id: str, part: int = 0
+) -> list[str]:
+    """
+    Appends the metrics of one run to a Hive-partitioned Parquet dataset.
+    Every run writes its own files (named after the run id and the part), so
+    runs never overwrite each other and concurrent writers do not clash.
+
+    :param frame: one row per backtest, with the PARTITION_COLUMNS and run_id
+    :param root: dataset directory
+    :param run_id: id of the run (used in the file names)
+    :param part: index of the write within the run (used in the file names)
+    :return: paths of the written files
+    """
+    if frame.empty:
+        return []
+    written: list[str] = []
+    os.makedirs(root, exist_ok=True)
+    # One write per strategy: the parameter columns differ between strategies
+    for _, group in frame.groupby("strategy", sort=False, observed=True):
+        group = group.dropna(axis=1, how="all")
+        ds.write_dataset(
+            pa.Table.from_pandas(group, preserve_index=False),
+            root,
+            format="parquet",
+            partitioning=list(PARTITION_COLUMNS),
+            partitioning_flavor="hive",
+            basename_template=f"{run_id}-{part}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda f: written.append(f.path),
+        )
+    return written
+
+
+def read_metrics_dataset(
+    root: str, filter: ds.Expression | None = None, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Reads the metrics dataset written by append_metrics_dataset(). The file
+    schemas are unified, so runs of strategies with different parameters can
+    be scanned together (missing columns are null).
+
+    :param root: dataset directory
+    :param filter: optional pyarrow filter, e.g. ds.field("strategy") == "..."
+        (partition filters skip whole directories)
+    :param columns: optional subset of columns to read
+    """
+    files = [
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(root)
+        for name in names
+        if name.endswith(".parquet")
+    ]
+    if not files:
+        return pd.DataFrame()
+    partitioning = ds.partitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor="hive"
+    )
+    schema = pa.unify_schemas(
+        [pq.read_schema(path) for path in files] + [partitioning.schema],
+        promote_options="permissive",
+    )
+    dataset = ds.dataset(
+        root, schema=schema, format="parquet", partitioning=partitioning
+    )
+    return dataset.to_table(filter=filter, columns=columns).to_pandas()
+
+
+def latest_run_id(frame: pd.DataFrame) -> str | None:
+    """
+    Id of the most recently started run of a dataset frame (run ids only
+    resolve the start time to the second).
+    """
+    if frame.empty:
+        return None
+    latest = frame.sort_values(["run_started_at", "run_id"]).iloc[-1]
+    return str(latest["run_id"])
+
+
+def metrics_from_export(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tidy metrics frame (see core.metrics_frame) from rows of the metrics
+    dataset: every numeric column that is not a run, parameter or stats
+    column is a metric.
+    """
+    metric_columns = [
+        column
+        for column in frame.columns
+        if column not in RUN_COLUMNS
+        and column not in PARTITION_COLUMNS
+        and column != "symbol"
+        and not column.startswith((PARAM_PREFIX, STATS_PREFIX))
+        and pd.api.types.is_numeric_dtype(frame[column])
+    ]
+    tidy = frame.melt(
+        id_vars=["strategy", "symbol"],
+        value_vars=metric_columns,
+        var_name="metric",
+        value_name="value",
+    )
+    return build_metrics_frame(tidy.itertuples(index=False, name=None))
@@ -0,0 +1,236 @@
+"""
+Screening of all symbol pairs for spread trading.
+
+The close prices of all symbols are taken as one (time x symbol) matrix of
+log prices (the last `window` bars of an aligned panel). Return correlations
+of all pairs come from one correlation matrix per sub-window. The pairs that
+are correlated enough are then tested for cointegration (Engle-Granger) in
+blocks: every block is a handful of matrix operations over (time x pairs)
+arrays, and blocks can be spread over worker processes.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.panel_store import PanelStore
+
+logger = logging.getLogger(__name__)
+
+# Asymptotic critical values of the Engle-Granger test (two variables,
+# constant, no trend; MacKinnon 2010)
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+SCAN_COLUMNS = [
+    "first",
+    "second",
+    "correlation",
+    "min_correlation",
+    "hedge_ratio",
+    "intercept",
+    "adf_stat",
+    "half_life",
+    "spread_std",
+    "cointegrated",
+]
+
+# Log prices of the scan, set in every worker process by _init_scan_worker()
+_worker_log_prices: np.ndarray | None = None
+
+
+def log_price_window(close: pd.DataFrame, window: int) -> pd.DataFrame:
+    """
+    Log close prices of the last `window` bars, restricted to the symbols
+    with a positive price on every one of these bars.
+
+    :param close: (time x symbol) close prices
+    :param window: number of bars
+    :return: (window x symbol) log prices
+    """
+    recent = close.iloc[-window:]
+    complete = (recent > 0).all()
+    return np.log(recent.loc[:, complete])
+
+
+def correlation_matrices(log_prices: np.ndarray, splits: int = 1) -> np.ndarray:
+    """
+    Correlations of the 1-bar log returns of all symbols, over the whole
+    window and over `splits` consecutive sub-windows.
+
+    :param log_prices: (time x symbol) log prices
+    :param splits: number of sub-windows
+    :return: (splits + 1, symbol, symbol) array; [0] is the whole window
+    """
+    returns = np.diff(log_prices, axis=0)
+    parts = [returns, *np.array_split(returns, max(splits, 1))]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.stack(
+            [np.atleast_2d(np.corrcoef(part, rowvar=False)) for part in parts]
+        )
+
+
+def engle_granger(log_prices: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    """
+    Engle-Granger statistics of a block of pairs, computed for all pairs at
+    once: the OLS regression first = intercept + hedge_ratio * second, then a
+    Dickey-Fuller regression of the residual (the spread) on its lag.
+
+    :param log_prices: (time x symbol) log prices
+    :param pairs: (pairs x 2) column indices (first, second)
+    :return: (pairs x 5) hedge_ratio, intercept, adf_stat, half_life (bars,
+        inf if the spread does not revert) and spread_std
+    """
+    first = log_prices[:, pairs[:, 0]]
+    second = log_prices[:, pairs[:, 1]]
+    first_mean = first.mean(axis=0)
+    second_mean = second.mean(axis=0)
+    first = first - first_mean
+    second = second - second_mean
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hedge_ratio = np.einsum("tp,tp->p", second, first) / np.einsum(
+            "tp,tp->p", second, second
+        )
+        spread = first - hedge_ratio * second
+        del first, second
+
+        lagged = spread[:-1]
+        change = np.diff(spread, axis=0)
+        lagged_ss = np.einsum("tp,tp->p", lagged, lagged)
+        gamma = np.einsum("tp,tp->p", lagged, change) / lagged_ss
+        change -= gamma * lagged
+        variance = np.einsum("tp,tp->p", change, change) / (len(change) - 1)
+        adf_stat = gamma / np.sqrt(variance / lagged_ss)
+        half_life = np.where(gamma < 0, -np.log(2) / np.log1p(gamma), np.inf)
+
+    return np.column_stack(
+        [
+            hedge_ratio,
+            first_mean - hedge_ratio * second_mean,
+            adf_stat,
+            half_life,
+            spread.std(axis=0),
+        ]
+    )
+
+
+def _init_scan_worker(
+    source: np.ndarray | PanelStore, symbols: list[str], window: int
+) -> None:
+    """
+    Loads the log prices once per worker process: a PanelStore is mapped
+    from disk, an array is received with the process arguments.
+    """
+    global _worker_log_prices
+    if isinstance(source, PanelStore):
+        close = source.frame("close", symbols)
+        source = log_price_window(close, window).to_numpy()
+    _worker_log_prices = source
+
+
+def _scan_block(pairs: np.ndarray) -> np.ndarray:
+    return engle_granger(_worker_log_prices, pairs)
+
+
+def scan_pairs(
+    close: pd.DataFrame | PanelStore,
+    window: int = 43_200,
+    min_correlation: float = 0.5,
+    splits: int = 4,
+    block_size: int = 64,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """
+    Screens all pairs of symbols for spread trading on the last `window`
+    bars.
+
+    Pairs whose return correlation over the window is below min_correlation
+    are dropped; the others are tested for cointegration (first regressed on
+    second, in blocks of block_size pairs). Symbols without a price on every
+    bar of the window are left out.
+
+    :param close: (time x symbol) close prices, e.g. build_panel(data)["close"],
+        or a PanelStore (worker processes then map it instead of receiving
+        the prices)
+    :param window: number of most recent bars to test
+    :param min_correlation: lowest return correlation of a tested pair
+    :param splits: number of sub-windows for min_correlation (the lowest
+        correlation of the pair in any of them, a stability check)
+    :param block_size: number of pairs tested at once
+    :param workers: number of worker processes (1: test in this process)
+    :return: one row per tested pair (columns SCAN_COLUMNS), most negative
+        ADF statistic (strongest mean reversion) first
+    """
+    frame = close.frame("close") if isinstance(close, PanelStore) else close
+    log_prices = log_price_window(frame, window)
+    symbols = list(log_prices.columns)
+    values = log_prices.to_numpy()
+
+    with span("pairs.scan", symbols=len(symbols)) as sp:
+        correlations = correlation_matrices(values, splits)
+        first, second = np.triu_indices(len(symbols), k=1)
+        correlation = correlations[0, first, second]
+        keep = correlation >= min_correlation
+        pairs = np.column_stack([first[keep], second[keep]])
+        blocks = [
+            pairs[start : start + block_size]
+            for start in range(0, len(pairs), block_size)
+        ]
+
+        if workers > 1 and len(blocks) > 1:
+            source = close if isinstance(close, PanelStore) else values
+            # "spawn": like the backtest workers, never fork logging threads
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                workers,
+                mp_context=context,
+                initializer=_init_scan_worker,
+                initargs=(source, symbols, window),
+            ) as pool:
+                results = list(pool.map(_scan_block, blocks))
+        else:
+            results = [engle_granger(values, block) for block in blocks]
+        stats = np.vstack(results) if results else np.empty((0, 5))
+        sp.add_items(len(pairs))
+
+    scan = pd.DataFrame(
+        {
+            "first": np.asarray(symbols, dtype=object)[pairs[:, 0]],
+            "second": np.asarray(symbols, dtype=object)[pairs[:, 1]],
+            "correlation": correlation[keep],
+            "min_correlation": correlations[1:, pairs[:, 0], pairs[:, 1]].min(axis=0),
+            "hedge_ratio": stats[:, 0],
+            "intercept": stats[:, 1],
+            "adf_stat": stats[:, 2],
+            "half_life": stats[:, 3],
+            "spread_std": stats[:, 4],
+        }
+    )
+    scan["cointegrated"] = scan["adf_stat"] < EG_CRITICAL_VALUES[0.05]
+    scan = scan.sort_values("adf_stat", ignore_index=True)
+    logger.info(
+        "pairs scanned",
+        extra={
+            "symbols": len(symbols),
+            "pairs": len(first),
+            "tested": len(pairs),
+            "cointegrated": int(scan["cointegrated"].sum()),
+        },
+    )
+    return scan[SCAN_COLUMNS]
+
+
+def top_pairs(
+    scan: pd.DataFrame, n: int = 10, cointegrated_only: bool = True
+) -> list[tuple[str, str]]:
+    """
+    The n best pairs of a scan_pairs() result, as (first, second) tuples for
+    PairsSpreadStrategy.
+    """
+    if cointegrated_only:
+        scan = scan[scan["cointegrated"]]
+    return list(zip(scan["first"].head(n), scan["second"].head(n)))
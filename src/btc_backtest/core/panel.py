@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+# A single symbol (Series) or one column per symbol (DataFrame)
+PriceData = pd.Series | pd.DataFrame
+
+
+def build_panel(
+    data_dict: dict[str, pd.DataFrame],
+    fields: tuple[str, ...] = OHLCV_FIELDS,
+) -> pd.DataFrame:
+    """
+    Aligns per-symbol OHLCV frames on their common time axis and returns one
+    wide DataFrame with (field, symbol) columns, so that panel["close"] is a
+    DataFrame with one column per symbol.
+
+    Timestamps missing for a symbol (before its listing, gaps) are NaN; such
+    bars produce no signals and no orders in vectorbt.
+
+    :param data_dict: { symbol: DataFrame indexed by open_time }
+    :param fields: columns to keep from every frame
+    :return: wide panel sorted by time, columns MultiIndex (field, symbol)
+    """
+    frames = {sym: df[list(fields)] for sym, df in data_dict.items() if not df.empty}
+    if not frames:
+        return pd.DataFrame()
+
+    # (symbol, field) columns, outer-joined on the time index
+    panel = pd.concat(frames, axis=1, sort=True)
+    panel.columns = panel.columns.swaplevel(0, 1)
+    panel.columns.names = ["field", "symbol"]
+    return panel[list(fields)]
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Read-only view of a DataFrame: a new frame (same index and columns) whose
+    columns are views of df's arrays flagged writeable=False. Nothing is
+    copied. Writes into the values through NumPy (.to_numpy(), .values) raise
+    ValueError; writes through pandas (.iloc, .loc) raise as well or, when
+    copy-on-write has to copy the column anyway, only change the view.
+    Either way df keeps its values. Replacing or adding whole columns only
+    changes the view.
+
+    Columns with pandas extension dtypes are passed as Series, protected by
+    copy-on-write alone.
+
+    :param df: the frame to share (OHLCV data or a (field, symbol) panel)
+    :return: the read-only view
+    """
+    columns = {}
+    for position, (_, series) in enumerate(df.items()):
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy().view()
+            values.flags.writeable = False
+            columns[position] = values
+        else:
+            columns[position] = series
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.columns = df.columns
+    return frozen
@@ -0,0 +1,212 @@
+"""
+Wide (time x symbol) price matrices persisted as memory-mapped .npy files.
+
+    <root>/meta.json        symbols, fields, grid start/frequency, shape
+    <root>/timestamps.npy   int64 timestamps of the common time grid
+    <root>/<field>.npy      float64 matrix, one column per symbol
+
+Every symbol is aligned to one regular time grid (NaN where it has no bar)
+when the store is written. Opening a store maps the files read-only: nothing
+is read until it is used, and all processes that open the same store share
+one physical copy through the page cache. Matrices are stored column-major,
+so one symbol's series is a contiguous block.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+TIMESTAMPS_FILE = "timestamps.npy"
+STORE_FIELDS = ("close", "volume", "high", "low")
+
+
+def common_grid(
+    data_dict: dict[str, pd.DataFrame], freq: str = "1min"
+) -> pd.DatetimeIndex:
+    """
+    Regular time grid from the first to the last bar of all symbols.
+
+    :raises ValueError: if there is no data
+    """
+    frames = [df for df in data_dict.values() if not df.empty]
+    if not frames:
+        raise ValueError("Cannot build a panel store without data.")
+    start = min(df.index[0] for df in frames)
+    end = max(df.index[-1] for df in frames)
+    return pd.date_range(start, end, freq=freq, name="open_time")
+
+
+def write_panel_store(
+    data_dict: dict[str, pd.DataFrame],
+    root: str,
+    fields: Iterable[str] = STORE_FIELDS,
+    freq: str = "1min",
+) -> "PanelStore":
+    """
+    Aligns all symbols to a common time grid and writes one memory-mapped
+    matrix per field. Symbols are written one at a time, so the full panel is
+    never held in memory. The store is built in a temporary directory and
+    then replaces any store at `root` (processes that still have the old one
+    mapped keep reading its files).
+
+    :param data_dict: { symbol: OHLCV DataFrame indexed by open_time }
+    :param root: store directory
+    :param fields: columns to store
+    :param freq: grid frequency; every bar must fall on the grid
+    :return: the opened store
+    :raises ValueError: if there is no data or a bar is not on the grid
+    """
+    fields = tuple(fields)
+    data_dict = {sym: df for sym, df in data_dict.items() if not df.empty}
+    grid = common_grid(data_dict, freq)
+    symbols = list(data_dict)
+    shape = (len(grid), len(symbols))
+
+    tmp_root = f"{root.rstrip(os.sep)}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp_root)
+    try:
+        np.save(os.path.join(tmp_root, TIMESTAMPS_FILE), grid.asi8)
+        matrices = {
+            field: np.lib.format.open_memmap(
+                os.path.join(tmp_root, f"{field}.npy"),
+                mode="w+",
+                dtype=np.float64,
+                shape=shape,
+                fortran_order=True,
+            )
+            for field in fields
+        }
+        for column, (symbol, df) in enumerate(data_dict.items()):
+            rows = grid.get_indexer(df.index)
+            if (rows < 0).any():
+                raise ValueError(f"{symbol}: bars outside the {freq} grid.")
+            for field, matrix in matrices.items():
+                matrix[:, column] = np.nan
+                matrix[rows, column] = df[field].to_numpy(dtype=np.float64)
+        for matrix in matrices.values():
+            matrix.flush()
+        del matrices
+
+        meta = {
+            "symbols": symbols,
+            "fields": list(fields),
+            "freq": freq,
+            "start": grid[0].isoformat(),
+            "unit": grid.unit,
+            "tz": str(grid.tz) if grid.tz is not None else None,
+            "shape": list(shape),
+        }
+        with open(os.path.join(tmp_root, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+
+        if os.path.isdir(root):
+            shutil.rmtree(root)
+        os.rename(tmp_root, root)
+    except BaseException:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+    return PanelStore(root)
+
+
+class PanelStore:
+    """
+    Read-only view of a store written by write_panel_store(). The matrices
+    are np.memmap objects opened on first use; frames built from them wrap
+    the mapped memory without copying.
+
+    A PanelStore pickles as its path, so it can be passed to worker
+    processes cheaply: every worker maps the same files.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: store directory
+        """
+        self.root = root
+        with open(os.path.join(root, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.symbols: list[str] = meta["symbols"]
+        self.fields: list[str] = meta["fields"]
+        self.freq: str = meta["freq"]
+        self._tz: str | None = meta["tz"]
+        self._unit: str = meta["unit"]
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._index: pd.DatetimeIndex | None = None
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        return PanelStore, (self.root,)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """
+        The common time grid.
+        """
+        if self._index is None:
+            ticks = np.load(os.path.join(self.root, TIMESTAMPS_FILE))
+            index = pd.DatetimeIndex(
+                ticks.view(f"datetime64[{self._unit}]"), name="open_time"
+            )
+            self._index = index.tz_localize(self._tz) if self._tz else index
+        return self._index
+
+    def array(self, field: str) -> np.ndarray:
+        """
+        The (time x symbol) matrix of a field, memory-mapped read-only.
+
+        :raises KeyError: if the field is not stored
+        """
+        if field not in self._arrays:
+            if field not in self.fields:
+                raise KeyError(f"Field {field!r} not in the store ({self.fields}).")
+            self._arrays[field] = np.load(
+                os.path.join(self.root, f"{field}.npy"), mmap_mode="r"
+            )
+        return self._arrays[field]
+
+    def frame(self, field: str, symbols: list[str] | None = None) -> pd.DataFrame:
+        """
+        One field as a DataFrame (time x symbol). Without `symbols` the frame
+        wraps the mapped matrix without copying.
+        """
+        matrix = self.array(field)
+        if symbols is None:
+            symbols = self.symbols
+            values = matrix
+        else:
+            values = matrix[:, [self._columns[s] for s in symbols]]
+        return pd.DataFrame(
+            values,
+            index=self.index,
+            columns=pd.Index(symbols, name="symbol"),
+            copy=False,
+        )
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        All stored fields of one symbol (columns are views of the matrices).
+        Bars where the symbol has no data are NaN.
+        """
+        column = self._columns[symbol]
+        return pd.DataFrame(
+            {field: self.array(field)[:, column] for field in self.fields},
+            index=self.index,
+            copy=False,
+        )
+
+    def panel(self, symbols: list[str] | None = None) -> pd.DataFrame:
+        """
+        Wide panel with (field, symbol) columns in the layout of
+        core.panel.build_panel() (e.g. for strategies run on all symbols at
+        once); minutes of the grid without any bar are NaN rows. This copies
+        the data.
+        """
+        frames = {field: self.frame(field, symbols) for field in self.fields}
+        return pd.concat(frames, axis=1, names=["field", "symbol"])
+
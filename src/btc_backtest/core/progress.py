@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import logging.handlers
+import queue
+import time
+from types import TracebackType
+from typing import Any
+
+logger = logging.getLogger("btc_backtest")
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = set(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats records as "<time> <level> <logger> <message> key=value ..."
+    or, with as_json=True, as one JSON object per line.
+    Structured fields are the ones passed via `extra={...}`.
+    """
+
+    def __init__(self, as_json: bool = False) -> None:
+        super().__init__()
+        self._as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
+            k: v for k, v in record.__dict__.items() if k not in _RESERVED_ATTRS
+        }
+        if self._as_json:
+            payload = {
+                "ts": record.created,
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields,
+            }
+            return json.dumps(payload, default=str)
+
+        timestamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        kv = " ".join(f"{k}={_format_value(v)}" for k, v in fields.items())
+        line = f"{timestamp} {record.levelname:<7} {record.name} {record.getMessage()}"
+        return f"{line} {kv}" if kv else line
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def configure_logging(level: int = logging.INFO, as_json: bool = False) -> None:
+    """
+    Routes the "btc_backtest" logger through a QueueHandler: records are only
+    enqueued on the calling thread (e.g. the asyncio event loop) and written to
+    stderr by a background QueueListener thread, so terminal I/O never blocks
+    downloads. Calling it again replaces the previous configuration.
+
+    :param level: minimum level to emit (per-file events are logged at DEBUG)
+    :param as_json: emit JSON lines instead of "key=value" text
+    """
+    global _listener
+    shutdown_logging()
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(StructuredFormatter(as_json=as_json))
+
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flushes and stops the background listener started by configure_logging().
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class LoaderStats:
+    """
+    Counters describing a data loading run (used for capacity planning):
+    files, cache hits/misses, 404s, skipped known-missing files, errors,
+    retries, downloaded bytes and parse throughput.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.files_expected = 0
+        self.files_done = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.not_found = 0
+        self.skipped_missing = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_downloaded = 0
+        self.download_seconds = 0.0
+        self.rows_parsed = 0
+        self.parse_seconds = 0.0
+
+    def record_parse(self, rows: int, seconds: float) -> None:
+        self.rows_parsed += rows
+        self.parse_seconds += seconds
+
+    def record_download(self, n_bytes: int, seconds: float) -> None:
+        self.bytes_downloaded += n_bytes
+        self.download_seconds += seconds
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        :return: raw counters plus derived rates
+        """
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "elapsed_s": elapsed,
+            "files_expected": self.files_expected,
+            "files_done": self.files_done,
+            "files_per_s": self.files_done / elapsed,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hits / lookups if lookups else 0.0,
+            "not_found": self.not_found,
+            "skipped_missing": self.skipped_missing,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_downloaded": self.bytes_downloaded,
+            "download_mb_per_s": (
+                self.bytes_downloaded / 1e6 / self.download_seconds
+                if self.download_seconds
+                else 0.0
+            ),
+            "rows_parsed": self.rows_parsed,
+            "parse_rows_per_s": (
+                self.rows_parsed / self.parse_seconds if self.parse_seconds else 0.0
+            ),
+        }
+
+
+class ProgressReporter:
+    """
+    Async context manager that logs an aggregated LoaderStats snapshot every
+    `interval` seconds while the body runs, and a final summary on exit.
+
+    Usage:
+        async with ProgressReporter(loader.stats, interval=5.0):
+            results = await loader.load_all_symbols(symbols)
+    """
+
+    def __init__(
+        self,
+        stats: LoaderStats,
+        interval: float = 5.0,
+        log: logging.Logger = logger,
+    ) -> None:
+        self._stats = stats
+        self._interval = interval
+        self._log = log
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            self._log.info("loader progress", extra=self._stats.snapshot())
+
+    async def __aenter__(self) -> "ProgressReporter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._log.info("loader finished", extra=self._stats.snapshot())
@@ -0,0 +1,184 @@
+import contextlib
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from btc_backtest.core.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+
+class FigureJob(NamedTuple):
+    """
+    A figure waiting to be written: the serialized figure and its output file.
+    """
+
+    path: str
+    fig_json: str
+    fmt: str
+    scale: float
+    digest: str
+
+
+def _render_batch(jobs: list[FigureJob]) -> list[str]:
+    """
+    Writes a batch of figures (runs in a worker process). With plotly >= 6.1
+    (Kaleido >= 1) all PNG figures of the batch are exported by a single
+    Kaleido call, so the worker starts one browser process for the whole
+    batch instead of one per figure; older versions (plotly 5 with Kaleido
+    0.2, as pinned in requirements.txt) export them one by one.
+
+    :return: paths of the written files
+    """
+    images = [job for job in jobs if job.fmt != "html"]
+    for job in jobs:
+        if job.fmt == "html":
+            pio.from_json(job.fig_json, skip_invalid=True).write_html(job.path)
+    if images and hasattr(pio, "write_images"):
+        pio.write_images(
+            [json.loads(job.fig_json) for job in images],
+            [job.path for job in images],
+            format=[job.fmt for job in images],
+            scale=[job.scale for job in images],
+            validate=False,
+        )
+    else:
+        for job in images:
+            pio.write_image(
+                json.loads(job.fig_json),
+                job.path,
+                format=job.fmt,
+                scale=job.scale,
+                validate=False,
+            )
+    return [job.path for job in jobs]
+
+
+class FigureRenderer:
+    """
+    Collects figures and writes them in one parallel rendering stage.
+
+    - Figures are queued by add() and written by render(); inside a batch()
+      block rendering is deferred until the outermost block ends, so all
+      figures of a run are rendered together.
+    - Pending figures are split across a pool of worker processes; each worker
+      exports its share of the PNGs with one Kaleido call (where supported).
+    - A figure whose content (and output format) did not change since it was
+      last written is skipped, based on a hash manifest stored next to the
+      output files.
+    - With enabled=False nothing is built or written (headless sweeps).
+    """
+
+    def __init__(
+        self,
+        manifest_file: str | None = None,
+        max_workers: int | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        :param manifest_file: JSON file with the hash of every written figure
+            (None disables skipping of unchanged figures)
+        :param max_workers: number of rendering processes
+            (default: number of CPUs, at most one per pending figure)
+        :param enabled: if False, add() and render() do nothing
+        """
+        self.enabled = enabled
+        self._manifest_file = manifest_file
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._pending: dict[str, FigureJob] = {}
+        self._batch_depth = 0
+        self._manifest: dict[str, str] = self._load_manifest()
+
+    def _load_manifest(self) -> dict[str, str]:
+        if self._manifest_file is None or not os.path.exists(self._manifest_file):
+            return {}
+        with open(self._manifest_file, "r") as f:
+            return json.load(f)
+
+    def _save_manifest(self) -> None:
+        if self._manifest_file is None:
+            return
+        tmp_path = self._manifest_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._manifest_file)
+
+    def add(self, fig: go.Figure, path: str, scale: float = 2) -> bool:
+        """
+        Queues a figure; the format is taken from the file extension.
+
+        :param fig: plotly figure
+        :param path: output file (.png, .svg, .pdf, .html ...)
+        :param scale: image scale factor (ignored for HTML)
+        :return: False if the figure was skipped (disabled or unchanged)
+        """
+        if not self.enabled:
+            return False
+
+        fmt = os.path.splitext(path)[1].lstrip(".").lower()
+        fig_json = fig.to_json()
+        digest = hashlib.sha256(f"{fmt}:{scale}:{fig_json}".encode()).hexdigest()
+        key = os.path.abspath(path)
+        if self._manifest.get(key) == digest and os.path.exists(path):
+            logger.debug("figure unchanged, skipped", extra={"path": path})
+            self._pending.pop(key, None)
+            return False
+
+        self._pending[key] = FigureJob(path, fig_json, fmt, scale, digest)
+        if self._batch_depth == 0:
+            self.render()
+        return True
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["FigureRenderer"]:
+        """
+        Defers rendering of all figures added inside the block until it ends.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.render()
+
+    def render(self) -> list[str]:
+        """
+        Writes all pending figures.
+
+        :return: paths of the written files
+        """
+        jobs = list(self._pending.values())
+        self._pending.clear()
+        if not jobs:
+            return []
+
+        n_workers = min(self._max_workers, len(jobs))
+        # Round-robin split, so large figures spread across workers
+        batches = [jobs[i::n_workers] for i in range(n_workers)]
+        with span("plot.render", figures=len(jobs), workers=n_workers) as sp:
+            if n_workers == 1:
+                written = _render_batch(jobs)
+            else:
+                # "spawn": forking a process that runs logging/asyncio threads
+                # is unsafe, and Kaleido's browser must not be shared
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(n_workers, mp_context=context) as pool:
+                    results = pool.map(_render_batch, batches)
+                    written = [path for paths in results for path in paths]
+            sp.add_items(len(written))
+
+        for job in jobs:
+            self._manifest[os.path.abspath(job.path)] = job.digest
+        self._save_manifest()
+        logger.info(
+            "figures rendered", extra={"figures": len(written), "workers": n_workers}
+        )
+        return written
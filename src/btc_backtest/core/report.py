@@ -0,0 +1,220 @@
+import base64
+import html
+import json
+import math
+from string import Template
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from btc_backtest.core.downsample import downsample_series
+from btc_backtest.core.metrics_frame import wide_metrics
+
+
+def encode_array(values: np.ndarray, dtype: str) -> str:
+    """
+    Encodes a numeric array as base64 of its little-endian bytes; the report
+    decodes it into a JS typed array (Float64Array / Float32Array) without
+    parsing any numbers.
+
+    :param values: numeric array
+    :param dtype: "<f8" or "<f4"
+    """
+    raw = np.ascontiguousarray(values, dtype=dtype).tobytes()
+    return base64.b64encode(raw).decode("ascii")
+
+
+def encode_curve(
+    name: str, series: pd.Series, max_points: int | None
+) -> dict[str, Any]:
+    """
+    Downsamples an equity curve and encodes it for the report: x as epoch
+    milliseconds (float64), y as float32.
+    """
+    points = downsample_series(series, max_points)
+    if isinstance(points.index, pd.DatetimeIndex):
+        x = points.index.as_unit("ms").asi8.astype(np.float64)
+    else:
+        x = np.arange(len(points), dtype=np.float64)
+    return {
+        "name": name,
+        "x": encode_array(x, "<f8"),
+        "y": encode_array(points.to_numpy(), "<f4"),
+    }
+
+
+def _json_number(value: Any) -> float | None:
+    """
+    Numeric metric value for JSON (None for missing/NaN/inf values).
+    """
+    number = float(value)
+    return number if math.isfinite(number) else None
+
+
+def metrics_table(metrics: pd.DataFrame) -> tuple[list[str], list[list[Any]]]:
+    """
+    Pivots the tidy metrics frame into table columns and rows: one row per
+    (strategy, symbol), one column per metric (core metrics first).
+    """
+    table = wide_metrics(metrics)
+    columns = [str(column) for column in table.columns]
+    rows = [
+        [strategy, symbol, *map(_json_number, values)]
+        for strategy, symbol, *values in table.itertuples(index=False, name=None)
+    ]
+    return columns, rows
+
+
+def render_report(
+    title: str,
+    equity: dict[str, dict[str, pd.Series]],
+    metrics: pd.DataFrame,
+    heatmap_metrics: tuple[str, ...] = ("sharpe_ratio", "total_return"),
+    max_points: int | None = 1000,
+) -> str:
+    """
+    Builds a self-contained HTML report: plotly.js is inlined once, the equity
+    curves are embedded as downsampled base64 typed arrays, and the metrics
+    are shown as a sortable table and as strategy x symbol heatmaps rendered
+    in the browser.
+
+    :param title: report title
+    :param equity: {section (e.g. strategy): {curve name: equity series}}
+    :param metrics: tidy metrics frame (see core.metrics_frame)
+    :param heatmap_metrics: metrics drawn as heatmaps
+    :param max_points: point budget per equity curve (None keeps all points)
+    :return: the HTML document
+    """
+    columns, rows = metrics_table(metrics)
+    payload = {
+        "equity": [
+            {
+                "title": section,
+                "curves": [
+                    encode_curve(name, series, max_points)
+                    for name, series in curves.items()
+                ],
+            }
+            for section, curves in equity.items()
+        ],
+        "columns": columns,
+        "rows": rows,
+        "heatmaps": [m for m in heatmap_metrics if m in columns],
+    }
+    # "</" must not appear inside a <script> element
+    data_json = json.dumps(payload, separators=(",", ":")).replace("</", "<\\/")
+    return _REPORT_TEMPLATE.substitute(
+        title=html.escape(title),
+        plotlyjs=get_plotlyjs(),
+        data=data_json,
+    )
+
+
+_REPORT_TEMPLATE = Template(
+    """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: sans-serif; margin: 20px; }
+.plot { width: 1000px; height: 600px; margin-bottom: 20px; }
+table { border-collapse: collapse; font-size: 12px; }
+th, td { border: 1px solid #ccc; padding: 3px 6px; text-align: right; }
+th { cursor: pointer; background: #f0f0f0; position: sticky; top: 0; }
+td:nth-child(-n+2) { text-align: left; }
+</style>
+<script>$plotlyjs</script>
+</head>
+<body>
+<h1>$title</h1>
+<h2>Equity curves</h2>
+<div id="equity"></div>
+<h2>Heatmaps</h2>
+<div id="heatmaps"></div>
+<h2>Metrics</h2>
+<table id="metrics"><thead></thead><tbody></tbody></table>
+<script type="application/json" id="report-data">$data</script>
+<script>
+const DATA = JSON.parse(document.getElementById("report-data").textContent);
+
+function decode(b64, ArrayType) {
+  const bin = atob(b64);
+  const bytes = new Uint8Array(bin.length);
+  for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+  return new ArrayType(bytes.buffer);
+}
+
+function newPlot(parent) {
+  const div = document.createElement("div");
+  div.className = "plot";
+  document.getElementById(parent).appendChild(div);
+  return div;
+}
+
+for (const section of DATA.equity) {
+  const traces = section.curves.map(c => ({
+    type: "scattergl", mode: "lines", name: c.name,
+    x: decode(c.x, Float64Array), y: decode(c.y, Float32Array),
+  }));
+  Plotly.newPlot(newPlot("equity"), traces, {
+    title: section.title + " - Equity Curves",
+    xaxis: {type: "date"}, yaxis: {type: "log", title: "Portfolio Value"},
+  });
+}
+
+const strategies = [...new Set(DATA.rows.map(r => r[0]))];
+const symbols = [...new Set(DATA.rows.map(r => r[1]))].sort();
+for (const metric of DATA.heatmaps) {
+  const col = DATA.columns.indexOf(metric);
+  const z = strategies.map(() => symbols.map(() => null));
+  for (const r of DATA.rows) {
+    z[strategies.indexOf(r[0])][symbols.indexOf(r[1])] = r[col];
+  }
+  Plotly.newPlot(newPlot("heatmaps"), [{
+    type: "heatmap", z: z, x: symbols, y: strategies, colorscale: "Viridis",
+  }], {title: "Heatmap: " + metric, xaxis: {side: "top", tickangle: 45}});
+}
+
+const table = document.getElementById("metrics");
+let sortCol = -1, sortAsc = true;
+// Names and params are data, not markup: cells are filled with textContent
+function row(cells, tag) {
+  const tr = document.createElement("tr");
+  cells.forEach((text, i) => {
+    const cell = tr.appendChild(document.createElement(tag));
+    cell.textContent = text;
+    if (tag === "th") cell.dataset.col = i;
+  });
+  return tr;
+}
+function renderTable() {
+  const arrow = sortAsc ? " \u25b2" : " \u25bc";
+  table.tHead.replaceChildren(row(
+    DATA.columns.map((c, i) => c + (i === sortCol ? arrow : "")), "th"
+  ));
+  table.tBodies[0].replaceChildren(...DATA.rows.map(r => row(r.map(v =>
+    v === null ? "" : typeof v === "number" ? v.toFixed(4) : String(v)
+  ), "td")));
+}
+table.tHead.addEventListener("click", e => {
+  const col = Number(e.target.dataset.col);
+  if (Number.isNaN(col)) return;
+  sortAsc = col === sortCol ? !sortAsc : true;
+  sortCol = col;
+  DATA.rows.sort((a, b) => {
+    if (a[col] === b[col]) return 0;
+    if (a[col] === null) return 1;
+    if (b[col] === null) return -1;
+    return (a[col] < b[col] ? -1 : 1) * (sortAsc ? 1 : -1);
+  });
+  renderTable();
+});
+renderTable();
+</script>
+</body>
+</html>
+"""
+)
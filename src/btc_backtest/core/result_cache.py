@@ -0,0 +1,280 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from typing import Any, NamedTuple
+
+import pandas as pd
+
+from btc_backtest.strategies.base import StrategyBase
+from btc_backtest.strategies.registry import encode_params
+
+
+class CachedResult(NamedTuple):
+    metrics: dict[str, Any]
+    equity: pd.Series
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Computes a content hash of an OHLCV DataFrame (values, index and column names).
+
+    :param df: the input DataFrame
+    :return: hex SHA-256 digest identifying the data
+    """
+    hasher = hashlib.sha256()
+    hasher.update(repr((df.shape, list(df.columns))).encode())
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    hasher.update(row_hashes.tobytes())
+    return hasher.hexdigest()
+
+
+def module_source(module_name: str) -> str:
+    """
+    Source code of a module ("" if it has none, e.g. code typed into an
+    interactive session).
+
+    :param module_name: dotted module name
+    """
+    try:
+        return inspect.getsource(importlib.import_module(module_name))
+    except (ImportError, OSError, TypeError):
+        return ""
+
+
+def strategy_version(strategy_cls: type[StrategyBase]) -> str:
+    """
+    Hashes the source code of the modules defining the strategy class and all
+    of its StrategyBase ancestors (module-level helpers such as indicator
+    functions or run_batched() included), so that editing a strategy (or the
+    base backtest logic) invalidates only the results it produced.
+
+    :param strategy_cls: the strategy class
+    :return: hex SHA-256 digest of the sources
+    """
+    hasher = hashlib.sha256()
+    modules = set()
+    for klass in strategy_cls.__mro__:
+        if not issubclass(klass, StrategyBase):
+            continue
+        hasher.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+        if klass.__module__ in modules:
+            continue
+        modules.add(klass.__module__)
+        source = module_source(klass.__module__)
+        if not source:
+            # Fall back to the class body (e.g. classes defined in __main__)
+            try:
+                source = inspect.getsource(klass)
+            except (OSError, TypeError):
+                # Classes defined dynamically have no retrievable source
+                pass
+        hasher.update(source.encode())
+    return hasher.hexdigest()
+
+
+def make_cache_key(
+    data_fingerprint: str,
+    strategy_cls: type[StrategyBase],
+    params: dict[str, Any],
+    extra: str = "",
+) -> str:
+    """
+    Builds the content address of a single (data, strategy, params) backtest.
+
+    :param data_fingerprint: result of fingerprint_frame() for the input data
+    :param strategy_cls: the strategy class
+    :param params: keyword arguments the strategy is instantiated with
+        (execution models and sizers are encoded with their type)
+    :param extra: any additional version string (e.g. metrics code version)
+    :return: hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "data": data_fingerprint,
+            "strategy": strategy_version(strategy_cls),
+            "params": encode_params(params),
+            "extra": extra,
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of backtest results (SQLite):
+    - Stores merged metrics and a compact (float32) equity curve per key
+    - Tracks the last access time of each entry
+    - Evicts least recently used entries once the total size exceeds max_bytes
+    - Optionally commits new entries in batches (every `flush_every` entries
+      or `flush_interval` seconds), one transaction per batch
+
+    Results are stored as they complete, so an interrupted run that is started
+    again is served the backtests it already finished.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_bytes: int | None = 512 * 1024 * 1024,
+        flush_every: int = 1,
+        flush_interval: float = 30.0,
+    ) -> None:
+        """
+        :param db_path: path to the SQLite database file
+        :param max_bytes: upper bound for the total size of stored payloads
+            (None: never evict)
+        :param flush_every: new entries per commit
+        :param flush_interval: maximum seconds between commits
+        """
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db_path = db_path
+        self._max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                strategy TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                metrics BLOB NOT NULL,
+                equity BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        # Rows stored since the last commit, by key
+        self._pending: dict[str, tuple[Any, ...]] = {}
+        self._last_flush = time.monotonic()
+
+    def get(self, key: str) -> CachedResult | None:
+        """
+        Returns the cached result for the key and refreshes its access time.
+
+        :param key: cache key from make_cache_key()
+        :return: CachedResult or None if the key is not cached
+        """
+        if key in self._pending:
+            row = self._pending[key][3:5]
+        else:
+            row = self._conn.execute(
+                "SELECT metrics, equity FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        metrics = pickle.loads(zlib.decompress(row[0]))
+        equity = pickle.loads(zlib.decompress(row[1]))
+        return CachedResult(metrics=metrics, equity=equity)
+
+    def put(
+        self,
+        key: str,
+        strategy: str,
+        symbol: str,
+        metrics: dict[str, Any],
+        equity: pd.Series,
+    ) -> None:
+        """
+        Stores a result under the key; it is committed (and old entries are
+        evicted if needed) with the next batch.
+
+        :param key: cache key from make_cache_key()
+        :param strategy: strategy name (informational)
+        :param symbol: trading symbol (informational)
+        :param metrics: merged metrics dictionary
+        :param equity: portfolio value series
+        """
+        metrics_blob = zlib.compress(pickle.dumps(metrics))
+        equity_blob = zlib.compress(pickle.dumps(equity.astype("float32")))
+        size = len(metrics_blob) + len(equity_blob)
+        now = time.time()
+
+        self._pending[key] = (
+            key, strategy, symbol, metrics_blob, equity_blob, size, now, now
+        )
+        if (
+            len(self._pending) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Commits the pending entries in one transaction and evicts old entries
+        if needed.
+        """
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    list(self._pending.values()),
+                )
+            self._pending = {}
+            self._evict()
+        self._last_flush = time.monotonic()
+
+    def total_size(self) -> int:
+        """
+        :return: total size in bytes of all stored payloads
+        """
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return int(total)
+
+    def __len__(self) -> int:
+        """
+        :return: number of stored entries (pending ones are committed first)
+        """
+        self.flush()
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """
+        Commits pending entries and closes the underlying database connection.
+        """
+        self.flush()
+        self._conn.close()
+
+    def _evict(self) -> None:
+        """
+        Removes least recently used entries until the total size fits max_bytes.
+        """
+        if self._max_bytes is None:
+            return
+        excess = self.total_size() - self._max_bytes
+        if excess <= 0:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM results ORDER BY last_access ASC"
+        ).fetchall()
+        to_delete = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            to_delete.append((key,))
+            excess -= size
+
+        self._conn.executemany("DELETE FROM results WHERE key = ?", to_delete)
+        self._conn.commit()
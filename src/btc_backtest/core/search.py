@@ -0,0 +1,209 @@
+import logging
+import math
+import time
+from typing import Any, NamedTuple, Type
+
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.panel import freeze_frame
+from btc_backtest.strategies.base import StrategyBase, run_batched
+
+logger = logging.getLogger(__name__)
+
+
+class Rung(NamedTuple):
+    """
+    One round of successive halving: how many candidates are evaluated and
+    on how many leading bars of every symbol.
+    """
+
+    candidates: int
+    bars: int
+
+
+class SearchResult(NamedTuple):
+    """
+    Outcome of successive_halving().
+    """
+
+    best_params: dict[str, Any]
+    # Candidates of the last rung (evaluated on the full data), best first:
+    # candidate index, score and one column per parameter
+    ranking: pd.DataFrame
+    # One row per (rung, candidate): rung, bars, candidate, score
+    history: pd.DataFrame
+    # Candidate-bars simulated, and what the full grid would have cost
+    bars_simulated: int
+    bars_full_grid: int
+
+
+def halving_schedule(
+    n_candidates: int, n_bars: int, eta: int = 3, min_bars: int = 1000
+) -> list[Rung]:
+    """
+    Rungs of successive halving: every rung keeps the best 1/eta of the
+    candidates and evaluates them on eta times more bars, so that the last
+    rung evaluates the survivors on all bars.
+
+    :param n_candidates: number of parameter sets
+    :param n_bars: bars of the full evaluation window
+    :param eta: reduction factor between rungs (>= 2)
+    :param min_bars: shortest evaluation window (indicators need a warm-up)
+    :return: the rungs, from the first (all candidates, fewest bars) to the last
+    :raises ValueError: if eta < 2 or there are no candidates
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2.")
+    if n_candidates < 1:
+        raise ValueError("successive halving needs at least one candidate.")
+    last = 0
+    while n_candidates // eta ** (last + 1) >= 1:
+        last += 1
+    return [
+        Rung(
+            candidates=max(1, n_candidates // eta**rung),
+            bars=min(n_bars, max(min_bars, math.ceil(n_bars / eta ** (last - rung)))),
+        )
+        for rung in range(last + 1)
+    ]
+
+
+def score_candidates(
+    strategy_cls: Type[StrategyBase],
+    candidates: list[dict[str, Any]],
+    data_dict: dict[str, pd.DataFrame],
+    bars: int,
+    metric: str = "sharpe_ratio",
+) -> np.ndarray:
+    """
+    Scores parameter sets on the leading `bars` bars of every symbol: one
+    batched vectorbt simulation per symbol (one column per candidate), the
+    score is the mean of the metric over the symbols (NaN and infinite values,
+    e.g. the Sharpe ratio of a flat equity curve, are ignored).
+
+    :param strategy_cls: the strategy class
+    :param candidates: complete keyword arguments of every candidate
+    :param data_dict: { symbol: OHLCV DataFrame }
+    :param bars: number of leading bars to simulate
+    :param metric: vectorbt Portfolio metric method, e.g. "sharpe_ratio",
+        "total_return", "sortino_ratio" (higher is better)
+    :return: one score per candidate (NaN if no symbol produced a value)
+    """
+    per_symbol = []
+    for df in data_dict.values():
+        window = freeze_frame(df.iloc[:bars])
+        strategies = [strategy_cls(data=window, **params) for params in candidates]
+        pf = run_batched(strategies)
+        values = getattr(pf, metric)()
+        per_symbol.append(np.asarray(values, dtype=float).reshape(len(candidates)))
+    scores = np.vstack(per_symbol)
+    valid = np.isfinite(scores)
+    totals = np.where(valid, scores, 0.0).sum(axis=0)
+    counts = valid.sum(axis=0)
+    return np.divide(
+        totals, counts, out=np.full(len(candidates), np.nan), where=counts > 0
+    )
+
+
+def successive_halving(
+    strategy_cls: Type[StrategyBase],
+    candidates: list[dict[str, Any]],
+    data_dict: dict[str, pd.DataFrame],
+    base_params: dict[str, Any] | None = None,
+    eta: int = 3,
+    min_bars: int = 1000,
+    metric: str = "sharpe_ratio",
+) -> SearchResult:
+    """
+    Adaptive parameter search (successive halving): all candidates are scored
+    on a short leading slice of the data, the best 1/eta are kept and scored
+    again on an eta times longer slice, until the survivors are scored on the
+    full data. Each rung is one batched simulation per symbol.
+
+    Rung r simulates n / eta^r candidates on bars / eta^(R - r) bars, so
+    every rung costs about n x bars / eta^R, and the whole search a small
+    fraction of the full grid (n x bars). The price is the risk of dropping a
+    candidate that only pays off late in the data.
+
+    :param strategy_cls: the strategy class
+    :param candidates: parameter overrides to search, e.g. from a grid
+    :param data_dict: { symbol: OHLCV DataFrame }
+    :param base_params: parameters shared by all candidates (init_cash, fees,
+        execution, sizer)
+    :param eta: reduction factor between rungs
+    :param min_bars: shortest evaluation window
+    :param metric: Portfolio metric to maximize (see score_candidates())
+    :return: SearchResult
+    :raises ValueError: if there are no candidates or no data
+    """
+    data_dict = {sym: df for sym, df in data_dict.items() if not df.empty}
+    if not data_dict:
+        raise ValueError("successive halving needs data for at least one symbol.")
+    base_params = base_params or {}
+    n_bars = max(len(df) for df in data_dict.values())
+    schedule = halving_schedule(len(candidates), n_bars, eta, min_bars)
+
+    alive = list(range(len(candidates)))
+    history = []
+    bars_simulated = 0
+    with span("search.successive_halving", strategy=strategy_cls.__name__) as sp:
+        for number, rung in enumerate(schedule):
+            alive = alive[: rung.candidates]
+            started = time.perf_counter()
+            scores = score_candidates(
+                strategy_cls,
+                [{**base_params, **candidates[i]} for i in alive],
+                data_dict,
+                rung.bars,
+                metric,
+            )
+            bars_simulated += len(alive) * sum(
+                min(rung.bars, len(df)) for df in data_dict.values()
+            )
+            history.extend(
+                (number, rung.bars, candidate, score)
+                for candidate, score in zip(alive, scores)
+            )
+            # Best first; NaN scores last, ties keep the candidate order
+            order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")
+            alive = [alive[i] for i in order]
+            final_scores = scores[order]
+            logger.info(
+                "halving rung finished",
+                extra={
+                    "strategy": strategy_cls.__name__,
+                    "rung": number,
+                    "candidates": len(alive),
+                    "bars": rung.bars,
+                    "best_score": float(final_scores[0]),
+                    "seconds": round(time.perf_counter() - started, 3),
+                },
+            )
+        sp.add_items(bars_simulated)
+
+    bars_full_grid = len(candidates) * sum(len(df) for df in data_dict.values())
+    ranking = pd.DataFrame(
+        [
+            {"candidate": i, "score": score, **candidates[i]}
+            for i, score in zip(alive, final_scores)
+        ]
+    )
+    logger.info(
+        "successive halving finished",
+        extra={
+            "strategy": strategy_cls.__name__,
+            "best_params": candidates[alive[0]],
+            "cost_vs_grid": round(bars_simulated / bars_full_grid, 3),
+        },
+    )
+    return SearchResult(
+        best_params=dict(candidates[alive[0]]),
+        ranking=ranking,
+        history=pd.DataFrame(
+            history, columns=["rung", "bars", "candidate", "score"]
+        ),
+        bars_simulated=bars_simulated,
+        bars_full_grid=bars_full_grid,
+    )
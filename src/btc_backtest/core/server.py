@@ -0,0 +1,253 @@
+import inspect
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pandas as pd
+
+from btc_backtest.core.backtester import run_unit
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.instrumentation import span
+from btc_backtest.strategies.registry import STRATEGIES, decode_params, get_strategy
+
+logger = logging.getLogger(__name__)
+
+# Bars used to compile the simulation kernels at startup
+WARMUP_BARS = 500
+# Parameter sets run during warm-up: Numba compiles one kernel per argument
+# types, so both scalar fills and per-bar slippage arrays are covered
+WARMUP_PARAMS = (
+    {},
+    {
+        "execution": ExecutionModel(
+            fill="next_open", slippage=0.0002, volume_impact=0.1
+        )
+    },
+)
+
+
+def _json_metrics(metrics: dict[str, Any]) -> dict[str, float | None]:
+    """
+    Numeric metrics of one backtest for a JSON response (NaN/inf as null,
+    the stats Series is left out).
+    """
+    result: dict[str, float | None] = {}
+    for name, value in metrics.items():
+        if name in ("symbol", "stats"):
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            continue
+        result[name] = number if math.isfinite(number) else None
+    return result
+
+
+class BacktestService:
+    """
+    Runs backtest jobs against OHLCV data that stays in memory.
+
+    Loading the data, importing vectorbt and compiling its Numba kernels
+    happen once, when the service starts; afterwards a job only pays for its
+    own simulations. Jobs are executed one at a time.
+    """
+
+    def __init__(self, data_dict: dict[str, pd.DataFrame]) -> None:
+        """
+        :param data_dict: { symbol: OHLCV DataFrame } kept in memory
+        """
+        self.data_dict = {sym: df for sym, df in data_dict.items() if not df.empty}
+        self._lock = threading.Lock()
+        self.jobs_done = 0
+
+    def warm_up(self) -> float:
+        """
+        Runs every registered strategy once on a short slice of data, so the
+        Numba kernels are compiled before the first job arrives.
+
+        :return: seconds spent
+        """
+        started = time.perf_counter()
+        if not self.data_dict:
+            return 0.0
+        symbol, df = next(iter(self.data_dict.items()))
+        sample = df.iloc[:WARMUP_BARS]
+        with span("server.warm_up", strategies=len(STRATEGIES)):
+            for strategy_cls in STRATEGIES.values():
+                for params in WARMUP_PARAMS:
+                    run_unit(
+                        strategy_cls, params, symbol, sample, keep_portfolio=False
+                    )
+        elapsed = time.perf_counter() - started
+        logger.info("server warmed up", extra={"seconds": round(elapsed, 2)})
+        return elapsed
+
+    def run_job(self, job: dict[str, Any]) -> dict[str, Any]:
+        """
+        Runs one job: {"strategy": name, "params": {...}, "symbols": [...]}.
+        "params" and "symbols" are optional (default: no parameters, all
+        symbols); see decode_params() for the execution/sizer format.
+
+        :return: {"strategy", "metrics": {symbol: {metric: value}}, "elapsed_s"}
+        :raises ValueError: if the job is invalid
+        """
+        if not isinstance(job, dict) or "strategy" not in job:
+            raise ValueError("A job needs at least a 'strategy' field.")
+        strategy_cls = get_strategy(job["strategy"])
+        try:
+            params = decode_params(job.get("params") or {})
+            # Reject unknown parameters before any simulation runs
+            inspect.signature(strategy_cls).bind(data=None, **params)
+        except TypeError as e:
+            raise ValueError(str(e)) from None
+        symbols = job.get("symbols") or list(self.data_dict)
+        if not isinstance(symbols, list) or not all(
+            isinstance(s, str) for s in symbols
+        ):
+            raise ValueError("'symbols' must be a list of symbol names.")
+        unknown = [s for s in symbols if s not in self.data_dict]
+        if unknown:
+            raise ValueError(f"Symbols not loaded: {unknown}.")
+
+        started = time.perf_counter()
+        metrics = {}
+        with self._lock, span("server.job", strategy=strategy_cls.__name__) as sp:
+            for symbol in symbols:
+                result = run_unit(
+                    strategy_cls,
+                    params,
+                    symbol,
+                    self.data_dict[symbol],
+                    keep_portfolio=False,
+                )
+                metrics[symbol] = _json_metrics(result.metrics)
+            sp.add_items(len(symbols))
+            self.jobs_done += 1
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "job done",
+            extra={
+                "strategy": strategy_cls.__name__,
+                "symbols": len(symbols),
+                "seconds": round(elapsed, 3),
+            },
+        )
+        return {
+            "strategy": strategy_cls.__name__,
+            "metrics": metrics,
+            "elapsed_s": elapsed,
+        }
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "status": "ok",
+            "symbols": sorted(self.data_dict),
+            "strategies": sorted(STRATEGIES),
+            "jobs_done": self.jobs_done,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    GET /health -> service status; POST /backtest -> BacktestService.run_job().
+    """
+
+    server: "BacktestServer"
+
+    def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(HTTPStatus.OK, self.server.service.status())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/backtest":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length) or b"{}")
+            result = self.server.service.run_job(job)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            logger.exception("job failed")
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {"error": type(e).__name__}
+            )
+        else:
+            self._send_json(HTTPStatus.OK, result)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("http request", extra={"request": format % args})
+
+
+class BacktestServer(ThreadingHTTPServer):
+    """
+    Localhost HTTP server in front of a BacktestService.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, service: BacktestService, host: str = "127.0.0.1", port: int = 8765
+    ) -> None:
+        """
+        :param service: the service executing the jobs
+        :param host: interface to bind (keep the default: jobs are not
+            authenticated)
+        :param port: TCP port (0 picks a free one, see server_address)
+        """
+        self.service = service
+        super().__init__((host, port), _Handler)
+
+
+def serve(
+    data_dict: dict[str, pd.DataFrame], host: str = "127.0.0.1", port: int = 8765
+) -> None:
+    """
+    Warms up a BacktestService on the given data and serves jobs until
+    interrupted (Ctrl+C).
+    """
+    service = BacktestService(data_dict)
+    service.warm_up()
+    with BacktestServer(service, host, port) as server:
+        logger.info(
+            "backtest server listening",
+            extra={"address": server.server_address, "symbols": len(data_dict)},
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main() -> None:
+    """
+    Same as "btc-backtest serve ...":
+
+        python -m btc_backtest.core.server ETHBTC SOLBTC --start 2025-02
+        curl -d '{"strategy": "SmaCrossoverStrategy",
+                  "params": {"fast_window": 5}}' localhost:8765/backtest
+    """
+    from btc_backtest.cli import main as cli_main
+
+    cli_main(["serve", *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Sharded parameter sweeps over a shared filesystem.
+
+A sweep directory holds a manifest (manifest.json) that splits the sweep into
+shards of (strategy, symbol, chunk of parameter sets). Any number of workers,
+on one or several machines, run run_worker() on the same directory:
+
+    <sweep_dir>/manifest.json          written once by write_manifest()
+    <sweep_dir>/locks/<shard>.lock     claim of a running shard (O_EXCL create)
+    <sweep_dir>/results/<shard>.parquet  one file per finished shard
+    <sweep_dir>/merged.parquet         written by merge_sweep()
+
+A worker touches its lock after every parameter set. A lock that has not been
+touched for `stale_after` seconds belongs to a crashed worker and is taken
+over by the next worker that sees it. At worst a shard runs twice (e.g. a
+worker that was only stalled finishes it as well); results are written
+atomically and are identical, so this only costs time.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Iterable, NamedTuple
+
+import pandas as pd
+
+from btc_backtest.core.backtester import run_unit
+from btc_backtest.core.data_loader import load_aggregated_parquet
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.metrics_frame import metric_rows
+from btc_backtest.core.metrics_store import new_run_id, param_columns, stats_columns
+from btc_backtest.strategies.registry import decode_params, get_strategy
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+LOCKS_DIR = "locks"
+RESULTS_DIR = "results"
+MERGED_FILE = "merged.parquet"
+
+# Seconds without a heartbeat after which a claimed shard is taken over
+DEFAULT_STALE_AFTER = 600.0
+
+
+class Shard(NamedTuple):
+    """
+    One unit of work of a sweep: a chunk of parameter sets of one strategy,
+    all run on one symbol.
+    """
+
+    shard_id: str
+    strategy: str
+    symbol: str
+    # Index of the first parameter set of the chunk within the strategy
+    first_param: int
+    # JSON-style parameters (see strategies.registry.decode_params)
+    params: list[dict[str, Any]]
+
+
+def write_manifest(
+    sweep_dir: str,
+    data_file: str,
+    param_sets: dict[str, list[dict[str, Any]]],
+    symbols: Iterable[str],
+    chunk_size: int = 50,
+) -> dict[str, Any]:
+    """
+    Splits a sweep into shards and writes its manifest. Shards are ordered by
+    symbol, so a worker usually keeps the same symbol loaded.
+
+    :param sweep_dir: shared sweep directory (created if missing)
+    :param data_file: Parquet file written by save_aggregated_parquet();
+        a relative path is resolved against the sweep directory
+    :param param_sets: {strategy name: [JSON-style parameter sets]}
+    :param symbols: symbols every parameter set is run on
+    :param chunk_size: parameter sets per shard
+    :return: the manifest
+    :raises ValueError: if chunk_size < 1 or a strategy is unknown
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    for name in param_sets:
+        get_strategy(name)
+
+    shards = []
+    for symbol in symbols:
+        for strategy, sets in param_sets.items():
+            for first in range(0, len(sets), chunk_size):
+                shards.append(
+                    {
+                        "shard_id": f"{len(shards):06d}",
+                        "strategy": strategy,
+                        "symbol": symbol,
+                        "first_param": first,
+                        "params": sets[first : first + chunk_size],
+                    }
+                )
+    manifest = {
+        "sweep_id": new_run_id(),
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "data_file": data_file,
+        "shards": shards,
+    }
+    os.makedirs(os.path.join(sweep_dir, LOCKS_DIR), exist_ok=True)
+    os.makedirs(os.path.join(sweep_dir, RESULTS_DIR), exist_ok=True)
+    _write_atomic(
+        os.path.join(sweep_dir, MANIFEST_FILE),
+        json.dumps(manifest, indent=1).encode(),
+    )
+    logger.info(
+        "sweep manifest written",
+        extra={
+            "path": sweep_dir,
+            "sweep_id": manifest["sweep_id"],
+            "shards": len(shards),
+        },
+    )
+    return manifest
+
+
+def read_manifest(sweep_dir: str) -> tuple[dict[str, Any], list[Shard]]:
+    """
+    :return: (manifest, shards)
+    """
+    with open(os.path.join(sweep_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest, [Shard(**shard) for shard in manifest["shards"]]
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes a file under a temporary name and renames it into place, so that
+    readers on other machines never see a partial file.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _lock_path(sweep_dir: str, shard_id: str) -> str:
+    return os.path.join(sweep_dir, LOCKS_DIR, f"{shard_id}.lock")
+
+
+def _result_path(sweep_dir: str, shard_id: str) -> str:
+    return os.path.join(sweep_dir, RESULTS_DIR, f"{shard_id}.parquet")
+
+
+def _lock_age(lock_path: str) -> float | None:
+    """
+    Seconds since the last heartbeat of a lock (None if there is no lock).
+    """
+    try:
+        return time.time() - os.stat(lock_path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def claim_shard(
+    sweep_dir: str,
+    shard_id: str,
+    worker_id: str,
+    stale_after: float = DEFAULT_STALE_AFTER,
+) -> bool:
+    """
+    Tries to claim a shard by creating its lock file exclusively. A stale
+    lock is first renamed away; its age is checked again after the rename,
+    because another worker may have reclaimed the shard in the meantime (its
+    fresh lock is then put back). This narrows, but does not close, the race
+    between workers reclaiming the same shard: a shard may still run twice.
+
+    :return: True if this worker now owns the shard
+    """
+    lock_path = _lock_path(sweep_dir, shard_id)
+    age = _lock_age(lock_path)
+    if age is not None:
+        if age < stale_after:
+            return False
+        stale_path = f"{lock_path}.stale-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(lock_path, stale_path)
+        except FileNotFoundError:
+            return False
+        age = _lock_age(stale_path)
+        if age is not None and age < stale_after:
+            # Renamed another worker's new claim: give it back
+            os.replace(stale_path, lock_path)
+            return False
+        os.remove(stale_path)
+        logger.warning(
+            "reclaiming stale shard",
+            extra={"shard": shard_id, "worker": worker_id, "age_s": round(age)},
+        )
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        json.dump({"worker": worker_id, "claimed_at": time.time()}, f)
+    return True
+
+
+def run_shard(
+    shard: Shard,
+    df: pd.DataFrame,
+    sweep_id: str,
+    heartbeat: Any = None,
+) -> pd.DataFrame:
+    """
+    Runs every parameter set of a shard.
+
+    :param shard: the shard
+    :param df: OHLCV data of the shard's symbol
+    :param sweep_id: written into every row
+    :param heartbeat: called after every parameter set
+    :return: one row per parameter set: ids, param_* columns, numeric
+        metrics, stats_* columns and the wall time
+    """
+    strategy_cls = get_strategy(shard.strategy)
+    rows = []
+    for offset, json_params in enumerate(shard.params):
+        params = decode_params(json_params)
+        result = run_unit(strategy_cls, params, shard.symbol, df, keep_portfolio=False)
+        metrics = {
+            name: value
+            for _, _, name, value in metric_rows(
+                shard.strategy, shard.symbol, result.metrics
+            )
+        }
+        rows.append(
+            {
+                "sweep_id": sweep_id,
+                "shard_id": shard.shard_id,
+                "strategy": shard.strategy,
+                "symbol": shard.symbol,
+                "param_index": shard.first_param + offset,
+                **param_columns(params),
+                **metrics,
+                **stats_columns(result.metrics.get("stats")),
+                "elapsed_s": result.elapsed_s,
+            }
+        )
+        if heartbeat is not None:
+            heartbeat()
+    return pd.DataFrame(rows)
+
+
+def run_worker(
+    sweep_dir: str,
+    worker_id: str | None = None,
+    data_file: str | None = None,
+    stale_after: float = DEFAULT_STALE_AFTER,
+    max_shards: int | None = None,
+) -> int:
+    """
+    Claims and runs shards of a sweep until none is left to claim (finished,
+    or held by a live worker). Several workers may run on the same directory
+    at once, on one or several machines.
+
+    :param sweep_dir: shared sweep directory with a manifest
+    :param worker_id: name in the lock files (default: host-pid)
+    :param data_file: local copy of the sweep data, relative to the current
+        directory (default: the manifest's, relative to the sweep directory)
+    :param stale_after: seconds without heartbeat after which a claimed shard
+        is taken over
+    :param max_shards: stop after this many shards (default: no limit)
+    :return: number of shards run by this worker
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    manifest, shards = read_manifest(sweep_dir)
+    data_file = data_file or os.path.join(sweep_dir, manifest["data_file"])
+
+    done = 0
+    loaded_symbol, df = None, None
+    with span("shards.worker", worker=worker_id) as sp:
+        for shard in shards:
+            if max_shards is not None and done >= max_shards:
+                break
+            result_path = _result_path(sweep_dir, shard.shard_id)
+            if os.path.exists(result_path):
+                continue
+            if not claim_shard(sweep_dir, shard.shard_id, worker_id, stale_after):
+                continue
+            lock_path = _lock_path(sweep_dir, shard.shard_id)
+            # Another worker may have finished it between the check and the claim
+            if os.path.exists(result_path):
+                os.remove(lock_path)
+                continue
+
+            if shard.symbol != loaded_symbol:
+                df = load_aggregated_parquet(data_file, [shard.symbol])[shard.symbol]
+                loaded_symbol = shard.symbol
+            frame = run_shard(
+                shard,
+                df,
+                manifest["sweep_id"],
+                heartbeat=lambda: os.utime(lock_path),
+            )
+            tmp_path = f"{result_path}.{uuid.uuid4().hex}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, result_path)
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:  # taken over while this worker stalled
+                pass
+            done += 1
+            sp.add_items(len(frame))
+    logger.info(
+        "sweep worker finished",
+        extra={"worker": worker_id, "shards": done, "path": sweep_dir},
+    )
+    return done
+
+
+def sweep_status(
+    sweep_dir: str, stale_after: float = DEFAULT_STALE_AFTER
+) -> dict[str, Any]:
+    """
+    Progress of a sweep.
+
+    :return: {"sweep_id", "total", "done", "running", "stale", "pending"}
+        where running/stale/pending list shard ids
+    """
+    manifest, shards = read_manifest(sweep_dir)
+    status: dict[str, Any] = {
+        "sweep_id": manifest["sweep_id"],
+        "total": len(shards),
+        "done": 0,
+        "running": [],
+        "stale": [],
+        "pending": [],
+    }
+    for shard in shards:
+        if os.path.exists(_result_path(sweep_dir, shard.shard_id)):
+            status["done"] += 1
+            continue
+        age = _lock_age(_lock_path(sweep_dir, shard.shard_id))
+        if age is None:
+            status["pending"].append(shard.shard_id)
+        elif age < stale_after:
+            status["running"].append(shard.shard_id)
+        else:
+            status["stale"].append(shard.shard_id)
+    return status
+
+
+def merge_sweep(sweep_dir: str, allow_partial: bool = False) -> pd.DataFrame:
+    """
+    Concatenates the per-shard results into <sweep_dir>/merged.parquet
+    (columns missing in a shard, e.g. other strategies' parameters, are null).
+
+    :param sweep_dir: sweep directory
+    :param allow_partial: merge even if some shards have no result yet
+    :return: the merged results, ordered by shard and parameter set
+    :raises RuntimeError: if shards are missing and allow_partial is False
+    """
+    _, shards = read_manifest(sweep_dir)
+    paths = [_result_path(sweep_dir, shard.shard_id) for shard in shards]
+    missing = [s.shard_id for s, p in zip(shards, paths) if not os.path.exists(p)]
+    if missing and not allow_partial:
+        raise RuntimeError(
+            f"{len(missing)} of {len(shards)} shards have no result yet "
+            f"(first: {missing[0]})."
+        )
+    frames = [pd.read_parquet(path) for path in paths if os.path.exists(path)]
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    merged.to_parquet(os.path.join(sweep_dir, MERGED_FILE), index=False)
+    logger.info(
+        "sweep merged",
+        extra={"path": sweep_dir, "rows": len(merged), "missing": len(missing)},
+    )
+    return merged
@@ -0,0 +1,86 @@
+from typing import NamedTuple, TypeAlias
+
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.panel import PriceData
+
+# Number of 1-minute bars in a (crypto, 24/7) year
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+class FixedFraction(NamedTuple):
+    """
+    Commits a constant fraction of the available cash to every entry.
+    """
+
+    fraction: float = 1.0
+
+    def size(self, data: pd.DataFrame, direction: int = 1) -> float:
+        """
+        :param data: OHLCV data (or a (field, symbol) panel)
+        :param direction: 1 for long entries, -1 for short entries
+        :return: fraction of the available cash per entry
+        """
+        return self.fraction
+
+
+class VolatilityTarget(NamedTuple):
+    """
+    Scales each entry so that the position's volatility matches a target:
+    fraction = target_vol / realized_vol, capped at max_fraction.
+
+    - target_vol: annualized target volatility (0.5 = 50%)
+    - window: number of bars of the rolling realized volatility
+    - periods_per_year: bars per year, used to annualize the volatility
+    - max_fraction: upper bound of the fraction (1.0 = no leverage)
+    """
+
+    target_vol: float = 0.5
+    window: int = 1440
+    periods_per_year: int = MINUTES_PER_YEAR
+    max_fraction: float = 1.0
+
+    def size(self, data: pd.DataFrame, direction: int = 1) -> PriceData:
+        """
+        :param data: OHLCV data (or a (field, symbol) panel)
+        :param direction: 1 for long entries, -1 for short entries
+        :return: per-bar fraction of the available cash (0 during warm-up)
+        """
+        returns = data["close"].pct_change()
+        realized = returns.rolling(self.window).std() * np.sqrt(self.periods_per_year)
+        fraction = self.target_vol / realized.where(realized > 0)
+        return fraction.clip(upper=self.max_fraction).fillna(0.0)
+
+
+class KellyCapped(NamedTuple):
+    """
+    Fractional Kelly sizing from rolling return moments:
+    fraction = multiplier * edge / variance, capped at `cap`, where the edge
+    is the mean return in the direction of the trade (the mean for longs, its
+    negative for shorts). Without an edge in that direction the fraction is 0.
+
+    - window: number of bars of the rolling mean/variance
+    - multiplier: Kelly multiplier (0.5 = "half Kelly")
+    - cap: upper bound of the fraction
+    """
+
+    window: int = 1440
+    multiplier: float = 0.5
+    cap: float = 0.25
+
+    def size(self, data: pd.DataFrame, direction: int = 1) -> PriceData:
+        """
+        :param data: OHLCV data (or a (field, symbol) panel)
+        :param direction: 1 for long entries, -1 for short entries
+        :return: per-bar fraction of the available cash (0 during warm-up)
+        """
+        returns = data["close"].pct_change()
+        rolling = returns.rolling(self.window)
+        variance = rolling.var()
+        edge = (direction * rolling.mean()).clip(lower=0.0)
+        kelly = edge / variance.where(variance > 0)
+        return (self.multiplier * kelly).clip(upper=self.cap).fillna(0.0)
+
+
+Sizer: TypeAlias = FixedFraction | VolatilityTarget | KellyCapped
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from btc_backtest.core.binance.binance_client import SymbolVolume
+from btc_backtest.core.data_loader import BinanceDataLoader, iter_months
+
+logger = logging.getLogger(__name__)
+
+
+class UniverseBuilder:
+    """
+    Builds a point-in-time trading universe: symbols are ranked by the quote
+    volume they actually traded during the backtest period, computed from the
+    (cached) Binance klines instead of today's 24h ticker. This avoids
+    survivorship bias and never selects pairs that did not exist in the period.
+
+    Monthly quote volumes are stored in a small JSON index:
+        { "<interval>": { "YYYY-MM": { "ETHBTC": 1234.5, "NEWBTC": null } } }
+    where null marks a month without data (its file does not exist), so that
+    rankings are computed once and known-missing months are skipped without
+    any network request. Months whose download failed are not stored and are
+    tried again by the next build().
+    """
+
+    def __init__(
+        self,
+        loader: BinanceDataLoader,
+        index_file: str,
+        max_concurrency: int = 16,
+    ) -> None:
+        """
+        :param loader: data loader used to obtain klines; a loader with interval
+            "1d" keeps the downloads for ranking tiny
+        :param index_file: path to the JSON index with monthly quote volumes
+        :param max_concurrency: maximum number of months loaded concurrently
+        """
+        self._loader = loader
+        self._index_file = index_file
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._index: dict[str, dict[str, dict[str, float | None]]] = (
+            self._load_index()
+        )
+
+    def _load_index(self) -> dict[str, dict[str, dict[str, float | None]]]:
+        if not os.path.exists(self._index_file):
+            return {}
+        with open(self._index_file, "r") as f:
+            return json.load(f)
+
+    def _save_index(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self._index_file))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self._index_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._index_file)
+
+    def _month_volumes(self, year: int, month: int) -> dict[str, float | None]:
+        by_interval = self._index.setdefault(self._loader.interval, {})
+        return by_interval.setdefault(f"{year}-{month:02d}", {})
+
+    def known_symbols(self) -> set[str]:
+        """
+        All symbols that appear in the index for any period.
+        """
+        symbols: set[str] = set()
+        for months in self._index.get(self._loader.interval, {}).values():
+            symbols.update(months)
+        return symbols
+
+    async def _ensure_volume(self, symbol: str, year: int, month: int) -> None:
+        """
+        Computes and stores the quote volume of one symbol/month if unknown.
+        """
+        volumes = self._month_volumes(year, month)
+        if symbol in volumes:
+            return
+
+        async with self._semaphore:
+            df = await self._loader.download_monthly_klines(symbol, year, month)
+
+        if df.empty:
+            # Data for the running (or a future) month may still be published;
+            # a failed download may succeed next time
+            now = datetime.now(timezone.utc)
+            finished = (year, month) < (now.year, now.month)
+            if finished and self._loader.is_not_found(symbol, year, month):
+                volumes[symbol] = None
+            return
+        volumes[symbol] = float(df["quote_asset_volume"].sum())
+
+    async def rank(
+        self,
+        candidates: list[str],
+        start_year: int,
+        start_month: int,
+        end_year: int,
+        end_month: int,
+    ) -> list[SymbolVolume]:
+        """
+        Ranks candidates by their total quote volume within the period.
+        Symbols without any data in the period are dropped.
+
+        :param candidates: symbols to consider (e.g. all BTC-quoted pairs,
+            including delisted ones)
+        :return: (symbol, quote volume) sorted by volume in descending order
+        """
+        months = iter_months(start_year, start_month, end_year, end_month)
+        async with asyncio.TaskGroup() as tg:
+            for y, m in months:
+                for symbol in candidates:
+                    tg.create_task(self._ensure_volume(symbol, y, m))
+        self._save_index()
+
+        totals: dict[str, float] = {}
+        for y, m in months:
+            volumes = self._month_volumes(y, m)
+            for symbol in candidates:
+                volume = volumes.get(symbol)
+                if volume is not None:
+                    totals[symbol] = totals.get(symbol, 0.0) + volume
+
+        ranking = [SymbolVolume(sym, vol) for sym, vol in totals.items()]
+        ranking.sort(key=lambda x: x.volume, reverse=True)
+        return ranking
+
+    async def build(
+        self,
+        candidates: list[str],
+        start_year: int,
+        start_month: int,
+        end_year: int,
+        end_month: int,
+        limit: int = 100,
+    ) -> list[str]:
+        """
+        Returns the top-`limit` symbols by quote volume within the period.
+        Symbols already present in the index are always considered as candidates,
+        so pairs delisted since they were first seen are not lost.
+        """
+        all_candidates = sorted(set(candidates) | self.known_symbols())
+        ranking = await self.rank(
+            all_candidates, start_year, start_month, end_year, end_month
+        )
+        logger.info(
+            "universe built",
+            extra={
+                "candidates": len(all_candidates),
+                "with_data": len(ranking),
+                "selected": min(limit, len(ranking)),
+            },
+        )
+        return [sym for sym, _ in ranking[:limit]]
@@ -4,17 +4,31 @@ import pandas as pd
 import os
 
 # Local imports for your project
+from btc_backtest.core.backtester import Backtester
 from btc_backtest.core.binance.binance_client import PairsFetcher
 from btc_backtest.core.binance.cache_manager import load_checksums, CacheManager
 from btc_backtest.core.binance.fetcher import BinanceFetcher
+from btc_backtest.core.binance.rate_limiter import WeightRateLimiter
 from btc_backtest.core.data_loader import BinanceDataLoader, save_aggregated_parquet
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.instrumentation import disable_tracing, enable_tracing
+from btc_backtest.core.panel_store import write_panel_store
+from btc_backtest.core.progress import (
+    LoaderStats,
+    ProgressReporter,
+    configure_logging,
+    logger,
+    shutdown_logging,
+)
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.result_cache import ResultCache
+from btc_backtest.core.sizing import FixedFraction
+from btc_backtest.core.universe import UniverseBuilder
 
 from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
 from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
 from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
 
-from core.backtester import Backtester
-
 
 # Determine the absolute path to this file (main.py)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -28,27 +42,85 @@ def main_path(*subpaths: str) -> str:
     return str(os.path.join(BASE_DIR, *subpaths))
 
 
+# Signals are filled at the next bar's open with 2 bps of slippage plus a part
+# proportional to the share of the bar's quote volume taken by the order
+EXECUTION = ExecutionModel(fill="next_open", slippage=0.0002, volume_impact=0.1)
+
+# Capital is in BTC (all pairs are quoted in BTC); every entry commits 10% of
+# the cash, i.e. orders of about 0.1 BTC, so the volume impact only reaches
+# max_slippage on bars trading less than about 0.2 BTC
+STRATEGY_PARAMS = {
+    "init_cash": 1.0,
+    "fees": 0.001,
+    "execution": EXECUTION,
+    "sizer": FixedFraction(0.1),
+}
+
+
 async def main() -> None:
     """
     The main entry point for:
-      - Fetching top-100 Binance BTC-quoted pairs
+      - Selecting the top-100 BTC-quoted pairs by volume traded in the period
       - Downloading 1-minute OHLCV data for February 2025
       - Caching and saving data to parquet
-      - Running multiple strategies via the Backtester
+      - Running multiple strategies via the Backtester while the data downloads
       - Generating metrics, equity curve charts, heatmaps, and optional HTML report
     """
 
     # Make sure pandas doesn't downcast certain numeric types silently
     pd.set_option("future.no_silent_downcasting", True)
 
+    # Structured logs are written by a background thread; per-file events are DEBUG
+    configure_logging()
+    loader_stats = LoaderStats()
+
+    # Optional per-stage instrumentation: BTC_BACKTEST_TRACE=<dir> enables it
+    trace_dir = os.environ.get("BTC_BACKTEST_TRACE")
+    if trace_dir:
+        enable_tracing(track_memory=bool(os.environ.get("BTC_BACKTEST_TRACE_MEMORY")))
+
+    # 0) Instantiate strategies (the data is passed in by the Backtester)
+    strategies = [
+        (SmaCrossoverStrategy, STRATEGY_PARAMS),
+        (RsiBollingerStrategy, STRATEGY_PARAMS),
+        (VolumeSpikeBreakoutStrategy, STRATEGY_PARAMS),
+    ]
+
+    # Unchanged (data, strategy, params) combinations are served from disk.
+    # Completed backtests are committed in batches as the run goes, so an
+    # interrupted run that is started again only simulates the missing ones
+    result_cache = ResultCache(
+        main_path("data", "result_cache.sqlite"), flush_every=20, flush_interval=30.0
+    )
+
+    # The Backtester receives the OHLCV data symbol by symbol while it downloads
+    backtester = Backtester(
+        data_dict={},  # Filled with symbol -> DataFrame by run_streaming()
+        strategies=strategies,
+        results_dir=main_path("results"),  # Directory where outputs are saved
+        result_cache=result_cache,
+        # BTC_BACKTEST_NO_PLOTS=1 skips all figure rendering (headless sweeps)
+        renderer=FigureRenderer(
+            manifest_file=main_path("results", "screenshots", ".render_manifest.json"),
+            enabled=not os.environ.get("BTC_BACKTEST_NO_PLOTS"),
+        ),
+    )
+
     async with httpx.AsyncClient() as client:
-        # 1) Retrieve the list of top-100 pairs quoted in BTC from Binance
-        pairs_fetcher = PairsFetcher(client)
-        top_100_btc = await pairs_fetcher.get_top_pairs(quote="BTC", limit=100)
+        # 1) Candidate pairs quoted in BTC, including delisted ones still listed
+        #    by exchangeInfo (snapshot cached on disk for 6 hours)
+        pairs_fetcher = PairsFetcher(
+            client,
+            cache_dir=main_path("data", "api_cache"),
+            rate_limiter=WeightRateLimiter(),
+        )
+        candidates = await pairs_fetcher.get_trading_symbols(
+            quote="BTC", statuses=("TRADING", "BREAK")
+        )
 
-        fetcher = BinanceFetcher(client=client)
+        fetcher = BinanceFetcher(client=client, stats=loader_stats)
 
-        # 3) Prepare cache-related functionality
+        # 2) Prepare cache-related functionality
         checksums_file = main_path("data", "cache", "checksums.txt")
         checksums = load_checksums(checksums_file)
 
@@ -58,6 +130,24 @@ async def main() -> None:
             checksums_file=checksums_file
         )
 
+        # 3) Point-in-time universe: top-100 pairs by quote volume traded in
+        #    February 2025, computed from (small, cached) daily klines and stored
+        #    in an index so it is computed only once
+        daily_loader = BinanceDataLoader(
+            fetcher=fetcher,
+            cache=cache,
+            start_year=2025,
+            start_month=2,
+            end_year=2025,
+            end_month=2,
+            interval="1d",
+            stats=loader_stats,
+        )
+        universe = UniverseBuilder(
+            daily_loader, index_file=main_path("data", "universe_index.json")
+        )
+        top_100_btc = await universe.build(candidates, 2025, 2, 2025, 2, limit=100)
+
         # 4) Download and cache 1-minute OHLCV data for February 2025
         loader = BinanceDataLoader(
             fetcher=fetcher,
@@ -67,55 +157,42 @@ async def main() -> None:
             end_year=2025,
             end_month=2,
             interval="1m",
+            stats=loader_stats,
         )
 
+        # 4a) Backtest every symbol as soon as its data is loaded: downloads and
+        #     simulations (in a process pool) overlap, and the full metrics table
+        #     is streamed to results/metrics_dataset (params, stats, data range,
+        #     timing; strategy=.../run_date=.../<run_id>-<part>-0.parquet)
+        # (aggregated loader progress is logged every 5 seconds)
+        async with ProgressReporter(loader_stats, interval=5.0):
+            await backtester.run_streaming(
+                loader.iter_symbols(top_100_btc), metrics_dataset="metrics_dataset"
+            )
+
         # results => {symbol: DataFrame containing OHLCV for each symbol}
-        results = await loader.load_all_symbols(top_100_btc)
+        # (symbols without any data are not included)
+        results = backtester.data_dict
 
         # 5) Save the combined dataset to parquet for future reference
         parquet_outfile = main_path("data", "binance_1m_data.parquet")
         save_aggregated_parquet(results, parquet_outfile)
 
-    # 6) Instantiate strategies (the data=None placeholders in your strategies will be replaced inside the Backtester)
-    strategies = [
-        (SmaCrossoverStrategy, {"init_cash": 10_000, "fees": 0.001}),
-        (RsiBollingerStrategy, {"init_cash": 10_000, "fees": 0.001}),
-        (VolumeSpikeBreakoutStrategy, {"init_cash": 10_000, "fees": 0.001}),
-    ]
-
-    # 7) Filter out any empty DataFrames (if, for example, data wasn't downloaded properly for certain symbols)
-    results = {sym: df for sym, df in results.items() if not df.empty}
-
-    # 8) Initialize the Backtester with the OHLCV data and the list of strategies
-    backtester = Backtester(
-        data_dict=results,  # Mapping symbol -> DataFrame
-        strategies=strategies,
-        results_dir=main_path("results"),  # Directory where outputs are saved
-    )
-
-    # 9) Run the backtests for each strategy on each symbol
-    backtester.run_all()
+        # 5a) All symbols aligned to one minute grid, as memory-mapped matrices
+        #     shared by every process that opens them (cross-symbol analysis)
+        if results:
+            write_panel_store(results, main_path("data", "panel_1m"))
 
     # 10) Save metrics to a CSV file
     metrics_csv = main_path("metrics.csv")
     backtester.save_metrics_to_csv(metrics_csv)
 
-    # 11) Plot equity curves (using a log scale, sorting by final value, only top/bottom 5 lines) and save as HTML
-    backtester.plot_equity_curves(
-        use_log_scale=True,
-        sort_by_final=True,
-        top_bottom_n=5,
-        save_html=True
-    )
-
-    # 12) Plot a heatmap for the "sharpe_ratio" metric across all strategies and symbols
-    backtester.plot_performance_heatmap(
-        metric="sharpe_ratio",
-        template="plotly_white",
-        range_color=(None, None),
-        sort_symbols_by_mean=True,
-    )
+    # 10a) Each strategy as one book: all symbols compete for shared capital
+    backtester.run_grouped()
+    backtester.save_grouped_metrics_to_csv(main_path("grouped_metrics.csv"))
 
+    # 11) Equity curves and heatmaps ("sharpe_ratio", "total_return") are rendered
+    #     in one parallel batch; figures whose data did not change are skipped
     backtester.generate_png_plots(
         use_log_scale=True,  # logarithmic scale on capital curves
         template="plotly_white",  # Plotly styling
@@ -128,11 +205,21 @@ async def main() -> None:
         heatmap_range=(-10, 10),  # color scale boundaries for the heatmap
     )
 
-    # 13) (Optional) Generate an HTML report that includes the above charts
-    report_html = main_path("report.html")
-    backtester.generate_html_report(report_html)
+    # 12) Self-contained HTML report (equity curves, heatmaps, sortable metrics);
+    #     built in the browser, so it needs no image renderer
+    backtester.generate_html_report(main_path("report.html"))
+
+    result_cache.close()
+
+    tracer = disable_tracing()
+    if tracer is not None and trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+        tracer.export_json(os.path.join(trace_dir, "trace_spans.json"))
+        tracer.export_chrome_trace(os.path.join(trace_dir, "trace_chrome.json"))
+        logger.info("instrumentation traces saved", extra={"path": trace_dir})
 
-    print("Backtest completed!")
+    logger.info("backtest completed")
+    shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
-from typing import TypedDict, Union, Tuple
+from typing import Any, Sequence, TypeAlias, TypedDict, Union, Tuple
 
-import numpy as np
 import pandas as pd
 import vectorbt as vbt
 
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.panel import PriceData
+from btc_backtest.core.sizing import Sizer
+
 
 class MetricsDict(TypedDict):
     """
@@ -29,49 +33,29 @@ def compute_time_in_position(pf: vbt.Portfolio) -> float:
     """
     Calculate the percentage of bars during which the portfolio was in a position.
 
-    This function analyzes the records of orders placed by the portfolio
-    and determines for each bar whether the portfolio was holding any coins.
+    Uses the per-bar asset holdings of the portfolio; for a multi-column
+    (e.g. grouped, cash-sharing) portfolio a bar counts as "in position"
+    if any of its columns holds coins.
 
     Args:
         pf (vbt.Portfolio): A vectorbt Portfolio object.
 
     Returns:
-        float: The percentage of bars (0 to 100) where the position size > 0.
+        float: The percentage of bars (0 to 100) with an open (long or short) position.
     """
-    orders_df = pf.orders.records.copy()
-    # Sort by bar index ("idx")
-    orders_df.sort_values("idx", inplace=True)
-
-    n_bars = len(pf.wrapper.index)
-    in_pos = np.zeros(n_bars, dtype=bool)
-
-    pos_state = 0.0  # How many coins are currently held
-    last_idx = 0     # The last bar index we processed
-
-    for _, row in orders_df.iterrows():
-        current_idx = int(row["idx"])
+    in_pos = pf.assets().to_numpy() != 0
+    if in_pos.ndim == 2:
+        in_pos = in_pos.any(axis=1)
+    if in_pos.size == 0:
+        return 0.0
 
-        # Mark as "in position" for the range [last_idx, current_idx),
-        # if pos_state > 0 indicates we were in a position
-        if pos_state > 0:
-            in_pos[last_idx:current_idx] = True
-
-        # Update the pos_state (number of coins)
-        # side=0 => buy => add to position, side=1 => sell => subtract from position
-        if row["side"] == 0:
-            pos_state += row["size"]
-        else:
-            pos_state -= row["size"]
-
-        # Move last_idx pointer
-        last_idx = current_idx
+    # Return the percentage of bars where we were in position
+    return float(in_pos.mean() * 100.0)
 
-    # If still in position after the last order, fill the rest
-    if pos_state > 0:
-        in_pos[last_idx:] = True
 
-    # Return the percentage of bars where we were in position
-    return in_pos.mean() * 100.0
+# (entries, exits) or (entries, exits, short_entries, short_exits)
+Signals: TypeAlias = tuple[PriceData, ...]
+SIGNAL_NAMES = ("entries", "exits", "short_entries", "short_exits")
 
 
 class StrategyBase:
@@ -79,45 +63,77 @@ class StrategyBase:
     A base class representing a trading strategy with vectorbt.
 
     Subclasses should implement the `generate_signals()` method
-    to produce entry/exit signals.
+    to produce entry/exit signals (optionally also short entry/exit signals).
 
     Args:
         data (pd.DataFrame): A DataFrame containing at least ['open','high','low','close','volume'] columns.
         init_cash (float): The initial capital allocated for this strategy.
         fees (float): Commission per trade in relative terms (e.g. 0.001 = 0.1%).
+        execution (ExecutionModel | None): Fill price, slippage and stop rules
+            (default: fill at the signal bar's close without slippage).
+        sizer (Sizer | None): Position sizing rule (FixedFraction, VolatilityTarget,
+            KellyCapped); by default every entry uses all available cash.
+
+    The Backtester passes `data` as a read-only view shared by all strategies
+    of a symbol: derive new Series/DataFrames from it, never write into it
+    (writes into its arrays raise ValueError).
     """
+
+    # True for strategies that rank symbols against each other and size their
+    # own orders (Backtester.run_grouped() does not apply its allocation)
+    cross_sectional: bool = False
+
     def __init__(
         self,
         data: pd.DataFrame,
         init_cash: float = 10_000,
-        fees: float = 0.001
+        fees: float = 0.001,
+        execution: ExecutionModel | None = None,
+        sizer: Sizer | None = None,
     ) -> None:
         self.data: pd.DataFrame = data
         self.init_cash: float = init_cash
         self.fees: float = fees
+        self.execution: ExecutionModel = execution or ExecutionModel()
+        self.sizer: Sizer | None = sizer
         self.pf: Union[vbt.Portfolio, None] = None  # Will store the Portfolio after running backtest
 
-    def generate_signals(self) -> tuple[pd.Series, pd.Series]:
+    def generate_signals(self) -> Signals:
         """
-        Generate boolean Series for entries and exits (long-only signals).
+        Generate boolean Series for entries and exits.
 
         Returns:
-            Tuple[pd.Series, pd.Series]: A tuple (entries, exits), each is a boolean Series
-            indexed by the same dates as self.data. `True` indicates enter/exit on that bar.
+            Signals: A tuple (entries, exits) for long-only strategies, or
+            (entries, exits, short_entries, short_exits) for strategies that also
+            trade short. Each is a boolean Series indexed by the same dates as
+            self.data. `True` indicates enter/exit on that bar. An entry in the
+            direction opposite to the open position only closes it; the new
+            position needs another entry signal.
 
         Raises:
             NotImplementedError: If the method is not overridden in a subclass.
         """
         raise NotImplementedError("Please override generate_signals() in a subclass.")
 
-    def run_backtest(self) -> vbt.Portfolio:
+    def run_backtest(self, **kwargs: Any) -> vbt.Portfolio:
         """
         Run the backtest by calling vectorbt.Portfolio.from_signals().
 
         - It uses the 'close' prices from self.data.
         - The entry/exit signals come from generate_signals().
+        - Fills, slippage and stops follow self.execution (e.g. next-bar open
+          fills, volume-scaled slippage, stops checked against high/low).
         - Stores the resulting Portfolio in self.pf.
 
+        self.data may also be a wide panel with (field, symbol) columns (see
+        core.panel.build_panel), in which case 'close' and the signals are
+        DataFrames with one column per symbol and all symbols are simulated in
+        a single batched call.
+
+        Args:
+            **kwargs: Extra/overriding keyword arguments for from_signals(),
+                e.g. group_by=True, cash_sharing=True, call_seq="auto".
+
         Returns:
             vbt.Portfolio: The vectorbt Portfolio object with all trade records and stats.
 
@@ -125,19 +141,74 @@ class StrategyBase:
             ValueError: If the 'close' column is missing or signals shape is invalid.
         """
         close = self.data["close"]
-        entries, exits = self.generate_signals()
-
-        self.pf = vbt.Portfolio.from_signals(
-            close=close,
-            entries=entries,
-            exits=exits,
-            init_cash=self.init_cash,
-            fees=self.fees,
-            slippage=0.0,
-            freq="1Min",  # we assume 1-minute data
-        )
+        signal_kwargs = self._signal_kwargs()
+        with span("strategy.simulate", strategy=type(self).__name__) as sp:
+            simulation_kwargs = {
+                **self._simulation_kwargs(kwargs, signal_kwargs),
+                **signal_kwargs,
+                **kwargs,
+            }
+            self.pf = vbt.Portfolio.from_signals(close=close, **simulation_kwargs)
+            sp.add_items(len(close))
         return self.pf
 
+    def _signal_kwargs(self) -> dict[str, Any]:
+        """
+        Signals (moved to the execution bars) and, with a sizer, the order
+        sizes, as from_signals() keyword arguments.
+        """
+        with span("strategy.generate_signals", strategy=type(self).__name__) as sp:
+            raw_signals = self.generate_signals()
+            signals = [self.execution.shift_signal(s) for s in raw_signals]
+            sp.add_items(len(self.data))
+
+        # Percent sizes cannot reverse a position in one order, so an opposite
+        # entry only closes the open position; unsized runs do the same, so a
+        # sizer never changes which trades are taken
+        signal_kwargs: dict[str, Any] = {
+            **dict(zip(SIGNAL_NAMES, signals)),
+            "upon_opposite_entry": "close",
+        }
+        if self.sizer is not None:
+            size = self.sizer.size(self.data)
+            if len(raw_signals) == 4:
+                # Short entries are sized for the short side
+                short_size = self.sizer.size(self.data, direction=-1)
+                short_entries = raw_signals[2]
+                size = short_entries * short_size + ~short_entries * size
+            signal_kwargs.update(
+                size=self.execution.shift_values(size, 0.0),
+                size_type="percent",
+            )
+        return signal_kwargs
+
+    def _simulation_kwargs(
+        self, kwargs: dict[str, Any], signal_kwargs: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Capital, fees and execution model as from_signals() keyword arguments.
+
+        Args:
+            kwargs (dict[str, Any]): The overrides passed to run_backtest().
+            signal_kwargs (dict[str, Any] | None): The result of
+                _signal_kwargs(), whose order sizes scale the slippage.
+        """
+        # Value of a single order, used to scale the slippage by volume
+        sizing = {**(signal_kwargs or {}), **kwargs}
+        if sizing.get("size_type") == "value":
+            order_notional = sizing["size"]
+        elif sizing.get("size_type") == "percent":
+            # The sized fraction of the capital, on the execution bars
+            order_notional = self.init_cash * sizing["size"]
+        else:
+            order_notional = self.init_cash
+        return {
+            "init_cash": self.init_cash,
+            "fees": self.fees,
+            "freq": "1Min",  # we assume 1-minute data
+            **self.execution.simulation_kwargs(self.data, order_notional),
+        }
+
     def get_metrics(self) -> MetricsDict:
         """
         Retrieve the basic metrics of the strategy, including sharpe ratio, max drawdown,
@@ -152,12 +223,87 @@ class StrategyBase:
         if self.pf is None:
             raise ValueError("Please call run_backtest() before fetching metrics.")
 
-        stats = self.pf.stats()
-        exposure_percent = compute_time_in_position(self.pf)
+        with span("strategy.stats", strategy=type(self).__name__):
+            stats = self.pf.stats()
+            exposure_percent = compute_time_in_position(self.pf)
+
+            return MetricsDict(
+                stats=stats,
+                sharpe_ratio=self.pf.sharpe_ratio(freq="1Min"),
+                drawdown=self.pf.max_drawdown(),
+                exposure=exposure_percent,
+            )
+
+
+def run_batched(strategies: Sequence[StrategyBase], **kwargs: Any) -> vbt.Portfolio:
+    """
+    Simulates several configurations of a strategy on the same single-symbol
+    data in one vectorbt call: the signals of every configuration become one
+    column, so the portfolio has one column per strategy (in order).
+
+    All strategies must share the data frame, capital, fees, execution model
+    and sizer; only the signal parameters may differ. Strategies that run their
+    own simulation (cross-sectional ones or ones overriding run_backtest())
+    cannot be batched.
+
+    Args:
+        strategies (Sequence[StrategyBase]): Instances to simulate.
+        **kwargs: Extra/overriding keyword arguments for from_signals().
+
+    Returns:
+        vbt.Portfolio: Portfolio with columns 0..len(strategies)-1.
 
-        return MetricsDict(
-            stats=stats,
-            sharpe_ratio=self.pf.sharpe_ratio(freq="1Min"),
-            drawdown=self.pf.max_drawdown(),
-            exposure=exposure_percent,
-        )
+    Raises:
+        ValueError: If there are no strategies, they do not share their
+            data or simulation settings or one runs its own simulation.
+    """
+    if not strategies:
+        raise ValueError("run_batched() needs at least one strategy.")
+    for strategy in strategies:
+        strategy_cls = type(strategy)
+        if (
+            strategy_cls.cross_sectional
+            or strategy_cls.run_backtest is not StrategyBase.run_backtest
+        ):
+            raise ValueError(
+                f"{strategy_cls.__name__} runs its own simulation and cannot be "
+                "batched."
+            )
+    first = strategies[0]
+    for other in strategies[1:]:
+        if other.data is not first.data or (
+            other.init_cash,
+            other.fees,
+            other.execution,
+            other.sizer,
+        ) != (first.init_cash, first.fees, first.execution, first.sizer):
+            raise ValueError(
+                "Batched strategies must share data, init_cash, fees, "
+                "execution and sizer."
+            )
+
+    close = first.data["close"]
+    per_strategy = [strategy._signal_kwargs() for strategy in strategies]
+    signal_kwargs: dict[str, Any] = {}
+    for name in dict.fromkeys(name for kw in per_strategy for name in kw):
+        if name in SIGNAL_NAMES:
+            # Long-only strategies have no short signals
+            no_signal = pd.Series(False, index=close.index)
+            values = [kw.get(name, no_signal) for kw in per_strategy]
+        else:
+            values = [kw[name] for kw in per_strategy]
+        if isinstance(values[0], pd.Series):
+            signal_kwargs[name] = pd.concat(values, axis=1, keys=range(len(values)))
+        else:
+            signal_kwargs[name] = values[0]
+
+    # Per-bar Series (prices, slippage) are broadcast to every column
+    with span("strategy.simulate_batch", strategy=type(first).__name__) as sp:
+        simulation_kwargs = {
+            **first._simulation_kwargs(kwargs, signal_kwargs),
+            **signal_kwargs,
+            **kwargs,
+        }
+        pf = vbt.Portfolio.from_signals(close=close, **simulation_kwargs)
+        sp.add_items(len(close) * len(strategies))
+    return pf
@@ -0,0 +1,183 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.instrumentation import span
+from btc_backtest.core.panel import PriceData
+from btc_backtest.strategies.base import Signals, StrategyBase
+
+
+def top_k_mask(scores: np.ndarray, k: int, min_score: float = 0.0) -> np.ndarray:
+    """
+    Marks the k highest scores of every row of a 2-D array (one argpartition
+    over all rows, no loop over rows). Scores that are NaN or not above
+    min_score are never selected, so a row can have fewer than k marks.
+
+    Args:
+        scores (np.ndarray): (rows x symbols) scores.
+        k (int): Number of symbols to select per row.
+        min_score (float): Scores must be above this value to be selected.
+
+    Returns:
+        np.ndarray: Boolean mask with the shape of scores.
+    """
+    eligible = np.isfinite(scores) & (scores > min_score)
+    n_columns = scores.shape[1]
+    if k >= n_columns:
+        return eligible
+    ranked = np.where(eligible, scores, -np.inf)
+    top = np.argpartition(ranked, n_columns - k, axis=1)[:, n_columns - k :]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, top, True, axis=1)
+    return mask & eligible
+
+
+class CrossSectionalMomentumStrategy(StrategyBase):
+    """
+    Cross-sectional momentum over a universe of symbols:
+    - Every `rebalance_every` bars all symbols are ranked by risk-adjusted
+      momentum: the log return over the last `lookback` bars divided by the
+      volatility of the 1-bar log returns over the same window.
+    - The `top_k` best symbols with a score above `min_score` are held with
+      equal weights; every other position is closed.
+    - All symbols are simulated as one portfolio with shared cash
+      (vectorbt.Portfolio.from_orders() with target-percent sizes, sells
+      before buys).
+
+    Meant for a wide panel with (field, symbol) columns (see
+    core.panel.build_panel() and PanelStore.panel()). On a single symbol's
+    OHLCV data it holds the symbol while its score is above min_score.
+    """
+
+    # Ranks symbols against each other and sizes its own orders
+    cross_sectional = True
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        init_cash: float = 10_000,
+        fees: float = 0.001,
+        lookback: int = 1440,
+        rebalance_every: int = 60,
+        top_k: int = 5,
+        min_score: float = 0.0,
+        execution: ExecutionModel | None = None,
+    ) -> None:
+        """
+        Initialize the CrossSectionalMomentumStrategy.
+
+        Args:
+            data (pd.DataFrame): (field, symbol) panel, or OHLCV data of one symbol.
+            init_cash (float): Initial capital shared by all symbols.
+            fees (float): Commission in relative terms (e.g., 0.001 means 0.1%).
+            lookback (int): Number of bars of the momentum and volatility window.
+            rebalance_every (int): Number of bars between two rebalances.
+            top_k (int): Number of symbols held after each rebalance.
+            min_score (float): Only symbols scoring above this value are held.
+            execution (ExecutionModel | None): Fill price and slippage (stops
+                are not supported).
+
+        Raises:
+            ValueError: If a window or top_k is smaller than 1.
+        """
+        if min(lookback, rebalance_every, top_k) < 1:
+            raise ValueError("lookback, rebalance_every and top_k must be at least 1.")
+        super().__init__(data, init_cash, fees, execution)
+        self.lookback = lookback
+        self.rebalance_every = rebalance_every
+        self.top_k = top_k
+        self.min_score = min_score
+
+    def momentum_scores(self) -> pd.DataFrame:
+        """
+        Risk-adjusted momentum of every symbol on the rebalance bars (every
+        rebalance_every-th bar, starting with the first).
+
+        Returns:
+            pd.DataFrame: (rebalance bars x symbols) scores, NaN while a
+                symbol has fewer than `lookback` bars of history.
+        """
+        close = self.data["close"]
+        if isinstance(close, pd.Series):
+            close = close.to_frame()
+        log_close = np.log(close.where(close > 0))
+        returns = log_close.diff()
+        # Only the rebalance bars are evaluated
+        volatility = returns.rolling(self.lookback, step=self.rebalance_every).std()
+        momentum = log_close.diff(self.lookback).iloc[:: self.rebalance_every]
+        volatility = volatility.where(volatility > 0)
+        return momentum / (volatility * np.sqrt(self.lookback))
+
+    def target_weights(self) -> PriceData:
+        """
+        Target fraction of the portfolio value per symbol and bar: 1 / (number
+        of selected symbols) for the selected symbols and 0 for all others on
+        every rebalance bar, NaN (no order) on all other bars and where a
+        symbol has no price.
+
+        Returns:
+            PriceData: Weights shaped like self.data["close"].
+        """
+        close = self.data["close"]
+        prices = close.to_numpy().reshape(len(close), -1)
+        scores = self.momentum_scores()
+        selected = top_k_mask(scores.to_numpy(), self.top_k, self.min_score)
+        counts = selected.sum(axis=1, keepdims=True)
+        weights = np.full(prices.shape, np.nan)
+        rows = np.arange(0, len(close), self.rebalance_every)
+        weights[rows] = np.divide(
+            selected, counts, out=np.zeros(selected.shape), where=counts > 0
+        )
+        weights[~np.isfinite(prices)] = np.nan
+        if isinstance(close, pd.Series):
+            return pd.Series(weights[:, 0], index=close.index, name=close.name)
+        return pd.DataFrame(weights, index=close.index, columns=close.columns)
+
+    def generate_signals(self) -> Signals:
+        """
+        Entries and exits implied by the target weights (a symbol is held from
+        the rebalance that selects it until the one that drops it).
+
+        Returns:
+            Signals: (entries, exits) shaped like self.data["close"].
+        """
+        held = self.target_weights().ffill().fillna(0.0) > 0
+        previous = held.shift(1, fill_value=False)
+        return held & ~previous, ~held & previous
+
+    def run_backtest(self, **kwargs: Any) -> vbt.Portfolio:
+        """
+        Run the backtest by calling vectorbt.Portfolio.from_orders() with the
+        target weights, as one group with shared cash.
+
+        Args:
+            **kwargs: Extra/overriding keyword arguments for from_orders().
+
+        Returns:
+            vbt.Portfolio: The grouped portfolio.
+
+        Raises:
+            ValueError: If the execution model uses stops.
+        """
+        if self.execution.sl_stop is not None or self.execution.tp_stop is not None:
+            raise ValueError("CrossSectionalMomentumStrategy does not support stops.")
+        close = self.data["close"]
+        with span("strategy.generate_signals", strategy=type(self).__name__) as sp:
+            size = self.execution.shift_values(self.target_weights(), np.nan)
+            sp.add_items(len(self.data))
+        with span("strategy.simulate", strategy=type(self).__name__) as sp:
+            simulation_kwargs = {
+                **self._simulation_kwargs(kwargs),
+                "size": size,
+                "size_type": "targetpercent",
+                "group_by": True,
+                "cash_sharing": True,
+                "call_seq": "auto",
+                **kwargs,
+            }
+            self.pf = vbt.Portfolio.from_orders(close=close, **simulation_kwargs)
+            sp.add_items(len(close))
+        return self.pf
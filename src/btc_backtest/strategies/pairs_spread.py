@@ -0,0 +1,236 @@
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.instrumentation import span
+from btc_backtest.strategies.base import Signals, StrategyBase
+
+
+class PairsSpreadStrategy(StrategyBase):
+    """
+    Mean reversion of the spread of symbol pairs (e.g. the best pairs of
+    core.pairs.scan_pairs()):
+    - The spread of a pair is log(first) - hedge_ratio * log(second), with
+      the hedge ratio re-estimated over a rolling window (rolling OLS).
+    - Its z-score (distance to the rolling mean in rolling standard
+      deviations) opens a position when it leaves +/- entry_z: short the
+      spread above, long below. The position is closed when the z-score gets
+      back within +/- exit_z.
+    - A long spread buys `first` and sells `second` short, in the ratio of
+      the hedge ratio; together the two legs use the pair's init_cash.
+
+    All pairs are simulated in one vectorbt.Portfolio.from_orders() call: one
+    column per leg, one group with its own cash per pair.
+
+    Requires a wide panel with (field, symbol) columns (see
+    core.panel.build_panel() and PanelStore.panel()).
+    """
+
+    # Trades legs of pairs of symbols and sizes its own orders
+    cross_sectional = True
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        pairs: Sequence[tuple[str, str]],
+        init_cash: float = 10_000,
+        fees: float = 0.001,
+        window: int = 1440,
+        entry_z: float = 2.0,
+        exit_z: float = 0.5,
+        execution: ExecutionModel | None = None,
+    ) -> None:
+        """
+        Initialize the PairsSpreadStrategy.
+
+        Args:
+            data (pd.DataFrame): (field, symbol) panel with all symbols of the pairs.
+            pairs (Sequence[tuple[str, str]]): (first, second) symbols of every pair.
+            init_cash (float): Initial capital of every pair.
+            fees (float): Commission in relative terms (e.g., 0.001 means 0.1%).
+            window (int): Number of bars of the rolling hedge ratio and z-score.
+            entry_z (float): Z-score distance that opens a position.
+            exit_z (float): Z-score distance below which the position is closed.
+            execution (ExecutionModel | None): Fill price and slippage (stops
+                are not supported).
+
+        Raises:
+            ValueError: If there are no pairs, a pair repeats a symbol, a
+                symbol is not in the panel or exit_z is not below entry_z.
+        """
+        if not pairs:
+            raise ValueError("PairsSpreadStrategy needs at least one pair.")
+        if not 0 <= exit_z < entry_z:
+            raise ValueError("exit_z must be at least 0 and below entry_z.")
+        if any(first == second for first, second in pairs):
+            raise ValueError("A pair needs two different symbols.")
+        missing = {s for pair in pairs for s in pair} - set(data["close"].columns)
+        if missing:
+            raise ValueError(f"Symbols not in the panel: {sorted(missing)}.")
+        super().__init__(data, init_cash, fees, execution)
+        self.pairs = [tuple(pair) for pair in pairs]
+        self.window = window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+
+    @property
+    def pair_names(self) -> list[str]:
+        return [f"{first}-{second}" for first, second in self.pairs]
+
+    def _pair_prices(self, leg: int) -> pd.DataFrame:
+        """
+        Log close prices of the first (leg=0) or second (leg=1) symbol of
+        every pair, one column per pair.
+        """
+        close = self.data["close"][[pair[leg] for pair in self.pairs]]
+        return pd.DataFrame(
+            np.log(close.where(close > 0).to_numpy()),
+            index=close.index,
+            columns=self.pair_names,
+        )
+
+    def hedge_ratios(self) -> pd.DataFrame:
+        """
+        Rolling OLS slope of log(first) on log(second), one column per pair.
+        """
+        first, second = self._pair_prices(0), self._pair_prices(1)
+        rolling = second.rolling(self.window)
+        return rolling.cov(first) / rolling.var()
+
+    def spread_zscores(self) -> pd.DataFrame:
+        """
+        Z-score of every pair's spread against its rolling mean and standard
+        deviation, one column per pair (NaN during the warm-up).
+        """
+        spread = self._pair_prices(0) - self.hedge_ratios() * self._pair_prices(1)
+        rolling = spread.rolling(self.window)
+        return (spread - rolling.mean()) / rolling.std()
+
+    def positions(self) -> pd.DataFrame:
+        """
+        Spread position of every pair and bar: 1 (long), -1 (short) or 0.
+        """
+        zscores = self.spread_zscores().to_numpy()
+        state = np.select(
+            [
+                zscores < -self.entry_z,
+                zscores > self.entry_z,
+                np.abs(zscores) < self.exit_z,
+            ],
+            [1.0, -1.0, 0.0],
+            default=np.nan,
+        )
+        return (
+            pd.DataFrame(state, index=self.data.index, columns=self.pair_names)
+            .ffill()
+            .fillna(0.0)
+        )
+
+    def leg_data(self) -> pd.DataFrame:
+        """
+        The panel re-arranged per leg: (field, pair, symbol) columns.
+        """
+        fields = self.data.columns.get_level_values(0).unique()
+        return pd.concat(
+            {
+                field: pd.concat(
+                    {
+                        name: self.data[field][list(pair)]
+                        for name, pair in zip(self.pair_names, self.pairs)
+                    },
+                    axis=1,
+                    names=["pair", "symbol"],
+                )
+                for field in fields
+            },
+            axis=1,
+        )
+
+    def target_weights(self) -> pd.DataFrame:
+        """
+        Target fraction of the pair's value in every leg, set on the bars
+        where the spread position changes (NaN, i.e. no order, elsewhere):
+        position / (1 + |h|) for `first` and -position * h / (1 + |h|) for
+        `second`, h being the hedge ratio of that bar.
+
+        Returns:
+            pd.DataFrame: Weights with (pair, symbol) columns.
+        """
+        positions = self.positions()
+        hedge = self.hedge_ratios().to_numpy()
+        position = positions.to_numpy()
+        changed = position != positions.shift(1, fill_value=0.0).to_numpy()
+        # Closing needs no hedge ratio; opening without one places no order
+        scale = np.where(position == 0, 0.0, position / (1 + np.abs(hedge)))
+        scale[~changed] = np.nan
+
+        weights = np.empty((len(position), 2 * len(self.pairs)))
+        weights[:, 0::2] = scale
+        weights[:, 1::2] = -scale * np.where(position == 0, 0.0, hedge)
+        close = self.leg_data()["close"]
+        weights[~np.isfinite(close.to_numpy())] = np.nan
+        return pd.DataFrame(weights, index=close.index, columns=close.columns)
+
+    def generate_signals(self) -> Signals:
+        """
+        Long and short entries/exits of every leg implied by the target
+        weights.
+
+        Returns:
+            Signals: (entries, exits, short_entries, short_exits) with
+                (pair, symbol) columns.
+        """
+        held = self.target_weights().ffill().fillna(0.0)
+        previous = held.shift(1, fill_value=0.0)
+        long, was_long = held > 0, previous > 0
+        short, was_short = held < 0, previous < 0
+        return (
+            long & ~was_long,
+            ~long & was_long,
+            short & ~was_short,
+            ~short & was_short,
+        )
+
+    def run_backtest(self, **kwargs: Any) -> vbt.Portfolio:
+        """
+        Run the backtest of all pairs by calling
+        vectorbt.Portfolio.from_orders() with the target weights, grouped by
+        pair with cash sharing inside a pair.
+
+        Args:
+            **kwargs: Extra/overriding keyword arguments for from_orders(),
+                e.g. group_by=True to trade all pairs from one pot of cash.
+
+        Returns:
+            vbt.Portfolio: One group per pair.
+
+        Raises:
+            ValueError: If the execution model uses stops.
+        """
+        if self.execution.sl_stop is not None or self.execution.tp_stop is not None:
+            raise ValueError("PairsSpreadStrategy does not support stops.")
+        legs = self.leg_data()
+        with span("strategy.generate_signals", strategy=type(self).__name__) as sp:
+            size = self.execution.shift_values(self.target_weights(), np.nan)
+            sp.add_items(len(legs) * len(self.pairs))
+        with span("strategy.simulate", strategy=type(self).__name__) as sp:
+            simulation_kwargs = {
+                "init_cash": self.init_cash,
+                "fees": self.fees,
+                "freq": "1Min",  # we assume 1-minute data
+                **self.execution.simulation_kwargs(legs, self.init_cash / 2),
+                "size": size,
+                "size_type": "targetpercent",
+                "group_by": "pair",
+                "cash_sharing": True,
+                "call_seq": "auto",
+                **kwargs,
+            }
+            self.pf = vbt.Portfolio.from_orders(
+                close=legs["close"], **simulation_kwargs
+            )
+            sp.add_items(len(legs) * len(self.pairs))
+        return self.pf
@@ -0,0 +1,88 @@
+from typing import Any, Type
+
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.sizing import FixedFraction, KellyCapped, VolatilityTarget
+from btc_backtest.strategies.base import StrategyBase
+from btc_backtest.strategies.cross_sectional_momentum import (
+    CrossSectionalMomentumStrategy,
+)
+from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
+
+# Strategies that can be selected by name (server jobs, command line)
+STRATEGIES: dict[str, Type[StrategyBase]] = {
+    cls.__name__: cls
+    for cls in (
+        SmaCrossoverStrategy,
+        RsiBollingerStrategy,
+        VolumeSpikeBreakoutStrategy,
+        CrossSectionalMomentumStrategy,
+    )
+}
+
+SIZERS = {cls.__name__: cls for cls in (FixedFraction, VolatilityTarget, KellyCapped)}
+
+
+def get_strategy(name: str) -> Type[StrategyBase]:
+    """
+    Looks up a registered strategy class by its name.
+
+    Raises:
+        ValueError: If no strategy with this name is registered.
+    """
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown strategy {name!r}, expected one of {sorted(STRATEGIES)}."
+        ) from None
+
+
+def decode_params(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Converts JSON-style strategy parameters into keyword arguments:
+    "execution" given as a dict becomes an ExecutionModel and "sizer" given as
+    {"type": "<sizer class>", ...fields} becomes that sizer.
+
+    Args:
+        params (dict[str, Any]): Parameters as decoded from JSON.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for the strategy constructor.
+
+    Raises:
+        ValueError: If the sizer type is unknown.
+    """
+    decoded = dict(params)
+    if isinstance(decoded.get("execution"), dict):
+        decoded["execution"] = ExecutionModel(**decoded["execution"])
+    if isinstance(decoded.get("sizer"), dict):
+        fields = dict(decoded["sizer"])
+        sizer_type = fields.pop("type", None)
+        if sizer_type not in SIZERS:
+            raise ValueError(
+                f"Unknown sizer {sizer_type!r}, expected one of {sorted(SIZERS)}."
+            )
+        decoded["sizer"] = SIZERS[sizer_type](**fields)
+    return decoded
+
+
+def encode_params(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Inverse of decode_params(): converts strategy keyword arguments into
+    JSON-serializable parameters (ExecutionModel and sizers become dicts).
+
+    Args:
+        params (dict[str, Any]): Keyword arguments of the strategy.
+
+    Returns:
+        dict[str, Any]: Parameters that json.dumps() accepts.
+    """
+    encoded = dict(params)
+    if isinstance(encoded.get("execution"), ExecutionModel):
+        encoded["execution"] = encoded["execution"]._asdict()
+    sizer = encoded.get("sizer")
+    if sizer is not None and type(sizer).__name__ in SIZERS:
+        encoded["sizer"] = {"type": type(sizer).__name__, **sizer._asdict()}
+    return encoded
@@ -1,9 +1,45 @@
 import pandas as pd
-import ta
 
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.panel import PriceData
+from btc_backtest.core.sizing import Sizer
 from btc_backtest.strategies.base import StrategyBase
 
 
+def wilder_rsi(close: PriceData, window: int = 14) -> PriceData:
+    """
+    Wilder's RSI, computed column-wise so that it also works on a DataFrame
+    with one column per symbol (same values as ta.momentum.RSIIndicator).
+
+    Args:
+        close (pd.Series | pd.DataFrame): Close prices.
+        window (int): RSI window.
+
+    Returns:
+        pd.Series | pd.DataFrame: RSI values (0-100), NaN during warm-up.
+    """
+    diff = close.diff(1)
+    up_direction = diff.where(diff > 0, 0.0)
+    down_direction = -diff.where(diff < 0, 0.0)
+    emaup = up_direction.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    emadn = down_direction.ewm(
+        alpha=1 / window, min_periods=window, adjust=False
+    ).mean()
+    rsi = 100 - (100 / (1 + emaup / emadn))
+    return rsi.where(emadn != 0, 100.0)
+
+
+def bollinger_lower_band(
+    close: PriceData, window: int = 20, window_dev: float = 2
+) -> PriceData:
+    """
+    Lower Bollinger band (population std, as in ta.volatility.BollingerBands),
+    computed column-wise for a Series or a DataFrame.
+    """
+    rolling = close.rolling(window, min_periods=window)
+    return rolling.mean() - window_dev * rolling.std(ddof=0)
+
+
 class RsiBollingerStrategy(StrategyBase):
     """
     This strategy combines RSI and Bollinger Bands:
@@ -20,6 +56,8 @@ class RsiBollingerStrategy(StrategyBase):
         bb_window: int = 20,
         rsi_low_level: float = 30.0,
         rsi_high_level: float = 70.0,
+        execution: ExecutionModel | None = None,
+        sizer: Sizer | None = None,
     ) -> None:
         """
         Initialize the RsiBollingerStrategy.
@@ -32,8 +70,10 @@ class RsiBollingerStrategy(StrategyBase):
             bb_window (int): Window size for the Bollinger Bands calculation.
             rsi_low_level (float): RSI threshold below which we consider the market oversold.
             rsi_high_level (float): RSI threshold above which we consider the market overbought.
+            execution (ExecutionModel | None): Fill price, slippage and stop rules.
+            sizer (Sizer | None): Position sizing rule (default: all-in).
         """
-        super().__init__(data, init_cash, fees)
+        super().__init__(data, init_cash, fees, execution, sizer)
         self.rsi_window = rsi_window
         self.bb_window = bb_window
         self.rsi_low_level = rsi_low_level
@@ -59,14 +99,10 @@ class RsiBollingerStrategy(StrategyBase):
         close = self.data["close"]
 
         # --- Compute RSI ---
-        rsi_series = ta.momentum.RSIIndicator(close=close, window=self.rsi_window).rsi()
-
-        # --- Compute Bollinger Bands ---
-        bb = ta.volatility.BollingerBands(close=close, window=self.bb_window, window_dev=2)
-        lower_band = bb.bollinger_lband()
-        # If needed, you could also use:
-        #   middle_band = bb.bollinger_mavg()
-        #   upper_band = bb.bollinger_hband()
+        rsi_series = wilder_rsi(close, window=self.rsi_window)
+
+        # --- Compute the lower Bollinger Band ---
+        lower_band = bollinger_lower_band(close, window=self.bb_window, window_dev=2)
 
         # Oversold condition (RSI < low level)
         rsi_oversold = rsi_series < self.rsi_low_level
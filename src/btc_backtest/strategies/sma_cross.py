@@ -1,5 +1,7 @@
 import pandas as pd
 
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.sizing import Sizer
 from btc_backtest.strategies.base import StrategyBase
 
 
@@ -17,6 +19,8 @@ class SmaCrossoverStrategy(StrategyBase):
         fees: float = 0.001,
         fast_window: int = 10,
         slow_window: int = 30,
+        execution: ExecutionModel | None = None,
+        sizer: Sizer | None = None,
     ) -> None:
         """
         Initialize the SmaCrossoverStrategy.
@@ -27,8 +31,10 @@ class SmaCrossoverStrategy(StrategyBase):
             fees (float): Commission per trade in relative terms (e.g., 0.001 = 0.1%).
             fast_window (int): The window size of the fast-moving SMA.
             slow_window (int): The window size of the slow-moving SMA.
+            execution (ExecutionModel | None): Fill price, slippage and stop rules.
+            sizer (Sizer | None): Position sizing rule (default: all-in).
         """
-        super().__init__(data, init_cash, fees)
+        super().__init__(data, init_cash, fees, execution, sizer)
         self.fast_window = fast_window
         self.slow_window = slow_window
 
@@ -1,6 +1,8 @@
 import pandas as pd
 
-from btc_backtest.strategies.base import StrategyBase
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.sizing import Sizer
+from btc_backtest.strategies.base import Signals, StrategyBase
 
 
 class VolumeSpikeBreakoutStrategy(StrategyBase):
@@ -9,6 +11,9 @@ class VolumeSpikeBreakoutStrategy(StrategyBase):
     - Entry when a "volume spike" (current_volume >> average_volume) occurs
       along with a breakout above a recent local high.
     - Exit when price falls below a certain N-period local low.
+    - With allow_short=True the mirrored rules trade short: entry on a volume
+      spike with a breakdown below a recent local low, exit when price rises
+      above the N-period local high.
     """
 
     def __init__(
@@ -20,6 +25,9 @@ class VolumeSpikeBreakoutStrategy(StrategyBase):
         volume_spike_coef: float = 2.0,
         breakout_lookback: int = 10,
         exit_lookback: int = 10,
+        execution: ExecutionModel | None = None,
+        sizer: Sizer | None = None,
+        allow_short: bool = False,
     ) -> None:
         """
         Initialize the VolumeSpikeBreakoutStrategy.
@@ -33,21 +41,26 @@ class VolumeSpikeBreakoutStrategy(StrategyBase):
                 For instance, 2.0 => current volume > 2 * average volume.
             breakout_lookback (int): Number of bars to consider when checking for a local high breakout.
             exit_lookback (int): Number of bars to consider when checking a local low for exit conditions.
+            execution (ExecutionModel | None): Fill price, slippage and stop rules.
+            sizer (Sizer | None): Position sizing rule (default: all-in).
+            allow_short (bool): Also generate the symmetric short signals.
         """
-        super().__init__(data, init_cash, fees)
+        super().__init__(data, init_cash, fees, execution, sizer)
         self.volume_window = volume_window
         self.volume_spike_coef = volume_spike_coef
         self.breakout_lookback = breakout_lookback
         self.exit_lookback = exit_lookback
+        self.allow_short = allow_short
 
-    def generate_signals(self) -> tuple[pd.Series, pd.Series]:
+    def generate_signals(self) -> Signals:
         """
         Generate entry and exit signals based on volume spikes and breakouts.
 
         Returns:
-            tuple[pd.Series, pd.Series]:
+            Signals:
                 A tuple (entries, exits), each is a boolean Series indexed
                 by the same dates as self.data. `True` indicates a signal on that bar.
+                With allow_short=True, (entries, exits, short_entries, short_exits).
 
         Raises:
             ValueError: If 'close' or 'volume' columns are missing in the DataFrame.
@@ -77,5 +90,23 @@ class VolumeSpikeBreakoutStrategy(StrategyBase):
         recent_low = close.rolling(self.exit_lookback).min()
         exits = close < recent_low.shift(1)
 
-        # Fill NaNs with False to avoid any NaN-based issues
-        return entries.fillna(False), exits.fillna(False)
+        if not self.allow_short:
+            # Fill NaNs with False to avoid any NaN-based issues
+            return entries.fillna(False), exits.fillna(False)
+
+        # 4. Mirrored short rules: volume spike + fresh breakdown below the
+        #    recent low, exit once price rises above the recent high
+        recent_breakout_low = close.rolling(self.breakout_lookback).min()
+        breakdown = (close < recent_breakout_low.shift(1)) & (
+            close.shift(1) >= recent_breakout_low.shift(1)
+        )
+        short_entries = volume_spike & breakdown
+        recent_exit_high = close.rolling(self.exit_lookback).max()
+        short_exits = close > recent_exit_high.shift(1)
+
+        return (
+            entries.fillna(False),
+            exits.fillna(False),
+            short_entries.fillna(False),
+            short_exits.fillna(False),
+        )
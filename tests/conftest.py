@@ -1,18 +1,26 @@
+import io
+import zipfile
 from pathlib import Path
 
 import httpx
 import pytest
 import pandas as pd
 import pytest_asyncio
+from tenacity import wait_none
 
 from btc_backtest.core.binance.binance_client import PairsFetcher
 from btc_backtest.core.binance.cache_manager import CacheManager
 from btc_backtest.core.binance.fetcher import BinanceFetcher
+from btc_backtest.core.data_loader import BinanceDataLoader
+from btc_backtest.core.progress import LoaderStats
 from btc_backtest.strategies.base import StrategyBase
 from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
 from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
 from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
 
+# One row of a Binance kline archive CSV
+CSV_ROW = b"1640995200000,42,45,40,44,1000,1640995260000,40000,123,555,666,0\n"
+
 
 @pytest.fixture
 def mock_data():
@@ -112,4 +120,39 @@ def cache_manager(checksums_file: Path, cache_dir: Path) -> CacheManager:
         checksums={},
         cache_dir=str(cache_dir),
         checksums_file=str(checksums_file),
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture
+def kline_zip() -> bytes:
+    """
+    A monthly kline archive (zip) holding CSV_ROW.
+    """
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, mode="w") as zf:
+        zf.writestr("klines.csv", CSV_ROW)
+    return buf.getvalue()
+
+@pytest.fixture
+def make_loader(cache_manager: CacheManager):
+    """
+    Builds a BinanceDataLoader for January-February 2024 whose requests are
+    answered by handler (an httpx.MockTransport handler).
+    """
+    def factory(handler, stats: LoaderStats) -> BinanceDataLoader:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher = BinanceFetcher(client, stats=stats)
+        # Keep the retry logic but skip the exponential waits in tests
+        fetcher._fetch_url_with_retry = BinanceFetcher._fetch_url_with_retry.retry_with(
+            wait=wait_none()
+        ).__get__(fetcher)
+        return BinanceDataLoader(
+            fetcher=fetcher,
+            cache=cache_manager,
+            start_year=2024,
+            start_month=1,
+            end_year=2024,
+            end_month=2,
+            stats=stats,
+        )
+
+    return factory
@@ -0,0 +1,26 @@
+from benchmarks.synthetic import SIZES, generate_ohlcv, make_kline_zip
+from btc_backtest.core.binance.parser import parse_kline_zip
+
+
+def test_synthetic_klines_roundtrip_through_parser():
+    """
+    Synthetic benchmark data serialized to the Binance ZIP format must be parsed
+    back by parse_kline_zip with the same shape and prices.
+    """
+    df = generate_ohlcv(500, seed=1)
+    parsed = parse_kline_zip(make_kline_zip(df))
+
+    assert len(parsed) == len(df), "Row count changed during the roundtrip."
+    assert list(parsed.columns) == list(df.columns), "Column layout mismatch."
+    assert (parsed.index == df.index).all(), "open_time index mismatch."
+    assert (parsed["close"] - df["close"]).abs().max() < 1e-12
+
+
+def test_synthetic_ohlcv_is_consistent():
+    """
+    High/low must bound open/close for every generated bar.
+    """
+    df = generate_ohlcv(1_000, seed=2)
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert SIZES["500x12m"].bars_per_symbol == 12 * SIZES["1x1m"].bars_per_symbol
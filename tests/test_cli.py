@@ -0,0 +1,179 @@
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import btc_backtest
+import btc_backtest.cli
+from btc_backtest.cli import expand_grid, main, parse_grid
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+HEAVY_MODULES = ("vectorbt", "numba", "plotly", "kaleido", "ccxt", "ta")
+
+
+def test_fetch_path_does_not_import_heavy_dependencies():
+    """
+    The CLI and everything the fetch subcommand imports stay free of the
+    simulation and plotting stacks.
+    """
+    code = (
+        "import sys\n"
+        "import btc_backtest, btc_backtest.cli, btc_backtest.core.data_loader\n"
+        "import btc_backtest.core.progress\n"
+        "loaded = {m.split('.')[0] for m in sys.modules}\n"
+        f"print(sorted(loaded & set({HEAVY_MODULES!r})))"
+    )
+    src_dir = Path(btc_backtest.__file__).parents[1]
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(src_dir)},
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_parse_and_expand_grid():
+    """
+    Grid values are parsed as JSON where possible; all combinations are listed.
+    """
+    grid = parse_grid(["fast_window=5,10", "fees=0.001", "name=abc"])
+    assert grid == {"fast_window": [5, 10], "fees": [0.001], "name": ["abc"]}
+    assert expand_grid(grid) == [
+        {"fast_window": 5, "fees": 0.001, "name": "abc"},
+        {"fast_window": 10, "fees": 0.001, "name": "abc"},
+    ]
+    assert expand_grid({}) == [{}]
+
+
+def test_fetch_requires_symbols():
+    with pytest.raises(SystemExit):
+        main(["fetch"])
+
+
+def test_report_from_metrics_dataset(mock_data, tmp_path: Path):
+    """
+    "report" renders the latest run stored in the metrics dataset.
+    """
+    for fast_window in (3, 4):
+        backtester = Backtester(
+            {"AAABTC": mock_data},
+            [(SmaCrossoverStrategy, {"fast_window": fast_window, "slow_window": 10})],
+            results_dir=str(tmp_path),
+            renderer=FigureRenderer(enabled=False),
+        )
+        backtester.run_all()
+        backtester.save_metrics_to_parquet()
+
+    out_file = tmp_path / "report.html"
+    assert (
+        main(
+            [
+                "report",
+                "--dataset",
+                str(tmp_path / "metrics_dataset"),
+                "--out",
+                str(out_file),
+            ]
+        )
+        == 0
+    )
+    document = out_file.read_text(encoding="utf-8")
+    assert backtester.run_id in document, "The latest run is reported."
+    data = json.loads(
+        re.search(r'id="report-data">(.*?)</script>', document, re.S).group(1)
+    )
+    assert len(data["rows"]) == 1
+    expected = backtester.all_metrics["SmaCrossoverStrategy"]["AAABTC"]
+    column = data["columns"].index("total_return")
+    assert data["rows"][0][column] == pytest.approx(expected["total_return"])
+    assert "n_bars" not in data["columns"] and "elapsed_s" not in data["columns"]
+
+
+def test_sweep_runs_every_combination(mock_data, tmp_path: Path, monkeypatch):
+    """
+    "sweep" backtests the whole grid and writes a summary sorted by Sharpe.
+    """
+    monkeypatch.setattr(btc_backtest.cli, "_load", lambda args: {"AAABTC": mock_data})
+    code = main(
+        [
+            "sweep",
+            "SmaCrossoverStrategy",
+            "AAABTC",
+            "--grid",
+            "fast_window=2,3",
+            "--grid",
+            "slow_window=8,10",
+            "--results-dir",
+            str(tmp_path),
+        ]
+    )
+    assert code == 0
+    summary = pd.read_csv(tmp_path / "sweep_SmaCrossoverStrategy.csv")
+    assert len(summary) == 4
+    assert set(zip(summary["param_fast_window"], summary["param_slow_window"])) == {
+        (2, 8),
+        (2, 10),
+        (3, 8),
+        (3, 10),
+    }
+    assert summary["sharpe_ratio"].is_monotonic_decreasing
+    assert summary["run_id"].nunique() == 1, "One run id for the whole sweep."
+
+
+def test_sharded_sweep_worker_and_merge(mock_data, tmp_path: Path, monkeypatch):
+    """
+    "sweep --manifest" only writes the shards; "worker" runs them and "merge"
+    collects one row per parameter set.
+    """
+    monkeypatch.setattr(btc_backtest.cli, "_load", lambda args: {"AAABTC": mock_data})
+    sweep_dir = str(tmp_path / "sweep")
+    args = ["AAABTC", "--grid", "fast_window=2,3", "--results-dir", str(tmp_path)]
+    assert (
+        main(["sweep", "SmaCrossoverStrategy", *args, "--manifest", sweep_dir])
+        == 0
+    )
+    assert not (tmp_path / "sweep_SmaCrossoverStrategy.csv").exists()
+    assert main(["merge", sweep_dir]) == 1
+
+    assert main(["worker", sweep_dir, "--worker-id", "w0"]) == 0
+    assert main(["merge", sweep_dir]) == 0
+    merged = pd.read_parquet(tmp_path / "sweep" / "merged.parquet")
+    assert sorted(merged["param_fast_window"]) == [2, 3]
+
+
+def test_sweep_with_successive_halving(mock_data, tmp_path: Path, monkeypatch):
+    """
+    "sweep --halving" ranks the survivors of the search instead of running
+    the full grid.
+    """
+    monkeypatch.setattr(btc_backtest.cli, "_load", lambda args: {"AAABTC": mock_data})
+    code = main(
+        [
+            "sweep",
+            "SmaCrossoverStrategy",
+            "AAABTC",
+            "--grid",
+            "fast_window=2,3,4",
+            "--grid",
+            "slow_window=8,10,12",
+            "--halving",
+            "--min-bars",
+            "12",
+            "--metric",
+            "total_return",
+            "--results-dir",
+            str(tmp_path),
+        ]
+    )
+    assert code == 0
+    ranking = pd.read_csv(tmp_path / "halving_SmaCrossoverStrategy.csv")
+    assert len(ranking) == 1
+    assert not (tmp_path / "sweep_SmaCrossoverStrategy.csv").exists()
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from btc_backtest.core.backtester import Backtester, run_unit
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.panel import build_panel
+from btc_backtest.strategies.cross_sectional_momentum import (
+    CrossSectionalMomentumStrategy,
+    top_k_mask,
+)
+
+PARAMS = {"lookback": 120, "rebalance_every": 30, "top_k": 2}
+
+
+@pytest.fixture
+def data_dict() -> dict[str, pd.DataFrame]:
+    # The last symbol is "listed" later than the others
+    data = {f"S{seed}BTC": generate_ohlcv(1_200, seed=seed) for seed in range(5)}
+    data["S4BTC"] = data["S4BTC"].iloc[400:]
+    return data
+
+
+def test_top_k_mask_matches_sorting():
+    """
+    The argpartition selection equals picking the k largest eligible scores of
+    every row by sorting.
+    """
+    rng = np.random.default_rng(0)
+    scores = rng.normal(size=(200, 12))
+    scores[rng.random(scores.shape) < 0.2] = np.nan
+
+    mask = top_k_mask(scores, 3, min_score=0.0)
+    for row, selected in zip(scores, mask):
+        eligible = np.flatnonzero(np.isfinite(row) & (row > 0))
+        best = eligible[np.argsort(-row[eligible])[:3]]
+        assert set(np.flatnonzero(selected)) == set(best)
+
+    assert (top_k_mask(scores, 20) == (np.nan_to_num(scores) > 0)).all()
+
+
+def test_target_weights_hold_the_top_symbols(data_dict: dict[str, pd.DataFrame]):
+    """
+    On every rebalance bar the top_k symbols by momentum / volatility get
+    equal weights; there are no orders between rebalances.
+    """
+    strategy = CrossSectionalMomentumStrategy(build_panel(data_dict), **PARAMS)
+    weights = strategy.target_weights()
+    close = strategy.data["close"]
+
+    rebalances = weights.dropna(how="all")
+    assert (rebalances.index == close.index[::30]).all()
+    totals = rebalances.sum(axis=1)
+    assert set(totals.round(9)) <= {0.0, 1.0}
+    held = rebalances.to_numpy()
+    assert set(np.unique(held[held > 0])) <= {0.5, 1.0}
+    assert weights["S4BTC"].iloc[:400].isna().all(), "No orders before listing."
+
+    bar = close.index[600]
+    log_returns = np.log(close).diff().loc[:bar].iloc[-120:]
+    expected = (np.log(close.loc[bar]) - np.log(close.shift(120).loc[bar])) / (
+        log_returns.std() * np.sqrt(120)
+    )
+    expected_top = set(expected[expected > 0].nlargest(2).index)
+    assert set(weights.loc[bar][weights.loc[bar] > 0].index) == expected_top
+
+
+def test_run_grouped_shares_capital(data_dict: dict[str, pd.DataFrame], tmp_path: Path):
+    """
+    The strategy runs as one cash-sharing portfolio over all symbols, with its
+    own target weights instead of run_grouped()'s allocation.
+    """
+    backtester = Backtester(
+        data_dict,
+        [(CrossSectionalMomentumStrategy, {**PARAMS, "fees": 0.001})],
+        results_dir=str(tmp_path),
+    )
+    backtester.run_grouped()
+
+    pf = backtester.grouped_portfolios["CrossSectionalMomentumStrategy"]
+    equity = backtester.grouped_equity["CrossSectionalMomentumStrategy"]
+    assert isinstance(equity, pd.Series)
+    assert equity.iloc[0] == pytest.approx(10_000)
+    assert (pf.cash() >= -1e-6).all(), "Shared cash must never go negative."
+    assert pf.orders.count() > 0
+    assert (pf.asset_value(group_by=False).gt(0).sum(axis=1) <= 2).all()
+    assert backtester.grouped_metrics["CrossSectionalMomentumStrategy"]["symbols"] == 5
+
+
+def test_single_symbol_and_execution(data_dict: dict[str, pd.DataFrame]):
+    """
+    On one symbol the strategy trades it on its own momentum; stops, which
+    from_orders() cannot simulate, are refused.
+    """
+    result = run_unit(
+        CrossSectionalMomentumStrategy,
+        {**PARAMS, "execution": ExecutionModel(fill="next_open", slippage=0.0005)},
+        "S0BTC",
+        data_dict["S0BTC"],
+    )
+    assert result.equity.iloc[0] == pytest.approx(10_000)
+
+    with pytest.raises(ValueError):
+        CrossSectionalMomentumStrategy(
+            data_dict["S0BTC"], execution=ExecutionModel(sl_stop=0.02)
+        ).run_backtest()
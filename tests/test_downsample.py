@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.downsample import (
+    downsample_series,
+    lttb_indices,
+    minmax_indices,
+)
+from btc_backtest.core.rendering import FigureRenderer
+
+
+@pytest.fixture
+def equity() -> pd.Series:
+    values = 10_000 + np.random.default_rng(3).standard_normal(50_000).cumsum()
+    index = pd.date_range("2024-01-01", periods=len(values), freq="1min")
+    return pd.Series(values, index=index)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_respects_budget_and_endpoints(equity: pd.Series, method: str):
+    """
+    The result has at most max_points points, keeps the first and last ones and
+    stays ordered in time.
+    """
+    points = downsample_series(equity, 1_000, method)
+    assert len(points) <= 1_000
+    assert points.index[0] == equity.index[0]
+    assert points.index[-1] == equity.index[-1]
+    assert points.index.is_monotonic_increasing
+
+
+def test_minmax_keeps_extremes(equity: pd.Series):
+    """
+    Min/max bucketing never drops the global minimum or maximum.
+    """
+    points = downsample_series(equity, 500, "minmax")
+    assert points.max() == equity.max()
+    assert points.min() == equity.min()
+
+
+def test_lttb_keeps_spike():
+    """
+    LTTB selects an isolated spike, which plain decimation would likely miss.
+    """
+    y = np.zeros(10_000)
+    y[4_321] = 100.0
+    indices = lttb_indices(np.arange(len(y)), y, 100)
+    assert 4_321 in indices
+    assert len(indices) == 100
+
+
+def test_short_series_is_unchanged():
+    """
+    Series within the budget (or without a budget) are returned as is.
+    """
+    series = pd.Series([1.0, 2.0, 3.0])
+    assert downsample_series(series, 10).equals(series)
+    assert downsample_series(series, None).equals(series)
+    assert len(minmax_indices(series.to_numpy(), 10)) == 3
+
+
+def test_unknown_method_raises(equity: pd.Series):
+    """
+    Unsupported methods are rejected.
+    """
+    with pytest.raises(ValueError, match="Unknown downsampling method"):
+        downsample_series(equity, 100, "mean")
+
+
+def test_equity_plot_uses_point_budget(equity: pd.Series, tmp_path: Path):
+    """
+    plot_equity_curves downsamples every curve and uses WebGL traces for HTML.
+    """
+    class CapturingRenderer(FigureRenderer):
+        def add(self, fig, path, scale=2):
+            self.figures[path] = fig
+            return True
+
+    renderer = CapturingRenderer()
+    renderer.figures = {}
+    backtester = Backtester({}, [], results_dir=str(tmp_path), renderer=renderer)
+    backtester.all_equity = {"Strat": {"AAABTC": equity, "BBBBTC": equity * 1.1}}
+    backtester.plot_equity_curves(save_html=True, max_points=400)
+
+    (fig,) = renderer.figures.values()
+    assert [trace.type for trace in fig.data] == ["scattergl", "scattergl"]
+    assert all(len(trace.x) <= 400 for trace in fig.data)
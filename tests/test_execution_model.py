@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+import vectorbt as vbt
+
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.sizing import FixedFraction
+from btc_backtest.strategies.base import StrategyBase
+
+# Order and volume settings of main.py: capital in BTC, 10% of it per entry
+BTC_PARAMS = {
+    "init_cash": 1.0,
+    "fees": 0.001,
+    "execution": ExecutionModel(
+        fill="next_open", slippage=0.0002, volume_impact=0.1
+    ),
+    "sizer": FixedFraction(0.1),
+}
+
+
+class OneTradeStrategy(StrategyBase):
+    """
+    Enters on bar 2 and exits on bar 6.
+    """
+
+    def generate_signals(self) -> tuple[pd.Series, pd.Series]:
+        entries = pd.Series(False, index=self.data.index)
+        exits = pd.Series(False, index=self.data.index)
+        entries.iloc[2] = True
+        exits.iloc[6] = True
+        return entries, exits
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    close = np.array([100, 101, 102, 103, 104, 105, 106, 107, 108, 109], dtype=float)
+    return pd.DataFrame(
+        {
+            "open": close - 0.5,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": np.full(10, 50.0),
+            "quote_asset_volume": np.full(10, 5_000.0),
+        },
+        index=pd.date_range("2024-01-01", periods=10, freq="1min"),
+    )
+
+
+def test_default_model_fills_at_close(ohlcv: pd.DataFrame):
+    """
+    Without an execution model the results equal a plain from_signals() call.
+    """
+    strat = OneTradeStrategy(data=ohlcv, fees=0.0)
+    pf = strat.run_backtest()
+    entries, exits = strat.generate_signals()
+    expected = vbt.Portfolio.from_signals(
+        close=ohlcv["close"], entries=entries, exits=exits, init_cash=10_000,
+        fees=0.0, slippage=0.0, freq="1Min",
+    )
+    pd.testing.assert_series_equal(pf.value(), expected.value())
+
+
+def test_next_open_fill(ohlcv: pd.DataFrame):
+    """
+    With fill="next_open" orders are executed at the next bar's open.
+    """
+    strat = OneTradeStrategy(
+        data=ohlcv, fees=0.0, execution=ExecutionModel(fill="next_open")
+    )
+    orders = strat.run_backtest().orders.records
+    assert list(orders["idx"]) == [3, 7]
+    assert list(orders["price"]) == [ohlcv["open"].iloc[3], ohlcv["open"].iloc[7]]
+
+
+def test_volume_scaled_slippage(ohlcv: pd.DataFrame):
+    """
+    Slippage grows with the share of the bar's quote volume the order takes
+    and is capped at max_slippage.
+    """
+    model = ExecutionModel(slippage=0.001, volume_impact=0.01, max_slippage=0.02)
+    slippage = model.slippage_for(ohlcv, order_notional=1_000)
+    assert slippage.iloc[0] == pytest.approx(0.001 + 0.01 * 1_000 / 5_000)
+
+    no_volume = ohlcv.assign(quote_asset_volume=0.0)
+    assert (model.slippage_for(no_volume, 1_000) == 0.02).all()
+
+    strat = OneTradeStrategy(data=ohlcv, fees=0.0, execution=model)
+    entry_price = strat.run_backtest().orders.records["price"].iloc[0]
+    assert entry_price == pytest.approx(102 * (1 + 0.02)), "10k order hits the cap."
+
+
+def test_sized_orders_scale_the_volume_impact(ohlcv: pd.DataFrame):
+    """
+    With a sizer the participation is based on the sized order, not on the
+    whole capital.
+    """
+    model = ExecutionModel(slippage=0.001, volume_impact=0.01, max_slippage=0.02)
+    strat = OneTradeStrategy(
+        data=ohlcv, fees=0.0, execution=model, sizer=FixedFraction(0.1)
+    )
+    entry_price = strat.run_backtest().orders.records["price"].iloc[0]
+    assert entry_price == pytest.approx(102 * (1 + 0.001 + 0.01 * 1_000 / 5_000))
+
+
+def test_btc_config_slippage_stays_below_cap():
+    """
+    Orders of main.py's configuration (0.1 BTC) do not saturate the volume
+    impact on bars trading realistic BTC volumes.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "open": np.full(1_000, 1e-4),
+            "close": np.full(1_000, 1e-4),
+            "quote_asset_volume": rng.uniform(0.25, 5.0, 1_000),
+        },
+        index=pd.date_range("2025-02-01", periods=1_000, freq="1min"),
+    )
+    strat = OneTradeStrategy(data=data, **BTC_PARAMS)
+    simulation_kwargs = strat._simulation_kwargs({}, strat._signal_kwargs())
+    slippage = pd.Series(simulation_kwargs["slippage"])
+    assert (slippage < BTC_PARAMS["execution"].max_slippage).all()
+    assert slippage.median() < 0.01
+
+
+def test_stop_loss_uses_bar_low(ohlcv: pd.DataFrame):
+    """
+    A stop-loss is triggered by the bar's low even if the close stays above it.
+    """
+    data = ohlcv.copy()
+    data.loc[data.index[4], "low"] = 95.0  # -6.9% intrabar dip, close = 104
+    strat = OneTradeStrategy(
+        data=data, fees=0.0, execution=ExecutionModel(sl_stop=0.05)
+    )
+    orders = strat.run_backtest().orders.records
+    assert list(orders["idx"]) == [2, 4], "The stop should exit on the dip bar."
+    assert orders["price"].iloc[1] == pytest.approx(102 * 0.95)
+
+
+def test_unknown_fill_mode_raises(ohlcv: pd.DataFrame):
+    """
+    Unsupported fill modes are rejected.
+    """
+    with pytest.raises(ValueError, match="Unknown fill mode"):
+        ExecutionModel(fill="vwap").shift_signal(pd.Series([True, False]))
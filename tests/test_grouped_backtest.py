@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from benchmarks.synthetic import generate_ohlcv
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.panel import build_panel
+from btc_backtest.strategies.rsi_bollinger import (
+    RsiBollingerStrategy,
+    bollinger_lower_band,
+    wilder_rsi,
+)
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
+
+
+@pytest.fixture
+def data_dict() -> dict[str, pd.DataFrame]:
+    # The third symbol is "listed" later than the others
+    return {
+        "AAABTC": generate_ohlcv(600, seed=1),
+        "BBBBTC": generate_ohlcv(600, seed=2),
+        "CCCBTC": generate_ohlcv(600, seed=3).iloc[200:],
+    }
+
+
+def test_build_panel_aligns_symbols(data_dict: dict[str, pd.DataFrame]):
+    """
+    The panel has one column per symbol for every field, outer-joined on time.
+    """
+    panel = build_panel(data_dict)
+    close = panel["close"]
+    assert list(close.columns) == ["AAABTC", "BBBBTC", "CCCBTC"]
+    assert len(close) == 600
+    assert close["CCCBTC"].iloc[:200].isna().all(), "Bars before listing must be NaN."
+    pd.testing.assert_series_equal(
+        close["AAABTC"], data_dict["AAABTC"]["close"], check_names=False
+    )
+
+
+def test_column_wise_indicators_match_ta():
+    """
+    The DataFrame-capable RSI and Bollinger band reproduce the `ta` values.
+    """
+    close = generate_ohlcv(300, seed=4)["close"]
+    expected_rsi = ta.momentum.RSIIndicator(close=close, window=14).rsi()
+    expected_lband = ta.volatility.BollingerBands(
+        close=close, window=20, window_dev=2
+    ).bollinger_lband()
+    np.testing.assert_allclose(wilder_rsi(close, 14), expected_rsi, equal_nan=True)
+    np.testing.assert_allclose(
+        bollinger_lower_band(close, 20), expected_lband, equal_nan=True
+    )
+
+
+def test_grouped_signals_match_per_symbol(data_dict: dict[str, pd.DataFrame]):
+    """
+    Signals computed on the panel equal the signals computed symbol by symbol.
+    """
+    panel = build_panel(data_dict)
+    entries, exits = SmaCrossoverStrategy(data=panel).generate_signals()
+    single_entries, single_exits = SmaCrossoverStrategy(
+        data=data_dict["BBBBTC"]
+    ).generate_signals()
+    assert entries["BBBBTC"].equals(single_entries.rename("BBBBTC"))
+    assert exits["BBBBTC"].equals(single_exits.rename("BBBBTC"))
+
+
+def test_run_grouped_shares_capital(
+    data_dict: dict[str, pd.DataFrame], tmp_path: Path
+):
+    """
+    Each strategy yields one portfolio whose equity starts at init_cash and
+    never holds more than the shared capital in open positions.
+    """
+    strategies = [
+        (SmaCrossoverStrategy, {"init_cash": 10_000, "fees": 0.001}),
+        (RsiBollingerStrategy, {"init_cash": 10_000, "fees": 0.001}),
+        (VolumeSpikeBreakoutStrategy, {"init_cash": 10_000, "fees": 0.001}),
+    ]
+    backtester = Backtester(data_dict, strategies, results_dir=str(tmp_path))
+    backtester.run_grouped()
+
+    assert set(backtester.grouped_metrics) == {
+        "SmaCrossoverStrategy",
+        "RsiBollingerStrategy",
+        "VolumeSpikeBreakoutStrategy",
+    }
+    pf = backtester.grouped_portfolios["SmaCrossoverStrategy"]
+    equity = backtester.grouped_equity["SmaCrossoverStrategy"]
+    assert isinstance(equity, pd.Series), "A grouped portfolio has one equity curve."
+    assert equity.iloc[0] == pytest.approx(10_000)
+    assert (pf.cash() >= -1e-6).all(), "Shared cash must never go negative."
+    assert pf.orders.count() > 0
+
+    metrics = backtester.grouped_metrics["SmaCrossoverStrategy"]
+    assert metrics["symbols"] == 3
+    assert 0 <= metrics["exposure"] <= 100
+
+    backtester.save_grouped_metrics_to_csv()
+    saved = pd.read_csv(tmp_path / "grouped_metrics.csv")
+    assert len(saved) == 3
@@ -0,0 +1,105 @@
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from btc_backtest.core import instrumentation
+from btc_backtest.core.binance.parser import parse_kline_zip
+from btc_backtest.core.instrumentation import (
+    disable_tracing,
+    enable_tracing,
+    span,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer():
+    tracer = enable_tracing()
+    yield tracer
+    disable_tracing()
+
+
+def test_span_is_noop_when_disabled():
+    """
+    Without an active tracer, span() returns the shared no-op object.
+    """
+    disable_tracing()
+    with span("anything") as sp:
+        sp.add_items(10)
+    assert sp is instrumentation._NOOP_SPAN, "Disabled tracing must not allocate spans."
+
+
+def test_nested_spans_record_parent_and_items(tracer):
+    """
+    Nested spans know their parent, and items/attributes are recorded.
+    """
+    with span("outer") as outer:
+        with span("inner", symbol="ETHBTC") as inner:
+            inner.add_items(5)
+        outer.add_items(1)
+
+    names = [s.name for s in tracer.spans]
+    assert names == ["inner", "outer"], "Spans are recorded in completion order."
+    inner_span = tracer.spans[0]
+    assert inner_span.parent is tracer.spans[1]
+    assert inner_span.items == 5
+    assert inner_span.attrs["symbol"] == "ETHBTC"
+    assert tracer.spans[1].wall_ns >= inner_span.wall_ns
+
+
+def test_traced_decorator_and_exports(tracer, tmp_path: Path):
+    """
+    @traced functions produce spans; JSON and Chrome-trace exports are valid JSON.
+    """
+    @traced("work")
+    def work() -> int:
+        return 42
+
+    assert work() == 42
+    json_file = tmp_path / "spans.json"
+    chrome_file = tmp_path / "chrome.json"
+    tracer.export_json(str(json_file))
+    tracer.export_chrome_trace(str(chrome_file))
+
+    data = json.loads(json_file.read_text())
+    assert data["summary"]["work"]["count"] == 1
+    events = json.loads(chrome_file.read_text())["traceEvents"]
+    assert events[0]["name"] == "work" and events[0]["ph"] == "X"
+
+
+def test_memory_tracking_records_allocation_peak():
+    """
+    With track_memory=True, a span that allocates a large buffer reports its peak.
+    """
+    tracer = enable_tracing(track_memory=True)
+    try:
+        with span("outer"):
+            with span("alloc"):
+                buf = bytearray(5_000_000)
+                del buf
+    finally:
+        disable_tracing()
+
+    by_name = {s.name: s for s in tracer.spans}
+    assert by_name["alloc"].mem_peak_bytes >= 5_000_000
+    assert by_name["outer"].mem_peak_bytes >= 5_000_000, (
+        "The parent span must include the peak of its children."
+    )
+
+
+def test_parse_kline_zip_is_instrumented(tracer):
+    """
+    parse_kline_zip reports the number of parsed rows.
+    """
+    csv_content = b"1640995200000,42,45,40,44,1000,1640995260000,40000,123,555,666,0\n"
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, mode="w") as zf:
+        zf.writestr("klines.csv", csv_content)
+
+    parse_kline_zip(buf.getvalue())
+    parse_spans = [s for s in tracer.spans if s.name == "parse_kline_zip"]
+    assert len(parse_spans) == 1
+    assert parse_spans[0].items == 1
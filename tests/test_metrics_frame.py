@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.metrics_frame import (
+    CORE_METRICS,
+    metrics_from_dicts,
+    pivot_metric,
+    wide_metrics,
+)
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+
+def test_metrics_frame_is_tidy_and_numeric():
+    """
+    Only numeric metrics are stored, one row per (strategy, symbol, metric).
+    """
+    frame = metrics_from_dicts(
+        {
+            "A": {"X": {"symbol": "X", "sharpe_ratio": 1, "stats": pd.Series([1, 2])}},
+            "B": {"Y": {"sharpe_ratio": np.float64(2.5), "drawdown": np.nan}},
+        }
+    )
+    assert list(frame.columns) == ["strategy", "symbol", "metric", "value"]
+    assert frame["value"].dtype == np.float64
+    assert isinstance(frame["metric"].dtype, pd.CategoricalDtype)
+    assert list(frame["metric"]) == ["sharpe_ratio", "sharpe_ratio", "drawdown"]
+
+
+def test_pivots_only_contain_observed_combinations():
+    """
+    pivot_metric() and wide_metrics() keep the order of first appearance and
+    leave missing combinations as NaN.
+    """
+    frame = metrics_from_dicts(
+        {
+            "B": {"Y": {"sharpe_ratio": 1.0}, "X": {"sharpe_ratio": 2.0}},
+            "A": {"X": {"sharpe_ratio": 3.0, "custom": 7.0}},
+        }
+    )
+    heatmap = pivot_metric(frame, "sharpe_ratio")
+    assert list(heatmap.index) == ["B", "A"]
+    assert list(heatmap.columns) == ["Y", "X"]
+    assert np.isnan(heatmap.loc["A", "Y"])
+
+    wide = wide_metrics(frame)
+    assert list(wide.columns) == ["strategy", "symbol", "sharpe_ratio", "custom"]
+    assert len(wide) == 3, "Only observed (strategy, symbol) pairs are rows."
+    assert list(wide_metrics(frame, CORE_METRICS).columns[2:]) == list(CORE_METRICS)
+
+
+def test_backtester_stores_tidy_metrics(mock_data, tmp_path):
+    """
+    run_all() fills the tidy frame; running again replaces (does not append)
+    the strategy's rows, and the CSV export is a pivot of the frame.
+    """
+    backtester = Backtester(
+        {"AAABTC": mock_data, "BBBBTC": mock_data},
+        [(SmaCrossoverStrategy, {"fast_window": 3, "slow_window": 10})],
+        results_dir=str(tmp_path),
+        renderer=FigureRenderer(enabled=False),
+    )
+    backtester.run_all()
+    first = backtester.metrics.copy()
+    backtester.run_all()
+
+    metrics = backtester.metrics
+    pd.testing.assert_frame_equal(metrics, first)
+    sharpe = pivot_metric(metrics, "sharpe_ratio")
+    assert sharpe.shape == (1, 2)
+    assert sharpe.loc["SmaCrossoverStrategy", "AAABTC"] == (
+        backtester.all_metrics["SmaCrossoverStrategy"]["AAABTC"]["sharpe_ratio"]
+    )
+
+    backtester.save_metrics_to_csv("metrics.csv")
+    csv = pd.read_csv(tmp_path / "metrics.csv")
+    assert list(csv.columns) == ["strategy", "symbol", *CORE_METRICS]
+    assert list(csv["symbol"]) == ["AAABTC", "BBBBTC"]
@@ -0,0 +1,115 @@
+import pandas as pd
+import pyarrow.dataset as ds
+
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.metrics_store import (
+    latest_run_id,
+    param_columns,
+    read_metrics_dataset,
+    stats_columns,
+)
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.sizing import FixedFraction
+from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+
+def make_backtester(mock_data: pd.DataFrame, results_dir: str) -> Backtester:
+    data = mock_data.set_index(
+        pd.date_range("2025-02-01", periods=len(mock_data), freq="1min")
+    )
+    return Backtester(
+        {"AAABTC": data, "BBBBTC": data},
+        [
+            (
+                SmaCrossoverStrategy,
+                {
+                    "fast_window": 3,
+                    "slow_window": 10,
+                    "sizer": FixedFraction(0.5),
+                    "execution": ExecutionModel(fill="next_open"),
+                },
+            ),
+            (RsiBollingerStrategy, {"rsi_window": 5, "bb_window": 5}),
+        ],
+        results_dir=results_dir,
+        renderer=FigureRenderer(enabled=False),
+    )
+
+
+def test_param_and_stats_columns():
+    """
+    NamedTuple parameters are flattened field by field; stats labels become
+    snake_case column names and timedeltas become seconds.
+    """
+    columns = param_columns({"fast_window": 3, "sizer": FixedFraction(0.5)})
+    assert columns == {
+        "param_fast_window": 3,
+        "param_sizer": "FixedFraction",
+        "param_sizer_fraction": 0.5,
+    }
+    stats = pd.Series(
+        {
+            "Start": pd.Timestamp("2025-01-01"),
+            "Total Return [%]": 1.5,
+            "Max Drawdown Duration": pd.Timedelta(minutes=2),
+            "Avg Winning Trade Duration": pd.NaT,
+        }
+    )
+    assert stats_columns(stats) == {
+        "stats_total_return_pct": 1.5,
+        "stats_max_drawdown_duration": 120.0,
+        "stats_avg_winning_trade_duration": None,
+    }
+
+
+def test_metrics_dataset_appends_runs(mock_data, tmp_path):
+    """
+    Every run appends its rows (params, stats, data range and timing included)
+    to the partitioned dataset; earlier runs are kept.
+    """
+    first = make_backtester(mock_data, str(tmp_path))
+    first.run_all()
+    first.save_metrics_to_parquet()
+    second = make_backtester(mock_data, str(tmp_path))
+    second.run_all()
+    second.save_metrics_to_parquet()
+
+    runs = read_metrics_dataset(str(tmp_path / "metrics_dataset"))
+    assert len(runs) == 8, "2 runs x 2 strategies x 2 symbols."
+    assert set(runs["run_id"]) == {first.run_id, second.run_id}
+
+    sma = runs[runs["strategy"] == "SmaCrossoverStrategy"]
+    assert (sma["param_fast_window"] == 3).all()
+    assert (sma["param_execution_fill"] == "next_open").all()
+    assert sma["param_rsi_window"].isna().all(), "Params of other strategies."
+    assert "stats_total_return_pct" in runs.columns
+    assert (runs["data_start"] == pd.Timestamp("2025-02-01")).all()
+    assert (runs["n_bars"] == len(mock_data)).all()
+    assert (runs["elapsed_s"] > 0).all()
+
+    only_rsi = read_metrics_dataset(
+        str(tmp_path / "metrics_dataset"),
+        filter=ds.field("strategy") == "RsiBollingerStrategy",
+        columns=["run_id", "symbol", "sharpe_ratio"],
+    )
+    assert len(only_rsi) == 4
+    assert list(only_rsi.columns) == ["run_id", "symbol", "sharpe_ratio"]
+
+
+def test_latest_run_id_follows_start_time():
+    """
+    The latest run is the one started last, even when two runs started within
+    the same second and their ids sort the other way.
+    """
+    runs = pd.DataFrame(
+        {
+            "run_id": ["20250301T120000-ffffffff", "20250301T120000-00000000"],
+            "run_started_at": pd.to_datetime(
+                ["2025-03-01 12:00:00.100", "2025-03-01 12:00:00.900"], utc=True
+            ),
+        }
+    )
+    assert latest_run_id(runs) == "20250301T120000-00000000"
+    assert latest_run_id(runs.iloc[:0]) is None
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from btc_backtest.core.binance.cache_manager import CacheManager
+from btc_backtest.core.progress import LoaderStats
+
+
+def test_record_missing_persists_across_instances(
+    cache_manager: CacheManager, cache_dir: Path, checksums_file: Path
+):
+    """
+    A 404 for a finished month is remembered on disk and seen by a new instance.
+    """
+    assert not cache_manager.is_known_missing("NEWBTC", "1h", 2020, 1)
+    cache_manager.record_missing("NEWBTC", "1h", 2020, 1, "404")
+    assert cache_manager.is_known_missing("NEWBTC", "1h", 2020, 1)
+
+    reopened = CacheManager({}, str(cache_dir), str(checksums_file))
+    assert reopened.is_known_missing("NEWBTC", "1h", 2020, 1)
+    assert not reopened.is_known_missing("NEWBTC", "1h", 2020, 2)
+
+
+def test_negative_entries_expire(cache_dir: Path, checksums_file: Path):
+    """
+    Transient failures use failure_ttl and are retried once it has elapsed.
+    """
+    manager = CacheManager(
+        {}, str(cache_dir), str(checksums_file), failure_ttl=0, not_found_ttl=3600
+    )
+    manager.record_missing("ETHBTC", "1h", 2020, 1, "ConnectError")
+    assert not manager.is_known_missing("ETHBTC", "1h", 2020, 1)
+
+    # A 404 for the running month may be published later: short TTL as well
+    manager.record_missing("ETHBTC", "1h", 2999, 1, "404")
+    assert not manager.is_known_missing("ETHBTC", "1h", 2999, 1)
+
+
+def test_save_file_clears_negative_entry(cache_manager: CacheManager):
+    """
+    Once a file is downloaded, it is no longer considered missing.
+    """
+    cache_manager.record_missing("ETHBTC", "1h", 2020, 1, "404")
+    cache_manager.save_file("ETHBTC", "1h", 2020, 1, b"content")
+    assert not cache_manager.is_known_missing("ETHBTC", "1h", 2020, 1)
+
+
+def test_negative_cache_is_an_append_log(
+    cache_manager: CacheManager, cache_dir: Path, checksums_file: Path
+):
+    """
+    Every failure appends one line instead of rewriting the file; a new
+    instance replays the log and compacts it to the live entries.
+    """
+    log_file = cache_dir / "negative_cache.jsonl"
+    for month in (1, 2, 3):
+        cache_manager.record_missing("ETHBTC", "1h", 2020, month, "404")
+    first_lines = log_file.read_text().splitlines()
+    cache_manager.save_file("ETHBTC", "1h", 2020, 2, b"content")
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 4
+    assert lines[:3] == first_lines, "Earlier lines are never rewritten."
+
+    reopened = CacheManager({}, str(cache_dir), str(checksums_file))
+    assert reopened.is_known_missing("ETHBTC", "1h", 2020, 1)
+    assert not reopened.is_known_missing("ETHBTC", "1h", 2020, 2)
+    assert len(log_file.read_text().splitlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_loader_skips_known_missing_months(kline_zip: bytes, make_loader):
+    """
+    A month that returned 404 is not requested again on the next run.
+    """
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if "2024-01" in request.url.path:
+            return httpx.Response(200, content=kline_zip)
+        return httpx.Response(404)
+
+    stats = LoaderStats()
+    loader = make_loader(handler, stats)
+
+    await loader.load_data_for_period("ETHBTC")
+    assert len(requested) == 2
+    assert stats.not_found == 1
+
+    df = await loader.load_data_for_period("ETHBTC")
+    assert len(df) == 1
+    assert len(requested) == 2, "Cached and known-missing files must not be fetched."
+    assert stats.skipped_missing == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(
+    cache_manager: CacheManager, make_loader
+):
+    """
+    Non-transient 4xx responses fail immediately and are negatively cached.
+    """
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(403)
+
+    stats = LoaderStats()
+    loader = make_loader(handler, stats)
+
+    df = await loader.download_monthly_klines("ETHBTC", 2024, 1)
+    assert df.empty
+    assert calls == 1, "A 403 should not be retried."
+    assert stats.retries == 0
+    assert cache_manager.is_known_missing("ETHBTC", loader.interval, 2024, 1)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_are_negatively_cached(
+    cache_manager: CacheManager, make_loader
+):
+    """
+    A server error that persists through every retry counts as an error and
+    is negatively cached instead of failing the whole load.
+    """
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    stats = LoaderStats()
+    loader = make_loader(handler, stats)
+
+    df = await loader.download_monthly_klines("ETHBTC", 2024, 1)
+    assert df.empty
+    assert calls == 5
+    assert stats.retries == 4
+    assert stats.errors == 1
+    assert cache_manager.is_known_missing("ETHBTC", loader.interval, 2024, 1)
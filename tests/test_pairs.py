@@ -0,0 +1,143 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import btc_backtest.cli
+from btc_backtest.cli import main
+from btc_backtest.core.panel import build_panel
+from btc_backtest.core.panel_store import write_panel_store
+from btc_backtest.core.pairs import engle_granger, scan_pairs, top_pairs
+from btc_backtest.strategies.pairs_spread import PairsSpreadStrategy
+
+COINTEGRATED = ["S0BTC", "S1BTC", "S2BTC", "S3BTC"]
+
+
+def make_universe(n: int = 4_000, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    Four symbols driven by one common random walk plus mean-reverting noise
+    (cointegrated with each other) and two with an extra random walk each.
+    """
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 1e-3, n))
+    index = pd.date_range("2025-02-01", periods=n, freq="1min")
+    data = {}
+    for i in range(6):
+        shocks = rng.normal(0, 5e-4, n)
+        noise = np.zeros(n)
+        for t in range(1, n):
+            noise[t] = 0.97 * noise[t - 1] + shocks[t]
+        walk = np.cumsum(rng.normal(0, 1e-3, n)) if i >= 4 else 0.0
+        close = np.exp(np.log(10 + i) + common * (1 + 0.1 * i) + noise + walk)
+        data[f"S{i}BTC"] = pd.DataFrame(
+            {
+                "open": close,
+                "high": close * 1.001,
+                "low": close * 0.999,
+                "close": close,
+                "volume": rng.uniform(1e5, 1e6, n),
+            },
+            index=index,
+        )
+    return data
+
+
+def test_engle_granger_matches_single_pair_regressions():
+    """
+    The batched statistics equal an OLS fit and a Dickey-Fuller regression
+    computed pair by pair.
+    """
+    close = build_panel(make_universe(1_000))["close"]
+    log_prices = np.log(close.to_numpy())
+    pairs = np.array([[0, 1], [2, 0], [4, 5], [1, 3]])
+
+    stats = engle_granger(log_prices, pairs)
+    for (first, second), row in zip(pairs, stats):
+        y, x = log_prices[:, first], log_prices[:, second]
+        slope, intercept = np.polyfit(x, y, 1)
+        spread = y - intercept - slope * x
+        lagged, change = spread[:-1], np.diff(spread)
+        gamma = lagged @ change / (lagged @ lagged)
+        residual = change - gamma * lagged
+        se = np.sqrt(residual @ residual / (len(change) - 1) / (lagged @ lagged))
+        np.testing.assert_allclose(row[:3], [slope, intercept, gamma / se])
+
+
+def test_scan_finds_the_cointegrated_pairs(tmp_path: Path):
+    """
+    Pairs of the cointegrated symbols rank first; a scan in worker processes
+    mapping a PanelStore gives the same result.
+    """
+    data = make_universe()
+    scan = scan_pairs(build_panel(data)["close"], window=3_000, min_correlation=0.2)
+
+    assert len(scan) == 15
+    assert scan["adf_stat"].is_monotonic_increasing
+    cointegrated = scan[scan["cointegrated"]]
+    assert {*cointegrated["first"], *cointegrated["second"]} == set(COINTEGRATED)
+    assert len(cointegrated) == 6
+    assert top_pairs(scan, 2) == list(zip(scan["first"][:2], scan["second"][:2]))
+
+    store = write_panel_store(data, str(tmp_path / "panel"))
+    parallel = scan_pairs(
+        store, window=3_000, min_correlation=0.2, block_size=4, workers=2
+    )
+    pd.testing.assert_frame_equal(parallel, scan)
+
+    strict = scan_pairs(build_panel(data)["close"], window=3_000, min_correlation=0.99)
+    assert strict.empty
+
+
+def test_pairs_spread_batch_matches_single_pairs():
+    """
+    All pairs simulated in one call give every pair the result of its own
+    run; the two legs of a position always point in opposite directions.
+    """
+    panel = build_panel(make_universe())
+    pairs = [("S0BTC", "S1BTC"), ("S2BTC", "S3BTC"), ("S1BTC", "S4BTC")]
+    params = {"window": 300, "fees": 0.0005}
+
+    strategy = PairsSpreadStrategy(panel, pairs, **params)
+    pf = strategy.run_backtest()
+    assert list(pf.wrapper.grouper.get_columns()) == strategy.pair_names
+    for name, pair in zip(strategy.pair_names, pairs):
+        single = PairsSpreadStrategy(panel, [pair], **params).run_backtest()
+        assert pf.total_return()[name] == pytest.approx(single.total_return())
+    assert (pf.orders.count() > 0).all()
+    assert (pf.cash() >= -1e-6).all().all()
+
+    weights = strategy.target_weights().fillna(0.0).to_numpy()
+    assert (weights[:, 0::2] * weights[:, 1::2] <= 0).all()
+
+    with pytest.raises(ValueError):
+        PairsSpreadStrategy(panel, [("S0BTC", "XXXBTC")])
+    with pytest.raises(ValueError):
+        PairsSpreadStrategy(panel, pairs, entry_z=1.0, exit_z=1.5)
+
+
+def test_pairs_command(tmp_path: Path, monkeypatch):
+    """
+    "btc-backtest pairs" writes the scan and backtests the best pairs.
+    """
+    monkeypatch.setattr(btc_backtest.cli, "_load", lambda args: make_universe())
+    code = main(
+        [
+            "pairs",
+            "S0BTC",
+            "--window",
+            "3000",
+            "--min-correlation",
+            "0.2",
+            "--backtest",
+            "2",
+            "--spread-window",
+            "300",
+            "--results-dir",
+            str(tmp_path),
+        ]
+    )
+    assert code == 0
+    assert len(pd.read_csv(tmp_path / "pairs_scan.csv")) == 15
+    backtest = pd.read_csv(tmp_path / "pairs_backtest.csv", index_col=0)
+    assert len(backtest) == 2
@@ -0,0 +1,136 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from btc_backtest.core.binance.binance_client import PairsFetcher, ticker_24hr_weight
+from btc_backtest.core.binance.rate_limiter import WeightRateLimiter
+
+EXCHANGE_INFO = {
+    "symbols": [
+        {"symbol": "ETHBTC", "quoteAsset": "BTC", "status": "TRADING"},
+        {"symbol": "SOLBTC", "quoteAsset": "BTC", "status": "TRADING"},
+        {"symbol": "OLDBTC", "quoteAsset": "BTC", "status": "BREAK"},
+        {"symbol": "ETHUSDT", "quoteAsset": "USDT", "status": "TRADING"},
+    ]
+}
+TICKERS = [
+    {"symbol": "ETHBTC", "quoteVolume": "500.0"},
+    {"symbol": "SOLBTC", "quoteVolume": "900.0"},
+    {"symbol": "OLDBTC", "quoteVolume": "5000.0"},
+    {"symbol": "TESTBTC", "quoteVolume": "99999.0"},
+    {"symbol": "ETHUSDT", "quoteVolume": "1e9"},
+]
+
+
+class StubBinance:
+    """
+    In-process stub of the two Binance endpoints, recording every request.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"x-mbx-used-weight-1m": "0"}
+        if request.url.path == "/api/v3/exchangeInfo":
+            return httpx.Response(200, json=EXCHANGE_INFO, headers=headers)
+        if request.url.path == "/api/v3/ticker/24hr":
+            symbols = request.url.params.get("symbols")
+            data = TICKERS
+            if symbols is not None:
+                wanted = set(json.loads(symbols))
+                data = [t for t in TICKERS if t["symbol"] in wanted]
+            return httpx.Response(200, json=data, headers=headers)
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def stub() -> StubBinance:
+    return StubBinance()
+
+
+@pytest.fixture
+def stub_client(stub: StubBinance):
+    return httpx.AsyncClient(transport=httpx.MockTransport(stub))
+
+
+@pytest.mark.asyncio
+async def test_ticker_snapshot_is_cached_on_disk(stub, stub_client, tmp_path: Path):
+    """
+    A second call within the TTL (even from a new fetcher) must not hit the API.
+    """
+    fetcher = PairsFetcher(stub_client, cache_dir=str(tmp_path))
+    first = await fetcher.get_top_pairs(quote="BTC", limit=2)
+    assert first == ["OLDBTC", "SOLBTC"]
+    assert len(stub.requests) == 1
+
+    other = PairsFetcher(stub_client, cache_dir=str(tmp_path))
+    assert await other.get_top_pairs(quote="BTC", limit=2) == first
+    assert len(stub.requests) == 1, "Snapshot within TTL should be served from disk."
+
+    expired = PairsFetcher(stub_client, cache_dir=str(tmp_path), cache_ttl=0)
+    await expired.get_top_pairs(quote="BTC", limit=2)
+    assert len(stub.requests) == 2, "An expired snapshot must be refreshed."
+
+
+@pytest.mark.asyncio
+async def test_exchange_info_filtering_uses_symbols_query(stub, stub_client):
+    """
+    exchangeInfo-based selection drops non-trading pairs and requests only
+    the matching tickers through the `symbols=` filter.
+    """
+    fetcher = PairsFetcher(stub_client)
+    top = await fetcher.get_top_pairs(quote="BTC", limit=10, use_exchange_info=True)
+    assert top == ["SOLBTC", "ETHBTC"], "BREAK and non-BTC pairs must be excluded."
+
+    ticker_request = stub.requests[-1]
+    assert json.loads(ticker_request.url.params["symbols"]) == ["ETHBTC", "SOLBTC"]
+    assert ticker_request.url.params["type"] == "MINI"
+
+    with_delisted = await fetcher.get_trading_symbols("BTC", ("TRADING", "BREAK"))
+    assert "OLDBTC" in with_delisted
+
+
+def test_ticker_weights():
+    """
+    The weight of the ticker endpoint depends on the number of symbols.
+    """
+    assert ticker_24hr_weight(None) == 80
+    assert ticker_24hr_weight(5) == 2
+    assert ticker_24hr_weight(50) == 40
+    assert ticker_24hr_weight(500) == 80
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_when_budget_is_exhausted():
+    """
+    Requests exceeding the budget are delayed until the window frees up.
+    """
+    limiter = WeightRateLimiter(max_weight=10, window=0.2)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await limiter.acquire(6)
+    await limiter.acquire(4)
+    assert loop.time() - start < 0.1, "Requests within budget must not wait."
+
+    await limiter.acquire(5)
+    assert loop.time() - start >= 0.19, "Exceeding the budget must wait for the window."
+
+    with pytest.raises(ValueError):
+        await limiter.acquire(11)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_syncs_with_server_weight():
+    """
+    The server-reported used weight is added to the local budget.
+    """
+    limiter = WeightRateLimiter(max_weight=100)
+    await limiter.acquire(10)
+    limiter.update_from_headers({"x-mbx-used-weight-1m": "70"})
+    assert limiter.used_weight == 70
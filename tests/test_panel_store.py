@@ -0,0 +1,106 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_backtest.core.panel import build_panel
+from btc_backtest.core.panel_store import PanelStore, write_panel_store
+
+
+def make_data() -> dict[str, pd.DataFrame]:
+    """
+    Two symbols with different start/end times and a missing bar.
+    """
+    first = pd.date_range("2025-02-01", periods=5, freq="1min", name="open_time")
+    second = pd.date_range("2025-02-01 00:02", periods=6, freq="1min", name="open_time")
+    second = second.delete(2)
+    return {
+        "AAABTC": pd.DataFrame(
+            {"close": np.arange(5.0), "volume": 1.0, "high": 2.0, "low": 0.0},
+            index=first,
+        ),
+        "BBBBTC": pd.DataFrame(
+            {"close": np.arange(5.0) + 10, "volume": 2.0, "high": 12.0, "low": 9.0},
+            index=second,
+        ),
+    }
+
+
+def column_sums(store: PanelStore) -> list[float]:
+    return np.nansum(store.array("close"), axis=0).tolist()
+
+
+def test_symbols_are_aligned_to_a_common_grid(tmp_path: Path):
+    """
+    The store holds every field as a (time x symbol) matrix on one minute
+    grid, NaN where a symbol has no bar; panel() matches build_panel().
+    """
+    data = make_data()
+    store = write_panel_store(data, str(tmp_path / "panel"))
+
+    assert store.symbols == ["AAABTC", "BBBBTC"]
+    assert len(store.index) == 8
+    close = store.frame("close")
+    assert close["AAABTC"].tolist()[:5] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert close["BBBBTC"].isna().tolist() == [
+        True, True, False, False, True, False, False, False,
+    ]
+    pd.testing.assert_frame_equal(
+        store.symbol_frame("BBBBTC").dropna(),
+        data["BBBBTC"],
+        check_freq=False,
+    )
+    expected = build_panel(data, ("close", "volume", "high", "low"))
+    pd.testing.assert_frame_equal(
+        store.panel(), expected.reindex(store.index), check_freq=False
+    )
+
+
+def test_store_is_mapped_read_only_without_copies(tmp_path: Path):
+    """
+    Frames wrap the mapped matrices; writing to them raises.
+    """
+    store = write_panel_store(make_data(), str(tmp_path / "panel"))
+    matrix = store.array("close")
+
+    assert isinstance(matrix, np.memmap)
+    assert matrix.flags.f_contiguous and not matrix.flags.writeable
+    assert np.shares_memory(store.frame("close").to_numpy(), matrix)
+    assert np.shares_memory(store.symbol_frame("AAABTC")["close"].to_numpy(), matrix)
+    close = store.frame("close")
+    with pytest.raises(ValueError):
+        close.iloc[0, 0] = 1.0
+    with pytest.raises(KeyError):
+        store.array("open")
+
+
+def test_store_is_shared_with_worker_processes(tmp_path: Path):
+    """
+    A store pickles as its path; worker processes map the same files.
+    """
+    store = write_panel_store(make_data(), str(tmp_path / "panel"))
+    assert len(pickle.dumps(store)) < 500
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=context) as pool:
+        results = list(pool.map(column_sums, [store, store]))
+    assert results == [column_sums(store)] * 2 == [[10.0, 60.0]] * 2
+
+
+def test_rewrite_replaces_the_store_and_rejects_off_grid_bars(tmp_path: Path):
+    root = str(tmp_path / "panel")
+    write_panel_store(make_data(), root)
+    store = write_panel_store({"AAABTC": make_data()["AAABTC"]}, root)
+    assert store.symbols == ["AAABTC"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["panel"]
+
+    off_grid = make_data()["AAABTC"]
+    off_grid.index = off_grid.index + pd.Timedelta(seconds=30)
+    data = {"AAABTC": make_data()["AAABTC"], "BBBBTC": off_grid}
+    with pytest.raises(ValueError):
+        write_panel_store(data, root)
+    assert PanelStore(root).symbols == ["AAABTC"]
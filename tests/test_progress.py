@@ -0,0 +1,86 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from btc_backtest.core.progress import LoaderStats, ProgressReporter, StructuredFormatter
+
+
+def test_loader_stats_snapshot_ratios():
+    """
+    Derived rates are computed from the raw counters.
+    """
+    stats = LoaderStats()
+    stats.cache_hits = 3
+    stats.cache_misses = 1
+    stats.record_parse(rows=1_000, seconds=0.5)
+    snap = stats.snapshot()
+    assert snap["cache_hit_ratio"] == 0.75
+    assert snap["parse_rows_per_s"] == 2_000
+
+
+@pytest.mark.asyncio
+async def test_loader_counts_hits_misses_404_and_retries(
+    kline_zip: bytes, make_loader
+):
+    """
+    The loader records downloads, 404s, retries and cache hits instead of printing.
+    """
+    calls = {"2024-01": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "2024-01" in request.url.path:
+            calls["2024-01"] += 1
+            if calls["2024-01"] == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, content=kline_zip)
+        return httpx.Response(404)
+
+    stats = LoaderStats()
+    loader = make_loader(handler, stats)
+
+    df = await loader.load_data_for_period("ETHBTC")
+    assert len(df) == 1
+    assert stats.files_expected == 2
+    assert stats.files_done == 2
+    assert stats.cache_misses == 2
+    assert stats.not_found == 1
+    assert stats.retries == 1, "The 503 response should be retried once."
+    assert stats.bytes_downloaded == len(kline_zip)
+    assert stats.rows_parsed == 1
+
+    # Second run: January comes from the cache
+    await loader.load_data_for_period("ETHBTC")
+    assert stats.cache_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_emits_periodically(caplog: pytest.LogCaptureFixture):
+    """
+    The reporter logs snapshots at a fixed interval and a final summary.
+    """
+    stats = LoaderStats()
+    with caplog.at_level(logging.INFO, logger="btc_backtest"):
+        async with ProgressReporter(stats, interval=0.01):
+            await asyncio.sleep(0.05)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "loader progress" in messages
+    assert messages[-1] == "loader finished"
+    assert hasattr(caplog.records[-1], "cache_hit_ratio")
+
+
+def test_structured_formatter_key_values():
+    """
+    Fields passed via `extra` are rendered as key=value pairs (or JSON).
+    """
+    record = logging.LogRecord(
+        "btc_backtest", logging.INFO, __file__, 1, "downloaded", None, None
+    )
+    record.symbol = "ETHBTC"
+    record.bytes = 10
+    text = StructuredFormatter().format(record)
+    assert "downloaded symbol=ETHBTC bytes=10" in text
+    as_json = StructuredFormatter(as_json=True).format(record)
+    assert '"symbol": "ETHBTC"' in as_json
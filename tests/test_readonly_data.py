@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_backtest.core.backtester import run_unit
+from btc_backtest.core.panel import build_panel, freeze_frame
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+
+PARAMS = {"fast_window": 3, "slow_window": 10}
+
+
+class NumpyWritingStrategy(SmaCrossoverStrategy):
+    """
+    Overwrites the close prices through NumPy, which the view must refuse.
+    """
+
+    def generate_signals(self):
+        self.data["close"].to_numpy()[1:] = 0
+        return super().generate_signals()
+
+
+class PandasWritingStrategy(SmaCrossoverStrategy):
+    """
+    Overwrites the close prices through pandas after holding a reference to
+    the column, so copy-on-write may copy it instead of raising.
+    """
+
+    def generate_signals(self):
+        close = self.data["close"]
+        try:
+            self.data.iloc[1:, self.data.columns.get_loc("close")] = 0
+        except ValueError:
+            pass
+        assert close.iloc[1] != 0
+        return super().generate_signals()
+
+
+class RecordingStrategy(SmaCrossoverStrategy):
+    seen: list[pd.DataFrame] = []
+
+    def generate_signals(self):
+        RecordingStrategy.seen.append(self.data)
+        return super().generate_signals()
+
+
+def test_freeze_frame_shares_memory_and_refuses_writes(mock_data):
+    """
+    The view shares the arrays of the original and refuses in-place writes.
+    """
+    frozen = freeze_frame(mock_data)
+    pd.testing.assert_frame_equal(frozen, mock_data)
+    assert np.shares_memory(frozen["close"].to_numpy(), mock_data["close"].to_numpy())
+
+    original = mock_data.copy()
+    with pytest.raises(ValueError):
+        frozen.iloc[0, 0] = -1.0
+    with pytest.raises(ValueError):
+        frozen["close"].to_numpy()[0] = -1.0
+    pd.testing.assert_frame_equal(mock_data, original)
+
+    # Derived data and new columns are fine
+    frozen["mid"] = (frozen["high"] + frozen["low"]) / 2
+    assert "mid" not in mock_data.columns
+
+
+def test_freeze_frame_keeps_panel_columns(mock_data):
+    panel = build_panel({"AAABTC": mock_data, "BBBBTC": mock_data * 2})
+    frozen = freeze_frame(panel)
+    pd.testing.assert_frame_equal(frozen, panel)
+    pd.testing.assert_frame_equal(frozen["close"], panel["close"])
+
+
+def test_run_unit_passes_a_shared_read_only_view(mock_data):
+    """
+    The strategy sees the symbol's arrays without a copy; writing into them
+    fails or stays private instead of corrupting the data of later strategies.
+    """
+    original = mock_data.copy()
+    with pytest.raises(ValueError):
+        run_unit(NumpyWritingStrategy, PARAMS, "X", mock_data)
+    run_unit(PandasWritingStrategy, PARAMS, "X", mock_data)
+    pd.testing.assert_frame_equal(mock_data, original)
+
+    RecordingStrategy.seen.clear()
+    result = run_unit(RecordingStrategy, PARAMS, "X", mock_data)
+    (seen,) = RecordingStrategy.seen
+    assert np.shares_memory(seen["close"].to_numpy(), mock_data["close"].to_numpy())
+    expected = SmaCrossoverStrategy(mock_data.copy(), **PARAMS)
+    pd.testing.assert_series_equal(result.equity, expected.run_backtest().value())
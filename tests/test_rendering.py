@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from btc_backtest.core import rendering
+from btc_backtest.core.rendering import FigureJob, FigureRenderer, _render_batch
+
+
+def make_figure(values: list[float]) -> go.Figure:
+    return go.Figure(go.Scatter(y=values, mode="lines"))
+
+
+def test_unchanged_figures_are_skipped(tmp_path: Path):
+    """
+    A figure is written once; re-adding identical content is a no-op, while a
+    changed figure is rendered again.
+    """
+    manifest = str(tmp_path / "manifest.json")
+    out = str(tmp_path / "equity.html")
+
+    renderer = FigureRenderer(manifest_file=manifest, max_workers=1)
+    assert renderer.add(make_figure([1, 2, 3]), out)
+    assert os.path.exists(out)
+
+    # A new renderer (next run) reads the manifest
+    renderer = FigureRenderer(manifest_file=manifest, max_workers=1)
+    assert not renderer.add(make_figure([1, 2, 3]), out), "Unchanged figure rendered."
+    assert renderer.add(make_figure([1, 2, 4]), out), "Changed figure not rendered."
+
+
+def test_batch_renders_in_worker_pool(tmp_path: Path):
+    """
+    Figures added inside batch() are written together when the block ends.
+    """
+    renderer = FigureRenderer(max_workers=2)
+    paths = [str(tmp_path / f"fig_{i}.html") for i in range(3)]
+    with renderer.batch():
+        for i, path in enumerate(paths):
+            renderer.add(make_figure([i, i + 1]), path)
+        assert not any(os.path.exists(p) for p in paths), "Rendering was not deferred."
+    assert all(os.path.exists(p) for p in paths)
+
+
+def test_disabled_renderer_writes_nothing(tmp_path: Path):
+    """
+    A disabled renderer neither queues nor writes figures.
+    """
+    renderer = FigureRenderer(enabled=False)
+    out = tmp_path / "fig.html"
+    assert not renderer.add(make_figure([1, 2]), str(out))
+    assert renderer.render() == []
+    assert not out.exists()
+
+
+@pytest.fixture
+def png_export(tmp_path: Path) -> None:
+    """
+    Skips the test if Kaleido cannot export images here (e.g. no browser).
+    """
+    try:
+        pio.write_image(make_figure([1, 2]), str(tmp_path / "probe.png"))
+    except Exception as exc:  # Kaleido reports a missing browser in many ways
+        pytest.skip(f"Kaleido cannot export images: {exc}")
+
+
+def test_png_figures_are_written(tmp_path: Path, png_export):
+    """
+    PNG figures are exported through Kaleido (one call per batch where plotly
+    supports it).
+    """
+    renderer = FigureRenderer(max_workers=1)
+    paths = [str(tmp_path / f"fig_{i}.png") for i in range(2)]
+    with renderer.batch():
+        for i, path in enumerate(paths):
+            renderer.add(make_figure([i, i + 1]), path)
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_png_export_without_write_images(tmp_path: Path, monkeypatch):
+    """
+    With plotly < 6.1 (no pio.write_images) every image is exported by its
+    own pio.write_image() call.
+    """
+    written = []
+    plotly_5_io = SimpleNamespace(
+        from_json=pio.from_json,
+        write_image=lambda fig, path, format, scale, validate: written.append(
+            (path, format)
+        ),
+    )
+    monkeypatch.setattr(rendering, "pio", plotly_5_io)
+    fig_json = make_figure([1, 2]).to_json()
+    jobs = [
+        FigureJob(str(tmp_path / "a.png"), fig_json, "png", 2, "x"),
+        FigureJob(str(tmp_path / "b.svg"), fig_json, "svg", 2, "y"),
+        FigureJob(str(tmp_path / "c.html"), fig_json, "html", 2, "z"),
+    ]
+    assert _render_batch(jobs) == [job.path for job in jobs]
+    assert written == [(jobs[0].path, "png"), (jobs[1].path, "svg")]
+    assert (tmp_path / "c.html").exists()
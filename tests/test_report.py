@@ -0,0 +1,113 @@
+import base64
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.metrics_frame import metrics_from_dicts
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.report import metrics_table, render_report
+
+
+def make_equity(n: int = 20_000) -> pd.Series:
+    index = pd.date_range("2024-01-01", periods=n, freq="1min")
+    return pd.Series(np.linspace(10_000, 12_000, n), index=index)
+
+
+def embedded_data(document: str) -> dict:
+    match = re.search(
+        r'<script type="application/json" id="report-data">(.*?)</script>',
+        document,
+        re.S,
+    )
+    assert match, "The report must embed its data as JSON."
+    return json.loads(match.group(1))
+
+
+def test_report_is_self_contained():
+    """
+    plotly.js is inlined exactly once and no external file is referenced.
+    """
+    document = render_report(
+        "Test",
+        equity={"Strat": {"AAABTC": make_equity(), "BBBBTC": make_equity()}},
+        metrics=metrics_from_dicts({"Strat": {"AAABTC": {"sharpe_ratio": 1.5}}}),
+    )
+    assert document.count("* plotly.js v") == 1, "plotly.js must be inlined once."
+    assert "<script src=" not in document, "The report must not load files."
+    assert "<iframe" not in document
+
+
+def test_report_embeds_downsampled_typed_arrays():
+    """
+    Equity curves are embedded as base64 float arrays within the point budget.
+    """
+    equity = make_equity()
+    document = render_report(
+        "Test",
+        equity={"Strat": {"AAABTC": equity}},
+        metrics=metrics_from_dicts({}),
+        max_points=500,
+    )
+    (curve,) = embedded_data(document)["equity"][0]["curves"]
+    x = np.frombuffer(base64.b64decode(curve["x"]), dtype="<f8")
+    y = np.frombuffer(base64.b64decode(curve["y"]), dtype="<f4")
+    assert len(x) == len(y) <= 500
+    assert x[0] == equity.index[0].value / 1e6, "x must be epoch milliseconds."
+    assert y[-1] == np.float32(equity.iloc[-1])
+
+
+def test_metrics_table_keeps_numeric_columns():
+    """
+    The table has one row per (strategy, symbol); NaN and non-numeric values
+    (such as the stats Series) are not embedded.
+    """
+    metrics = metrics_from_dicts(
+        {
+            "Strat": {
+                "AAABTC": {"sharpe_ratio": 1.0, "drawdown": float("nan"), "stats": {}},
+                "BBBBTC": {"sharpe_ratio": -0.5, "custom": 3},
+            }
+        }
+    )
+    columns, rows = metrics_table(metrics)
+    assert columns[:3] == ["strategy", "symbol", "sharpe_ratio"]
+    assert "custom" in columns and "stats" not in columns
+    drawdown = columns.index("drawdown")
+    assert rows[0][drawdown] is None
+
+
+def test_backtester_writes_report_to_results_dir(tmp_path: Path):
+    """
+    generate_html_report writes one file into results_dir.
+    """
+    backtester = Backtester(
+        {}, [], results_dir=str(tmp_path), renderer=FigureRenderer(enabled=False)
+    )
+    backtester.all_equity = {"Strat": {"AAABTC": make_equity(100)}}
+    backtester.record_metrics("Strat", "AAABTC", {"sharpe_ratio": 2.0})
+    backtester.generate_html_report("report.html")
+
+    document = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert embedded_data(document)["rows"][0][:3] == ["Strat", "AAABTC", 2.0]
+
+
+def test_table_cells_are_text_not_markup():
+    """
+    Names are embedded as JSON data and the table script fills its cells as
+    text, so markup in a strategy or symbol name is never parsed as HTML.
+    """
+    name = '<img src=x onerror="alert(1)">'
+    document = render_report(
+        "Test",
+        equity={},
+        metrics=metrics_from_dicts({name: {"AAABTC": {"sharpe_ratio": 1.0}}}),
+    )
+    assert embedded_data(document)["rows"][0][0] == name
+    assert name not in document
+    report_script = document.rsplit("<script>", 1)[1]
+    assert "innerHTML" not in report_script
+    assert "textContent" in report_script
@@ -0,0 +1,171 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from btc_backtest.core.backtester import Backtester
+from btc_backtest.core.result_cache import (
+    ResultCache,
+    fingerprint_frame,
+    make_cache_key,
+    strategy_version,
+)
+from btc_backtest.core.sizing import FixedFraction
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+
+class CountingSmaStrategy(SmaCrossoverStrategy):
+    """
+    SMA crossover strategy that counts how many times a backtest was simulated.
+    """
+    runs = 0
+
+    def run_backtest(self):
+        CountingSmaStrategy.runs += 1
+        return super().run_backtest()
+
+
+def test_fingerprint_changes_with_data(mock_data: pd.DataFrame):
+    """
+    The data fingerprint must be stable for equal frames and change on any edit.
+    """
+    assert fingerprint_frame(mock_data) == fingerprint_frame(mock_data.copy())
+
+    modified = mock_data.copy()
+    modified.loc[3, "close"] = 1234
+    assert fingerprint_frame(modified) != fingerprint_frame(mock_data), (
+        "Changing a single value should change the fingerprint."
+    )
+
+
+def test_cache_key_depends_on_params(mock_data: pd.DataFrame):
+    """
+    Different parameters for the same strategy and data must map to different keys.
+    """
+    fp = fingerprint_frame(mock_data)
+    key_a = make_cache_key(fp, SmaCrossoverStrategy, {"fast_window": 5})
+    key_b = make_cache_key(fp, SmaCrossoverStrategy, {"fast_window": 6})
+    assert key_a != key_b
+    assert key_a == make_cache_key(fp, SmaCrossoverStrategy, {"fast_window": 5})
+
+
+def test_cache_key_encodes_sizers(mock_data: pd.DataFrame):
+    """
+    A sizer is keyed with its type, not as the bare list of its fields.
+    """
+    fp = fingerprint_frame(mock_data)
+    sized = make_cache_key(fp, SmaCrossoverStrategy, {"sizer": FixedFraction(0.5)})
+    listed = make_cache_key(fp, SmaCrossoverStrategy, {"sizer": [0.5]})
+    assert sized != listed
+
+
+def test_strategy_version_covers_module_level_code(tmp_path: Path, monkeypatch):
+    """
+    Editing a helper function of the strategy's module changes its version,
+    even though the class body stays the same.
+    """
+    module = tmp_path / "versioned_strategy.py"
+    source = (
+        "from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy\n"
+        "\n"
+        "def helper():\n"
+        "    return {}\n"
+        "\n"
+        "class VersionedStrategy(SmaCrossoverStrategy):\n"
+        "    pass\n"
+    )
+    # Sources of different lengths: no stale bytecode or line cache
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module.write_text(source.format(1))
+    versioned = importlib.import_module("versioned_strategy")
+    first = strategy_version(versioned.VersionedStrategy)
+
+    module.write_text(source.format(100))
+    reloaded = importlib.reload(sys.modules["versioned_strategy"])
+    assert strategy_version(reloaded.VersionedStrategy) != first
+    monkeypatch.delitem(sys.modules, "versioned_strategy")
+
+
+def test_result_cache_roundtrip(tmp_path: Path):
+    """
+    Stored metrics and equity curves are returned unchanged (equity as float32).
+    """
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    equity = pd.Series([10_000.0, 10_100.0, 9_900.0])
+    cache.put("k1", "Strat", "ETHBTC", {"sharpe_ratio": 1.5}, equity)
+
+    cached = cache.get("k1")
+    assert cached is not None, "Expected a cache hit for a stored key."
+    assert cached.metrics == {"sharpe_ratio": 1.5}
+    assert cached.equity.dtype == "float32"
+    assert list(cached.equity) == list(equity)
+    assert cache.get("missing") is None
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path: Path):
+    """
+    Once the size limit is exceeded, the least recently accessed entry is removed.
+    """
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_bytes=10**9)
+    equity = pd.Series(range(1000), dtype=float)
+    cache.put("old", "Strat", "A", {}, equity)
+    cache.put("new", "Strat", "B", {}, equity)
+    entry_size = cache.total_size() // 2
+
+    # Touch "old" so that "new" becomes the least recently used entry
+    cache.get("old")
+    cache._max_bytes = entry_size * 2
+    cache.put("newest", "Strat", "C", {}, equity)
+
+    assert len(cache) == 2, "One entry should have been evicted."
+    assert cache.get("new") is None, "The least recently used entry should be gone."
+    assert cache.get("old") is not None
+    assert cache.get("newest") is not None
+
+
+def test_backtester_serves_unchanged_runs_from_cache(
+    tmp_path: Path, mock_data: pd.DataFrame
+):
+    """
+    A second run over the same data, strategy and params must not re-simulate,
+    while a changed parameter set must.
+    """
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    params = {"fast_window": 3, "slow_window": 5}
+    CountingSmaStrategy.runs = 0
+
+    first = Backtester(
+        {"ETHBTC": mock_data},
+        [(CountingSmaStrategy, params)],
+        results_dir=str(tmp_path / "results"),
+        result_cache=cache,
+    )
+    first.run_all()
+    assert CountingSmaStrategy.runs == 1
+
+    second = Backtester(
+        {"ETHBTC": mock_data},
+        [(CountingSmaStrategy, params)],
+        results_dir=str(tmp_path / "results"),
+        result_cache=cache,
+    )
+    second.run_all()
+    assert CountingSmaStrategy.runs == 1, "Unchanged run should be served from cache."
+
+    name = CountingSmaStrategy.__name__
+    assert (
+        second.all_metrics[name]["ETHBTC"]["total_return"]
+        == first.all_metrics[name]["ETHBTC"]["total_return"]
+    )
+    assert len(second.all_equity[name]["ETHBTC"]) == len(mock_data)
+
+    third = Backtester(
+        {"ETHBTC": mock_data},
+        [(CountingSmaStrategy, {"fast_window": 2, "slow_window": 5})],
+        results_dir=str(tmp_path / "results"),
+        result_cache=cache,
+    )
+    third.run_all()
+    assert CountingSmaStrategy.runs == 2, "Changed params must trigger a new run."
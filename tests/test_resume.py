@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import btc_backtest.core.backtester as backtester_module
+from btc_backtest.core.backtester import Backtester, run_unit
+from btc_backtest.core.metrics_frame import wide_metrics
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.result_cache import ResultCache
+from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+STRATEGIES = [
+    (SmaCrossoverStrategy, {"fast_window": 3, "slow_window": 10}),
+    (RsiBollingerStrategy, {"rsi_window": 5, "bb_window": 5}),
+]
+
+
+def make_data(mock_data) -> dict[str, pd.DataFrame]:
+    return {
+        "AAABTC": mock_data,
+        "BBBBTC": mock_data.iloc[::-1].reset_index(drop=True),
+        "CCCBTC": mock_data * 1.5,
+    }
+
+
+def make_backtester(data, tmp_path: Path, result_cache=None) -> Backtester:
+    return Backtester(
+        data,
+        STRATEGIES,
+        results_dir=str(tmp_path / "results"),
+        renderer=FigureRenderer(enabled=False),
+        result_cache=result_cache,
+    )
+
+
+def count_units(monkeypatch, fail_at: int | None = None) -> list:
+    """
+    Wraps run_unit to record its calls and optionally crash on the n-th one.
+    """
+    calls = []
+
+    def counting_run_unit(strategy_cls, params, symbol, df, *args, **kwargs):
+        if fail_at is not None and len(calls) == fail_at:
+            raise MemoryError("simulated crash")
+        calls.append((strategy_cls.__name__, symbol))
+        return run_unit(strategy_cls, params, symbol, df, *args, **kwargs)
+
+    monkeypatch.setattr(backtester_module, "run_unit", counting_run_unit)
+    return calls
+
+
+def test_rerun_skips_completed_units(mock_data, tmp_path: Path, monkeypatch):
+    """
+    After a crash, the units committed to the result cache (pending ones are
+    flushed when the run fails) are not simulated again, and the rerun ends
+    with the same results as an uninterrupted run.
+    """
+    data = make_data(mock_data)
+    db_path = str(tmp_path / "cache.sqlite")
+
+    calls = count_units(monkeypatch, fail_at=4)
+    crashed = make_backtester(
+        data, tmp_path, ResultCache(db_path, flush_every=100, flush_interval=3600)
+    )
+    with pytest.raises(MemoryError):
+        crashed.run_all()
+    assert len(calls) == 4
+
+    calls = count_units(monkeypatch)
+    cache = ResultCache(db_path)
+    assert len(cache) == 4
+    resumed = make_backtester(data, tmp_path, cache)
+    resumed.run_all()
+    assert calls == [
+        ("RsiBollingerStrategy", "BBBBTC"),
+        ("RsiBollingerStrategy", "CCCBTC"),
+    ]
+    assert len(cache) == 6
+    assert resumed.unit_timings["SmaCrossoverStrategy", "AAABTC"].cached
+
+    fresh = make_backtester(data, tmp_path)
+    fresh.run_all()
+    pd.testing.assert_frame_equal(
+        wide_metrics(resumed.metrics), wide_metrics(fresh.metrics)
+    )
+    pd.testing.assert_series_equal(
+        resumed.all_equity["SmaCrossoverStrategy"]["AAABTC"],
+        fresh.all_equity["SmaCrossoverStrategy"]["AAABTC"],
+        check_dtype=False,
+    )
+
+
+def test_batched_writes(mock_data, tmp_path: Path):
+    """
+    Entries are committed in batches and served before their commit; without
+    max_bytes nothing is evicted.
+    """
+    db_path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(db_path, max_bytes=None, flush_every=3, flush_interval=3600)
+    equity = mock_data["close"].astype(float)
+    for i in range(2):
+        cache.put(f"k{i}", "S", "AAABTC", {"total_return": i}, equity)
+    assert len(ResultCache(db_path)) == 0, "Nothing committed yet."
+    assert cache.get("k1").metrics == {"total_return": 1}
+
+    cache.put("k2", "S", "AAABTC", {"total_return": 2}, equity)
+    assert len(ResultCache(db_path)) == 3
+    cache.put("k3", "S", "AAABTC", {}, equity)
+    cache.close()
+    assert len(ResultCache(db_path, max_bytes=None)) == 4
+
+
+def test_changed_params_are_not_resumed(mock_data, tmp_path: Path, monkeypatch):
+    """
+    Units are keyed by data, strategy and parameters.
+    """
+    data = make_data(mock_data)
+    db_path = str(tmp_path / "cache.sqlite")
+    make_backtester(data, tmp_path, ResultCache(db_path)).run_all()
+
+    calls = count_units(monkeypatch)
+    backtester = make_backtester(data, tmp_path, ResultCache(db_path))
+    backtester.strategies = [(SmaCrossoverStrategy, {"fast_window": 2})]
+    backtester.run_all()
+    assert len(calls) == 3
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.search import (
+    Rung,
+    halving_schedule,
+    score_candidates,
+    successive_halving,
+)
+from btc_backtest.core.sizing import VolatilityTarget
+from btc_backtest.strategies.base import run_batched
+from btc_backtest.strategies.cross_sectional_momentum import (
+    CrossSectionalMomentumStrategy,
+)
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
+
+EXECUTION = ExecutionModel(fill="next_open", slippage=0.0002, volume_impact=0.1)
+GRID = [
+    {"fast_window": fast, "slow_window": slow}
+    for fast in (5, 10, 20)
+    for slow in (40, 80, 160)
+]
+
+
+def make_ohlcv(n: int, seed: int) -> pd.DataFrame:
+    """
+    Random-walk 1-minute bars with a slow trend, so that SMA parameters matter.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.001, n) + 0.0004 * np.sin(np.arange(n) / 300)
+    close = 100 * np.exp(np.cumsum(returns))
+    return pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.0002, n)),
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": rng.uniform(100, 1000, n),
+        },
+        index=pd.date_range("2025-02-01", periods=n, freq="1min"),
+    )
+
+
+def test_halving_schedule():
+    """
+    Every rung keeps 1/eta of the candidates on eta times more bars; the last
+    rung uses all bars and the first at least min_bars.
+    """
+    assert halving_schedule(27, 27_000, eta=3, min_bars=100) == [
+        Rung(27, 1_000),
+        Rung(9, 3_000),
+        Rung(3, 9_000),
+        Rung(1, 27_000),
+    ]
+    assert halving_schedule(10, 5_000, eta=3, min_bars=1_000) == [
+        Rung(10, 1_000),
+        Rung(3, 1_667),
+        Rung(1, 5_000),
+    ]
+    assert halving_schedule(1, 500) == [Rung(1, 500)]
+    with pytest.raises(ValueError):
+        halving_schedule(5, 500, eta=1)
+
+
+@pytest.mark.parametrize(
+    "strategy_cls, grid, extra",
+    [
+        (SmaCrossoverStrategy, GRID[:4], {}),
+        (
+            VolumeSpikeBreakoutStrategy,
+            [{"allow_short": False}, {"allow_short": True}],
+            {"sizer": VolatilityTarget()},
+        ),
+    ],
+)
+def test_batched_run_matches_single_runs(strategy_cls, grid, extra):
+    """
+    One batched simulation gives every column the result of its own run,
+    including per-bar slippage, sizers and mixed long/short signals.
+    """
+    df = make_ohlcv(3_000, seed=1)
+    common = {"execution": EXECUTION, **extra}
+    pf = run_batched([strategy_cls(df, **common, **params) for params in grid])
+    singles = [strategy_cls(df, **common, **params).run_backtest() for params in grid]
+
+    np.testing.assert_allclose(
+        pf.total_return().to_numpy(), [p.total_return() for p in singles]
+    )
+    np.testing.assert_allclose(
+        pf.sharpe_ratio().to_numpy(), [p.sharpe_ratio() for p in singles]
+    )
+
+
+def test_batched_run_requires_shared_settings():
+    df = make_ohlcv(500, seed=1)
+    with pytest.raises(ValueError):
+        run_batched(
+            [SmaCrossoverStrategy(df, fees=0.001), SmaCrossoverStrategy(df, fees=0.0)]
+        )
+
+
+def test_batched_run_rejects_own_simulations():
+    """
+    Strategies with their own run_backtest() (e.g. cross-sectional ones) are
+    refused instead of being simulated with from_signals().
+    """
+    df = make_ohlcv(500, seed=1)
+    with pytest.raises(ValueError, match="cannot be batched"):
+        run_batched([CrossSectionalMomentumStrategy(df, lookback=60)])
+
+    class CustomRunStrategy(SmaCrossoverStrategy):
+        def run_backtest(self, **kwargs):
+            return super().run_backtest(**kwargs)
+
+    with pytest.raises(ValueError, match="cannot be batched"):
+        run_batched([SmaCrossoverStrategy(df), CustomRunStrategy(df)])
+
+
+def test_successive_halving_finds_a_top_candidate():
+    """
+    The search ends with one of the best candidates of the full grid while
+    simulating far fewer candidate-bars.
+    """
+    data = {"AAABTC": make_ohlcv(6_000, seed=2), "BBBBTC": make_ohlcv(6_000, seed=3)}
+    base = {"execution": ExecutionModel(fill="next_open", slippage=0.0002)}
+
+    result = successive_halving(
+        SmaCrossoverStrategy,
+        GRID,
+        data,
+        base,
+        eta=3,
+        min_bars=600,
+        metric="total_return",
+    )
+
+    full = score_candidates(
+        SmaCrossoverStrategy,
+        [{**base, **params} for params in GRID],
+        data,
+        6_000,
+        metric="total_return",
+    )
+    top_2 = [GRID[i] for i in np.argsort(-full)[:2]]
+    assert result.best_params in top_2
+    assert result.ranking["score"].iloc[0] == pytest.approx(
+        full[GRID.index(result.best_params)]
+    )
+    assert result.bars_simulated < 0.6 * result.bars_full_grid
+    assert result.history.groupby("rung")["candidate"].count().tolist() == [9, 3, 1]
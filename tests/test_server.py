@@ -0,0 +1,93 @@
+import json
+import threading
+from urllib import error, request
+
+import pytest
+
+from btc_backtest.core.backtester import run_unit
+from btc_backtest.core.server import BacktestServer, BacktestService
+from btc_backtest.core.sizing import VolatilityTarget
+from btc_backtest.strategies.registry import decode_params
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+
+@pytest.fixture
+def server_url(mock_data):
+    service = BacktestService({"AAABTC": mock_data, "BBBBTC": mock_data})
+    service.warm_up()
+    server = BacktestServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url: str, payload: dict) -> tuple[int, dict]:
+    req = request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    try:
+        with request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_backtest_job_matches_direct_run(server_url, mock_data):
+    """
+    A job returns the same metrics as running the strategy in-process.
+    """
+    params = {"fast_window": 3, "slow_window": 10}
+    status, body = post(
+        f"{server_url}/backtest",
+        {"strategy": "SmaCrossoverStrategy", "params": params, "symbols": ["AAABTC"]},
+    )
+    assert status == 200
+    assert list(body["metrics"]) == ["AAABTC"]
+
+    expected = run_unit(SmaCrossoverStrategy, params, "AAABTC", mock_data).metrics
+    metrics = body["metrics"]["AAABTC"]
+    assert metrics["total_return"] == pytest.approx(expected["total_return"])
+    assert "stats" not in metrics
+
+    with request.urlopen(f"{server_url}/health") as response:
+        health = json.loads(response.read())
+    assert health["jobs_done"] == 1
+    assert health["symbols"] == ["AAABTC", "BBBBTC"]
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        {"strategy": "NoSuchStrategy"},
+        {"strategy": "SmaCrossoverStrategy", "symbols": ["MISSINGBTC"]},
+        {"strategy": "SmaCrossoverStrategy", "symbols": "AAABTC"},
+        {"strategy": "SmaCrossoverStrategy", "symbols": [1]},
+        {"strategy": "SmaCrossoverStrategy", "symbols": [["AAABTC"]]},
+        {"strategy": "SmaCrossoverStrategy", "params": {"no_such_param": 1}},
+        {"params": {}},
+    ],
+)
+def test_invalid_jobs_are_rejected(server_url, job):
+    """
+    Invalid jobs get a 400 response with an error message.
+    """
+    status, body = post(f"{server_url}/backtest", job)
+    assert status == 400
+    assert body["error"]
+
+
+def test_decode_params_builds_sizer_and_execution():
+    """
+    JSON parameters are converted into ExecutionModel and sizer objects.
+    """
+    params = decode_params(
+        {
+            "execution": {"fill": "next_open"},
+            "sizer": {"type": "VolatilityTarget", "target_vol": 0.3},
+        }
+    )
+    assert params["execution"].fill == "next_open"
+    assert params["sizer"] == VolatilityTarget(target_vol=0.3)
+    with pytest.raises(ValueError, match="Unknown sizer"):
+        decode_params({"sizer": {"type": "Martingale"}})
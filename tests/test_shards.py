@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from btc_backtest.core.backtester import Backtester, run_unit
+from btc_backtest.core.data_loader import load_aggregated_parquet
+from btc_backtest.core.execution import ExecutionModel
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core import shards as shards_module
+from btc_backtest.core.shards import (
+    claim_shard,
+    merge_sweep,
+    read_manifest,
+    run_worker,
+    sweep_status,
+)
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+GRID = [
+    {"fast_window": fast, "slow_window": slow}
+    for fast in (2, 3)
+    for slow in (6, 8, 10)
+]
+
+
+def write_sweep(mock_data, tmp_path: Path, chunk_size: int = 2) -> Path:
+    """
+    Two symbols x six parameter sets, three shards per symbol.
+    """
+    backtester = Backtester(
+        {"AAABTC": mock_data, "BBBBTC": mock_data.iloc[::-1].reset_index(drop=True)},
+        [(SmaCrossoverStrategy, {"execution": ExecutionModel(fill="next_open")})],
+        results_dir=str(tmp_path / "results"),
+        renderer=FigureRenderer(enabled=False),
+    )
+    sweep_dir = tmp_path / "sweep"
+    backtester.write_sweep_manifest(
+        str(sweep_dir), {"SmaCrossoverStrategy": GRID}, chunk_size=chunk_size
+    )
+    return sweep_dir
+
+
+def test_manifest_shards_by_symbol_strategy_and_chunk(mock_data, tmp_path: Path):
+    """
+    Every (symbol, strategy, chunk of parameter sets) is one shard and the
+    data is stored next to the manifest, readable per symbol.
+    """
+    sweep_dir = write_sweep(mock_data, tmp_path)
+    manifest, shards = read_manifest(str(sweep_dir))
+
+    assert len(shards) == 6
+    assert [s.symbol for s in shards] == ["AAABTC"] * 3 + ["BBBBTC"] * 3
+    assert [s.first_param for s in shards[:3]] == [0, 2, 4]
+    # Base parameters are merged into every set, in JSON form
+    assert shards[0].params[0]["execution"]["fill"] == "next_open"
+    assert shards[0].params[1]["slow_window"] == 8
+
+    data = load_aggregated_parquet(str(sweep_dir / manifest["data_file"]), ["AAABTC"])
+    assert list(data) == ["AAABTC"]
+    assert data["AAABTC"]["close"].tolist() == mock_data["close"].tolist()
+
+
+def test_parallel_workers_complete_the_sweep(mock_data, tmp_path: Path):
+    """
+    Several worker processes (stand-ins for nodes) share the shards; every
+    parameter set is run exactly once and the merged results match a direct
+    backtest.
+    """
+    sweep_dir = write_sweep(mock_data, tmp_path, chunk_size=1)
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(target=run_worker, args=(str(sweep_dir), f"w{i}"))
+        for i in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=300)
+        assert worker.exitcode == 0
+
+    status = sweep_status(str(sweep_dir))
+    assert status["done"] == status["total"] == 12
+    assert not os.listdir(sweep_dir / "locks")
+
+    merged = merge_sweep(str(sweep_dir))
+    assert len(merged) == 12
+    assert not merged.duplicated(["symbol", "param_index"]).any()
+    assert (sweep_dir / "merged.parquet").exists()
+
+    row = merged[(merged["symbol"] == "AAABTC") & (merged["param_index"] == 4)]
+    expected = run_unit(
+        SmaCrossoverStrategy,
+        {"fast_window": 3, "slow_window": 8, "execution": ExecutionModel("next_open")},
+        "AAABTC",
+        mock_data,
+    )
+    assert row["param_fast_window"].item() == 3
+    assert row["param_execution_fill"].item() == "next_open"
+    assert row["total_return"].item() == pytest.approx(
+        expected.metrics["total_return"], nan_ok=True
+    )
+
+
+def test_stale_shard_is_reclaimed(mock_data, tmp_path: Path):
+    """
+    A shard whose lock has no recent heartbeat (crashed worker) is run by the
+    next worker; a shard with a live lock is left alone.
+    """
+    sweep_dir = write_sweep(mock_data, tmp_path)
+    _, shards = read_manifest(str(sweep_dir))
+    crashed = sweep_dir / "locks" / f"{shards[0].shard_id}.lock"
+    running = sweep_dir / "locks" / f"{shards[1].shard_id}.lock"
+    crashed.write_text("{}")
+    running.write_text("{}")
+    an_hour_ago = time.time() - 3600
+    os.utime(crashed, (an_hour_ago, an_hour_ago))
+
+    status = sweep_status(str(sweep_dir), stale_after=60)
+    assert status["stale"] == [shards[0].shard_id]
+    assert status["running"] == [shards[1].shard_id]
+
+    assert run_worker(str(sweep_dir), "w0", stale_after=60) == 5
+    status = sweep_status(str(sweep_dir), stale_after=60)
+    assert status["done"] == 5
+    assert status["running"] == [shards[1].shard_id]
+
+    with pytest.raises(RuntimeError):
+        merge_sweep(str(sweep_dir))
+    partial = merge_sweep(str(sweep_dir), allow_partial=True)
+    assert set(partial["shard_id"]) == {s.shard_id for s in shards} - {
+        shards[1].shard_id
+    }
+    assert isinstance(partial, pd.DataFrame)
+
+
+def test_worker_data_file_is_relative_to_cwd(mock_data, tmp_path: Path, monkeypatch):
+    """
+    A --data copy is resolved against the current directory, the manifest's
+    data file against the sweep directory.
+    """
+    sweep_dir = write_sweep(mock_data, tmp_path)
+    manifest, _ = read_manifest(str(sweep_dir))
+    (tmp_path / "local").mkdir()
+    os.replace(sweep_dir / manifest["data_file"], tmp_path / "local" / "copy.parquet")
+    monkeypatch.chdir(tmp_path)
+
+    assert run_worker(str(sweep_dir), "w0", data_file="local/copy.parquet") == 6
+
+
+def test_reclaim_gives_back_a_fresh_claim(mock_data, tmp_path: Path, monkeypatch):
+    """
+    A worker that saw a stale lock but renamed another worker's fresh claim
+    puts it back instead of claiming the shard as well.
+    """
+    sweep_dir = write_sweep(mock_data, tmp_path)
+    _, shards = read_manifest(str(sweep_dir))
+    lock = sweep_dir / "locks" / f"{shards[0].shard_id}.lock"
+    lock.write_text('{"worker": "w1"}')
+
+    # The lock was stale when this worker looked at it, then reclaimed by w1
+    real_lock_age = shards_module._lock_age
+    ages = iter([3600.0])
+    monkeypatch.setattr(
+        shards_module, "_lock_age", lambda path: next(ages, None) or real_lock_age(path)
+    )
+    assert not claim_shard(str(sweep_dir), shards[0].shard_id, "w0", stale_after=60)
+    assert lock.read_text() == '{"worker": "w1"}'
+    assert os.listdir(sweep_dir / "locks") == [lock.name]
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from btc_backtest.core.panel import build_panel
+from btc_backtest.core.sizing import FixedFraction, KellyCapped, VolatilityTarget
+from btc_backtest.strategies.base import StrategyBase, compute_time_in_position
+from btc_backtest.strategies.volume_spike_breakout import VolumeSpikeBreakoutStrategy
+
+
+class LongThenShortStrategy(StrategyBase):
+    """
+    Long from bar 2 to bar 4, short from bar 6 to bar 8.
+    """
+
+    def generate_signals(self):
+        def at(i: int) -> pd.Series:
+            signal = pd.Series(False, index=self.data.index)
+            signal.iloc[i] = True
+            return signal
+
+        return at(2), at(4), at(6), at(8)
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    return generate_ohlcv(3_000, seed=7)
+
+
+def test_short_signals_open_short_positions(ohlcv: pd.DataFrame):
+    """
+    The optional short entries/exits are simulated and count as exposure.
+    """
+    pf = LongThenShortStrategy(data=ohlcv.iloc[:10], fees=0.0).run_backtest()
+    assets = pf.assets()
+    assert assets.iloc[3] > 0, "Long position expected after bar 2."
+    assert assets.iloc[7] < 0, "Short position expected after bar 6."
+    assert compute_time_in_position(pf) == pytest.approx(40.0)
+
+
+def test_fixed_fraction_limits_entry(ohlcv: pd.DataFrame):
+    """
+    A fixed fraction commits that share of the cash to the entry.
+    """
+    strat = LongThenShortStrategy(
+        data=ohlcv.iloc[:10], fees=0.0, sizer=FixedFraction(0.25)
+    )
+    pf = strat.run_backtest()
+    first = pf.orders.records.iloc[0]
+    assert first["size"] * first["price"] == pytest.approx(2_500)
+
+
+def test_volatility_target_is_inverse_to_volatility(ohlcv: pd.DataFrame):
+    """
+    The fraction is lower when realized volatility is higher and is capped.
+    """
+    sizer = VolatilityTarget(target_vol=0.5, window=100, max_fraction=1.0)
+    calm = sizer.size(ohlcv)
+    wild = sizer.size(ohlcv.assign(close=ohlcv["close"] * np.tile([1.0, 1.01], 1_500)))
+    assert (calm.iloc[:100] == 0).all(), "No size during the warm-up window."
+    assert (wild.iloc[200:] <= calm.iloc[200:]).all()
+    assert calm.max() <= 1.0
+
+
+def test_kelly_fraction_is_capped(ohlcv: pd.DataFrame):
+    """
+    Kelly sizes are non-negative and never exceed the cap.
+    """
+    size = KellyCapped(window=200, multiplier=0.5, cap=0.2).size(ohlcv)
+    assert size.min() >= 0
+    assert size.max() <= 0.2
+
+
+def test_kelly_fraction_follows_trade_direction(ohlcv: pd.DataFrame):
+    """
+    A falling market gives longs no size and shorts a positive one.
+    """
+    falling = ohlcv.assign(close=ohlcv["close"] * np.linspace(1.0, 0.5, 3_000))
+    sizer = KellyCapped(window=200, multiplier=0.5, cap=0.2)
+    long_size = sizer.size(falling)
+    short_size = sizer.size(falling, direction=-1)
+    assert (long_size.iloc[200:] == 0).mean() > 0.5
+    assert (short_size.iloc[200:] > 0).mean() > 0.5
+    assert ((long_size == 0) | (short_size == 0)).all()
+
+
+def test_opposite_entry_closes_with_and_without_sizer(ohlcv: pd.DataFrame):
+    """
+    An opposite entry only closes the open position, whether the orders are
+    sized or not.
+    """
+
+    class ReversingStrategy(LongThenShortStrategy):
+        def generate_signals(self):
+            entries, _, short_entries, short_exits = super().generate_signals()
+            # The short entry arrives while the long position is still open
+            return entries, entries & False, short_entries, short_exits
+
+    data = ohlcv.iloc[:10]
+    unsized = ReversingStrategy(data=data, fees=0.0).run_backtest()
+    sized = ReversingStrategy(
+        data=data, fees=0.0, sizer=FixedFraction(1.0)
+    ).run_backtest()
+    assert list(unsized.orders.records["idx"]) == [2, 6]
+    assert list(sized.orders.records["idx"]) == [2, 6]
+    assert (unsized.assets().iloc[7:] == 0).all()
+    assert (sized.assets().iloc[7:] == 0).all()
+
+
+def test_symmetric_breakout_on_panel():
+    """
+    The symmetric breakout runs for many symbols in one batched simulation and
+    matches the per-symbol result.
+    """
+    data = {f"S{i:02d}BTC": generate_ohlcv(1_500, seed=i) for i in range(6)}
+    params = {
+        "volume_spike_coef": 1.2,
+        "allow_short": True,
+        "sizer": VolatilityTarget(window=60),
+    }
+    panel_pf = VolumeSpikeBreakoutStrategy(
+        data=build_panel(data), **params
+    ).run_backtest()
+    single_pf = VolumeSpikeBreakoutStrategy(
+        data=data["S03BTC"], **params
+    ).run_backtest()
+
+    assert panel_pf.wrapper.shape_2d == (1_500, 6)
+    assert (panel_pf.assets() < 0).any().any(), "Some short positions expected."
+    np.testing.assert_allclose(
+        panel_pf.value()["S03BTC"].to_numpy(), single_pf.value().to_numpy()
+    )
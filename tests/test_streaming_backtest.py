@@ -0,0 +1,200 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from btc_backtest.core.backtester import Backtester, _results_version, run_unit
+from btc_backtest.core.binance.cache_manager import CacheManager
+from btc_backtest.core.data_loader import BinanceDataLoader
+from btc_backtest.core.metrics_frame import wide_metrics
+from btc_backtest.core.metrics_store import read_metrics_dataset
+from btc_backtest.core.rendering import FigureRenderer
+from btc_backtest.core.result_cache import (
+    ResultCache,
+    fingerprint_frame,
+    make_cache_key,
+)
+from btc_backtest.strategies.rsi_bollinger import RsiBollingerStrategy
+from btc_backtest.strategies.sma_cross import SmaCrossoverStrategy
+
+STRATEGIES = [
+    (SmaCrossoverStrategy, {"fast_window": 3, "slow_window": 10}),
+    (RsiBollingerStrategy, {"rsi_window": 5, "bb_window": 5}),
+]
+
+
+def make_delayed_loader(cache_manager: CacheManager, frames: dict, delays: dict):
+    """
+    A loader whose per-symbol download is replaced by a delayed lookup.
+    """
+    loader = BinanceDataLoader(
+        fetcher=None,
+        cache=cache_manager,
+        start_year=2025,
+        start_month=2,
+        end_year=2025,
+        end_month=2,
+    )
+
+    async def load_data_for_period(symbol: str) -> pd.DataFrame:
+        await asyncio.sleep(delays[symbol])
+        if isinstance(frames[symbol], Exception):
+            raise frames[symbol]
+        return frames[symbol]
+
+    loader.load_data_for_period = load_data_for_period
+    return loader
+
+
+def sorted_metrics(backtester: Backtester) -> pd.DataFrame:
+    """
+    Metrics table in a fixed row order (streamed results arrive per symbol).
+    """
+    table = wide_metrics(backtester.metrics)
+    return table.sort_values(["strategy", "symbol"], ignore_index=True)
+
+
+async def as_stream(frames: dict):
+    for symbol, df in frames.items():
+        yield symbol, df
+
+
+@pytest.mark.asyncio
+async def test_iter_symbols_yields_in_completion_order(cache_manager, mock_data):
+    """
+    Symbols are yielded as soon as they are loaded, not in request order.
+    """
+    loader = make_delayed_loader(
+        cache_manager,
+        {"SLOWBTC": mock_data, "FASTBTC": mock_data},
+        {"SLOWBTC": 0.2, "FASTBTC": 0.0},
+    )
+    order = [symbol async for symbol, _ in loader.iter_symbols(["SLOWBTC", "FASTBTC"])]
+    assert order == ["FASTBTC", "SLOWBTC"]
+
+
+@pytest.mark.asyncio
+async def test_iter_symbols_reraises_and_cancels(cache_manager, mock_data):
+    """
+    A failed symbol is raised to the consumer; pending downloads are cancelled.
+    """
+    loader = make_delayed_loader(
+        cache_manager,
+        {"BADBTC": ValueError("corrupt"), "SLOWBTC": mock_data},
+        {"BADBTC": 0.0, "SLOWBTC": 10.0},
+    )
+    with pytest.raises(ValueError, match="corrupt"):
+        async for _ in loader.iter_symbols(["BADBTC", "SLOWBTC"]):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_matches_run_all(mock_data, tmp_path: Path):
+    """
+    The pipelined run produces the same metrics as run_all(), skips empty
+    frames, streams every backtest to the metrics dataset and fills the
+    result cache.
+    """
+    reversed_data = mock_data.iloc[::-1].reset_index(drop=True)
+    frames = {"AAABTC": mock_data, "EMPTYBTC": pd.DataFrame(), "BBBBTC": reversed_data}
+    reference = Backtester(
+        {"AAABTC": mock_data, "BBBBTC": reversed_data},
+        STRATEGIES,
+        results_dir=str(tmp_path / "reference"),
+        renderer=FigureRenderer(enabled=False),
+    )
+    reference.run_all()
+
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    streamed = Backtester(
+        {},
+        STRATEGIES,
+        results_dir=str(tmp_path / "streamed"),
+        result_cache=cache,
+        renderer=FigureRenderer(enabled=False),
+    )
+    await streamed.run_streaming(
+        as_stream(frames), max_workers=1, metrics_dataset="dataset", flush_every=1
+    )
+
+    assert list(streamed.data_dict) == ["AAABTC", "BBBBTC"]
+    pd.testing.assert_frame_equal(sorted_metrics(streamed), sorted_metrics(reference))
+    assert not any(streamed.all_portfolios.values()), "Portfolios stay in workers."
+
+    dataset = read_metrics_dataset(str(tmp_path / "streamed" / "dataset"))
+    assert len(dataset) == 4
+    assert set(dataset["run_id"]) == {streamed.run_id}
+    assert len(cache) == 4
+
+    # A second run is served from the result cache without any worker
+    again = Backtester(
+        {},
+        STRATEGIES,
+        results_dir=str(tmp_path / "streamed"),
+        result_cache=cache,
+        renderer=FigureRenderer(enabled=False),
+    )
+    await again.run_streaming(as_stream(frames), max_workers=1)
+    assert all(timing.cached for timing in again.unit_timings.values())
+    pd.testing.assert_frame_equal(sorted_metrics(again), sorted_metrics(reference))
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_caches_each_unit_under_its_key(mock_data, tmp_path: Path):
+    """
+    Two configurations of the same strategy are cached under their own keys.
+    """
+    configurations = [
+        (SmaCrossoverStrategy, {"fast_window": 3, "slow_window": 10}),
+        (SmaCrossoverStrategy, {"fast_window": 4, "slow_window": 8}),
+    ]
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    backtester = Backtester(
+        {},
+        configurations,
+        results_dir=str(tmp_path),
+        result_cache=cache,
+        renderer=FigureRenderer(enabled=False),
+    )
+    await backtester.run_streaming(as_stream({"AAABTC": mock_data}), max_workers=1)
+
+    fingerprint = fingerprint_frame(mock_data)
+    for strategy_cls, params in configurations:
+        key = make_cache_key(fingerprint, strategy_cls, params, _results_version())
+        expected = run_unit(strategy_cls, params, "AAABTC", mock_data)
+        assert cache.get(key).metrics["total_return"] == pytest.approx(
+            expected.metrics["total_return"], nan_ok=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_streaming_writes_the_dataset_in_a_thread(
+    mock_data, tmp_path: Path, monkeypatch
+):
+    """
+    The Parquet writes of the metrics dataset do not run on the event loop.
+    """
+    backtester = Backtester(
+        {},
+        STRATEGIES,
+        results_dir=str(tmp_path),
+        renderer=FigureRenderer(enabled=False),
+    )
+    write_threads = []
+    append_metrics_frame = backtester._append_metrics_frame
+
+    def recording_append(*args):
+        write_threads.append(threading.current_thread())
+        append_metrics_frame(*args)
+
+    monkeypatch.setattr(backtester, "_append_metrics_frame", recording_append)
+    await backtester.run_streaming(
+        as_stream({"AAABTC": mock_data}),
+        max_workers=1,
+        metrics_dataset="dataset",
+        flush_every=1,
+    )
+    assert write_threads and threading.main_thread() not in write_threads
+    assert len(read_metrics_dataset(str(tmp_path / "dataset"))) == 2
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+
+from btc_backtest.core.binance.cache_manager import CacheManager
+from btc_backtest.core.progress import LoaderStats
+from btc_backtest.core.universe import UniverseBuilder
+
+
+class StubLoader:
+    """
+    Loader stand-in returning fixed monthly quote volumes (None = no data).
+    """
+    interval = "1d"
+
+    def __init__(self, volumes: dict[tuple[str, int, int], float | None]) -> None:
+        self.volumes = volumes
+        self.calls: list[tuple[str, int, int]] = []
+
+    async def download_monthly_klines(self, symbol: str, year: int, month: int):
+        self.calls.append((symbol, year, month))
+        volume = self.volumes.get((symbol, year, month))
+        if volume is None:
+            return pd.DataFrame()
+        return pd.DataFrame({"quote_asset_volume": [volume / 2, volume / 2]})
+
+    def is_not_found(self, symbol: str, year: int, month: int) -> bool:
+        return self.volumes.get((symbol, year, month)) is None
+
+
+VOLUMES = {
+    ("ETHBTC", 2024, 1): 100.0,
+    ("ETHBTC", 2024, 2): 100.0,
+    ("SOLBTC", 2024, 1): 50.0,
+    ("SOLBTC", 2024, 2): 300.0,
+    ("OLDBTC", 2024, 1): 500.0,  # delisted in February
+    ("NEWBTC", 2024, 2): 10.0,  # listed in February
+}
+
+
+@pytest.mark.asyncio
+async def test_universe_ranks_by_period_volume(tmp_path: Path):
+    """
+    The ranking uses the volume traded within the requested period only.
+    """
+    loader = StubLoader(VOLUMES)
+    builder = UniverseBuilder(loader, str(tmp_path / "universe.json"))
+
+    candidates = ["ETHBTC", "SOLBTC", "OLDBTC", "NEWBTC"]
+    assert await builder.build(candidates, 2024, 1, 2024, 1, limit=2) == [
+        "OLDBTC",
+        "ETHBTC",
+    ]
+    assert await builder.build(candidates, 2024, 2, 2024, 2, limit=10) == [
+        "SOLBTC",
+        "ETHBTC",
+        "NEWBTC",
+    ], "Pairs without data in the period must not be selected."
+
+    ranking = await builder.rank(candidates, 2024, 1, 2024, 2)
+    assert ranking[0] == ("OLDBTC", 500.0)
+    assert dict(ranking)["SOLBTC"] == 350.0
+
+
+@pytest.mark.asyncio
+async def test_universe_index_avoids_reloading(tmp_path: Path):
+    """
+    A second builder reading the same index must not load any klines,
+    including for months known to be missing.
+    """
+    index_file = str(tmp_path / "universe.json")
+    first_loader = StubLoader(VOLUMES)
+    first = UniverseBuilder(first_loader, index_file)
+    await first.build(["ETHBTC", "NEWBTC"], 2024, 1, 2024, 1)
+    assert len(first_loader.calls) == 2
+
+    second_loader = StubLoader(VOLUMES)
+    second = UniverseBuilder(second_loader, index_file)
+    # Previously seen symbols are candidates even if not passed explicitly
+    assert await second.build([], 2024, 1, 2024, 1) == ["ETHBTC"]
+    assert second_loader.calls == [], "Index hits and known-missing months need no I/O."
+
+
+@pytest.fixture
+def cache_manager(checksums_file: Path, cache_dir: Path) -> CacheManager:
+    # Failures expire at once, so a later build() may download again
+    return CacheManager({}, str(cache_dir), str(checksums_file), failure_ttl=0)
+
+
+@pytest.mark.asyncio
+async def test_failed_months_are_retried(
+    tmp_path: Path, kline_zip: bytes, make_loader
+):
+    """
+    A month whose download failed is not stored as missing in the index; the
+    next build() downloads it again and ranks the symbol.
+    """
+    status = 503
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "NEWBTC" in request.url.path:
+            return httpx.Response(404)
+        if status == 503:
+            return httpx.Response(503)
+        return httpx.Response(200, content=kline_zip)
+
+    index_file = str(tmp_path / "universe.json")
+    builder = UniverseBuilder(make_loader(handler, LoaderStats()), index_file)
+    assert await builder.build(["ETHBTC", "NEWBTC"], 2024, 1, 2024, 1) == []
+    assert builder.known_symbols() == {"NEWBTC"}, "Only the 404 is stored."
+
+    status = 200
+    builder = UniverseBuilder(make_loader(handler, LoaderStats()), index_file)
+    assert await builder.build(["ETHBTC"], 2024, 1, 2024, 1) == ["ETHBTC"]